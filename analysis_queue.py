@@ -0,0 +1,377 @@
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, update
+
+from ..database.database import SessionLocal
+from ..database.models import AnalysisJob
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = 'queued', 'running', 'succeeded', 'failed', 'cancelled'
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+class AnalysisCancelled(Exception):
+    """Raised inside an analysis once its cancellation was requested"""
+
+class UnknownAnalysisError(ValueError):
+    """Raised when submitting an analysis kind no handler is registered for"""
+
+class AnalysisContext:
+    """Handle an analysis handler uses to report progress and notice cancellation"""
+
+    def __init__(self, queue: 'AnalysisQueue', job_id: str, attempt: int):
+        self.queue = queue
+        self.job_id = job_id
+        self.attempt = attempt
+
+    def report(self, partial: Dict):
+        """
+        Store a partial result clients can poll while the analysis runs
+
+        Args:
+            partial (Dict): JSON-serializable progress
+        """
+        self.queue._update(self.job_id, partial_result=json.dumps(partial, default=str))
+
+    def cancelled(self) -> bool:
+        """Whether cancellation of the analysis was requested"""
+        db = self.queue.session_factory()
+        try:
+            return bool(db.query(AnalysisJob.cancel_requested).filter_by(id=self.job_id).scalar())
+        finally:
+            db.close()
+
+    def check_cancelled(self):
+        """
+        Stop the analysis if its cancellation was requested
+
+        Raises:
+            AnalysisCancelled: If the analysis was cancelled
+        """
+        if self.cancelled():
+            raise AnalysisCancelled(self.job_id)
+
+# Runs one analysis from its parameters and returns the JSON-serializable result
+AnalysisHandler = Callable[[Dict, AnalysisContext], Any]
+
+class AnalysisQueue:
+    """
+    Persistent queue of long-running analyses worked off by a local thread pool.
+
+    Submitted analyses are stored in the analysis_jobs table, so they survive restarts:
+    analyses left running by a previous process are queued again on start. Workers claim
+    the oldest due analysis with a conditional update, run its registered handler and
+    store the result. Failed attempts are retried with exponential backoff until
+    max_attempts is reached. The queue assumes it is the only process working the table.
+    """
+
+    def __init__(self, session_factory: Callable = SessionLocal, workers: int = 2,
+                 max_attempts: int = 3, retry_backoff: float = 10.0, poll_interval: float = 1.0):
+        """
+        Initialize the queue
+
+        Args:
+            session_factory (Callable): Creates database sessions
+            workers (int): Number of analyses run at once
+            max_attempts (int): Default number of attempts before an analysis fails
+            retry_backoff (float): Seconds before the first retry, doubled for each later one
+            poll_interval (float): Seconds idle workers wait before looking for due retries
+        """
+        self.session_factory = session_factory
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+        self._handlers: Dict[str, AnalysisHandler] = {}
+        self._threads: List[threading.Thread] = []
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._claim_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._counters = {'submitted': 0, 'succeeded': 0, 'failed': 0, 'retried': 0, 'cancelled': 0}
+
+    def register(self, kind: str, handler: AnalysisHandler):
+        """
+        Register the handler running analyses of a kind
+
+        Args:
+            kind (str): Analysis kind
+            handler (AnalysisHandler): Called with the parameters and an AnalysisContext
+        """
+        self._handlers[kind] = handler
+
+    def start(self):
+        """Requeue analyses interrupted by a restart and start the workers"""
+        if self._threads:
+            return
+        self._stopping.clear()
+        requeued = self._update_where(AnalysisJob.status == RUNNING, status=QUEUED)
+        if requeued:
+            logger.info(f"Requeued {requeued} interrupted analyses")
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"analysis-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """
+        Stop the workers after their current analyses
+
+        Analyses still running when the timeout passes are requeued on the next start.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for each worker
+        """
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, kind: str, params: Dict, max_attempts: Optional[int] = None) -> str:
+        """
+        Queue an analysis
+
+        Args:
+            kind (str): Registered analysis kind
+            params (Dict): JSON-serializable parameters for the handler
+            max_attempts (Optional[int]): Attempts before failing; defaults to the queue's
+
+        Returns:
+            str: Analysis id
+
+        Raises:
+            UnknownAnalysisError: If no handler is registered for the kind
+        """
+        if kind not in self._handlers:
+            raise UnknownAnalysisError(f"Unknown analysis kind: {kind}")
+
+        job_id = uuid.uuid4().hex
+        db = self.session_factory()
+        try:
+            db.add(AnalysisJob(id=job_id, kind=kind, params=json.dumps(params, default=str), status=QUEUED,
+                               max_attempts=max_attempts or self.max_attempts, run_after=datetime.utcnow()))
+            db.commit()
+        finally:
+            db.close()
+        self._count('submitted')
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Get the status and results of an analysis
+
+        Args:
+            job_id (str): Analysis id
+
+        Returns:
+            Optional[Dict]: Analysis state, or None if it does not exist
+        """
+        db = self.session_factory()
+        try:
+            job = db.get(AnalysisJob, job_id)
+            if job is None:
+                return None
+            return {
+                'job_id': job.id,
+                'kind': job.kind,
+                'status': job.status,
+                'params': json.loads(job.params) if job.params else None,
+                'attempts': job.attempts,
+                'max_attempts': job.max_attempts,
+                'cancel_requested': job.cancel_requested,
+                'partial_result': json.loads(job.partial_result) if job.partial_result else None,
+                'result': json.loads(job.result) if job.result else None,
+                'error': job.error,
+                'created_at': job.created_at,
+                'started_at': job.started_at,
+                'finished_at': job.finished_at
+            }
+        finally:
+            db.close()
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Cancel an analysis
+
+        Queued analyses are cancelled at once. Running ones are flagged and stop the next
+        time their handler checks for cancellation.
+
+        Args:
+            job_id (str): Analysis id
+
+        Returns:
+            Optional[str]: Status after the request, or None if the analysis does not exist
+        """
+        now = datetime.utcnow()
+        if self._update_where((AnalysisJob.id == job_id) & (AnalysisJob.status == QUEUED),
+                              status=CANCELLED, cancel_requested=True, finished_at=now):
+            self._count('cancelled')
+            return CANCELLED
+        self._update_where((AnalysisJob.id == job_id) & (AnalysisJob.status == RUNNING), cancel_requested=True)
+        job = self.get(job_id)
+        return job['status'] if job else None
+
+    def purge_finished(self, older_than: timedelta) -> int:
+        """
+        Delete finished analyses
+
+        Args:
+            older_than (timedelta): Minimum age since the analysis finished
+
+        Returns:
+            int: Number of analyses deleted
+        """
+        db = self.session_factory()
+        try:
+            deleted = db.query(AnalysisJob).filter(
+                AnalysisJob.status.in_(FINISHED_STATUSES),
+                AnalysisJob.finished_at < datetime.utcnow() - older_than
+            ).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def _work(self):
+        """Worker loop: claim due analyses and run them until stopped"""
+        while not self._stopping.is_set():
+            try:
+                claimed = self._claim()
+            except Exception as e:
+                logger.error(f"Error claiming analysis: {str(e)}")
+                claimed = None
+            if claimed is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self._execute(*claimed)
+
+    def _claim(self) -> Optional[tuple]:
+        """Mark the oldest due analysis as running and return (id, kind, params, attempt)"""
+        with self._claim_lock:
+            db = self.session_factory()
+            try:
+                job = db.query(AnalysisJob).filter(
+                    AnalysisJob.status == QUEUED, AnalysisJob.run_after <= datetime.utcnow()
+                ).order_by(AnalysisJob.run_after, AnalysisJob.created_at).first()
+                if job is None:
+                    return None
+                claimed = db.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == job.id, AnalysisJob.status == QUEUED)
+                    .values(status=RUNNING, attempts=AnalysisJob.attempts + 1, started_at=datetime.utcnow())
+                ).rowcount
+                db.commit()
+                if not claimed:
+                    return None
+                return job.id, job.kind, json.loads(job.params or '{}'), job.attempts
+            finally:
+                db.close()
+
+    def _execute(self, job_id: str, kind: str, params: Dict, attempt: int):
+        """Run a claimed analysis and record its outcome"""
+        context = AnalysisContext(self, job_id, attempt)
+        try:
+            context.check_cancelled()
+            result = self._handlers[kind](params, context)
+        except AnalysisCancelled:
+            self._update(job_id, status=CANCELLED, finished_at=datetime.utcnow())
+            self._count('cancelled')
+        except Exception as e:
+            logger.error(f"Error running {kind} analysis {job_id} (attempt {attempt}): {str(e)}")
+            self._retry_or_fail(job_id, attempt, str(e))
+        else:
+            self._update(job_id, status=SUCCEEDED, result=json.dumps(result, default=str),
+                         error=None, finished_at=datetime.utcnow())
+            self._count('succeeded')
+
+    def _retry_or_fail(self, job_id: str, attempt: int, error: str):
+        """Queue a failed analysis again with backoff, or fail it for good"""
+        db = self.session_factory()
+        try:
+            job = db.get(AnalysisJob, job_id)
+            if job is None:
+                return
+            now = datetime.utcnow()
+            if job.cancel_requested:
+                job.status, job.finished_at = CANCELLED, now
+                counter = 'cancelled'
+            elif attempt < job.max_attempts:
+                job.status = QUEUED
+                job.run_after = now + timedelta(seconds=self.retry_backoff * 2 ** (attempt - 1))
+                counter = 'retried'
+            else:
+                job.status, job.finished_at = FAILED, now
+                counter = 'failed'
+            job.error = error
+            db.commit()
+        finally:
+            db.close()
+        self._count(counter)
+
+    def _update(self, job_id: str, **values) -> int:
+        """Update one analysis"""
+        return self._update_where(AnalysisJob.id == job_id, **values)
+
+    def _update_where(self, condition, **values) -> int:
+        """Update the analyses matching a condition and return how many changed"""
+        db = self.session_factory()
+        try:
+            changed = db.execute(update(AnalysisJob).where(condition).values(**values)).rowcount
+            db.commit()
+            return changed
+        finally:
+            db.close()
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def stats(self) -> Dict:
+        """
+        Get queue counters for monitoring
+
+        Returns:
+            Dict with the analyses per stored status and this process's outcome counters
+        """
+        db = self.session_factory()
+        try:
+            by_status = dict(db.query(AnalysisJob.status, func.count(AnalysisJob.id))
+                             .group_by(AnalysisJob.status).all())
+        except Exception as e:
+            logger.error(f"Error reading analysis queue stats: {str(e)}")
+            by_status = {}
+        finally:
+            db.close()
+        with self._lock:
+            return {**self._counters, 'workers': len(self._threads), 'by_status': by_status}
+
+_queue: Optional[AnalysisQueue] = None
+_queue_lock = threading.Lock()
+
+def get_analysis_queue() -> AnalysisQueue:
+    """
+    Get the process-wide analysis queue, configured from ANALYSIS_* environment variables
+
+    Returns:
+        AnalysisQueue: Shared queue
+    """
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = AnalysisQueue(
+                    workers=int(os.getenv('ANALYSIS_WORKERS', '2')),
+                    max_attempts=int(os.getenv('ANALYSIS_MAX_ATTEMPTS', '3')),
+                    retry_backoff=float(os.getenv('ANALYSIS_RETRY_BACKOFF', '10')),
+                    poll_interval=float(os.getenv('ANALYSIS_POLL_INTERVAL', '1'))
+                )
+    return _queue
@@ -0,0 +1,599 @@
+"""
+Performance benchmarks for the skill analysis pipeline.
+
+Run a single benchmark with:
+
+    python benchmarks.py skill-matcher
+
+or every benchmark with:
+
+    python benchmarks.py all
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import re
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Set
+
+from src.processors.skill_matcher import SkillMatcher
+
+SYLLABLES = ['py', 'ja', 'va', 'ku', 'ber', 'net', 'es', 'do', 'cker', 're', 'act', 'no', 'de',
+             'sq', 'ls', 'ra', 'ils', 'go', 'rust', 'sca', 'la', 'ha', 'doop', 'spa', 'rk', 'ter']
+
+FILLER = ['the', 'team', 'builds', 'scalable', 'services', 'with', 'and', 'our', 'customers',
+          'experience', 'required', 'strong', 'communication', 'ownership', 'years', 'of']
+
+def _timeit(func: Callable, repeat: int = 5) -> float:
+    """Return the best wall-clock time of several runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def _synthetic_vocabulary(size: int, seed: int = 42) -> Dict[str, List[str]]:
+    """Generate a vocabulary of canonical skills, each with two synonyms"""
+    rng = random.Random(seed)
+    skills: Set[str] = set()
+    while len(skills) < size:
+        words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+                 for _ in range(rng.randint(1, 2))]
+        skills.add(' '.join(words))
+    return {skill: [f'{skill} development', f'{skill} experience'] for skill in sorted(skills)}
+
+def _synthetic_text(vocabulary: Dict[str, List[str]], words: int, seed: int = 7) -> str:
+    """Generate a job description mixing filler words with vocabulary phrases"""
+    rng = random.Random(seed)
+    skills = list(vocabulary)
+    tokens = []
+    for _ in range(words):
+        tokens.append(rng.choice(skills) if rng.random() < 0.05 else rng.choice(FILLER))
+    return ' '.join(tokens)
+
+def _legacy_extract(text: str, known_skills: Set[str], skill_synonyms: Dict[str, List[str]]) -> Set[str]:
+    """The per-skill substring scan SkillProcessor used before the compiled matcher"""
+    text = text.lower()
+    skills = set()
+    for skill in known_skills:
+        if skill in text:
+            skills.add(skill)
+    for standard, variants in skill_synonyms.items():
+        for variant in variants:
+            if variant in text:
+                skills.add(standard)
+    for pattern in [r'proficient in (\w+)', r'experience with (\w+)', r'knowledge of (\w+)',
+                    r'skilled in (\w+)', r'expertise in (\w+)']:
+        for match in re.finditer(pattern, text):
+            if match.group(1) in known_skills:
+                skills.add(match.group(1))
+    return skills
+
+def bench_skill_matcher(sizes: List[int] = (100, 1000, 10000), words: int = 2000):
+    """Compare the compiled matcher against the legacy loop at several vocabulary sizes"""
+    print(f'skill-matcher: {words}-word job description')
+    print(f'{"vocab":>8} {"build ms":>10} {"legacy ms":>10} {"matcher ms":>11} {"speedup":>8}')
+    for size in sizes:
+        synonyms = _synthetic_vocabulary(size)
+        known = set(synonyms)
+        text = _synthetic_text(synonyms, words)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher.from_skills(known, synonyms)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        legacy_ms = _timeit(lambda: _legacy_extract(text, known, synonyms), repeat=3)
+        matcher_ms = _timeit(lambda: matcher.find(text.lower()))
+        print(f'{size:>8} {build_ms:>10.1f} {legacy_ms:>10.2f} {matcher_ms:>11.2f} {legacy_ms / matcher_ms:>7.1f}x')
+
+def bench_shared_processor(requests: int = 20):
+    """Compare import/startup time and per-request latency of per-request vs shared processors"""
+    from src.processors.skill_processor import SkillProcessor, get_skill_processor
+
+    code = ('import time; start = time.perf_counter(); '
+            'import src.processors.skill_processor; '
+            'print((time.perf_counter() - start) * 1000)')
+    import_ms = float(subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                     text=True, check=True).stdout.strip())
+    print(f'shared-processor: import skill_processor {import_ms:.1f} ms')
+
+    text = 'Senior Python engineer with Django, AWS, Docker and Kubernetes experience. ' * 20
+
+    def per_request():
+        # Previous behaviour: a fresh processor per request with the NLP models loaded eagerly
+        processor = SkillProcessor()
+        try:
+            processor.nlp
+            processor.stop_words
+        except Exception:
+            pass
+        processor.extract_skills_from_text(text)
+
+    def shared():
+        get_skill_processor().extract_skills_from_text(text)
+
+    try:
+        SkillProcessor().nlp
+    except Exception as e:
+        print(f'  spaCy model unavailable ({type(e).__name__}); per-request figure excludes it')
+
+    start = time.perf_counter()
+    get_skill_processor()
+    print(f'  first shared processor: {(time.perf_counter() - start) * 1000:.2f} ms')
+
+    for name, func in [('per-request processor', per_request), ('shared processor', shared)]:
+        start = time.perf_counter()
+        for _ in range(requests):
+            func()
+        per_call = (time.perf_counter() - start) * 1000 / requests
+        print(f'  {name:<22} {per_call:>8.2f} ms/request')
+
+def _synthetic_profile_text(pages: int, seed: int = 3) -> str:
+    """Generate the text of a LinkedIn profile export with roughly 3000 characters per page"""
+    rng = random.Random(seed)
+
+    vocabulary = [word for word in FILLER if word != 'experience'] + ['python', 'docker', 'aws']
+
+    def paragraph(words: int) -> str:
+        return ' '.join(rng.choice(vocabulary) for _ in range(words))
+
+    lines = ['Jane Doe', 'Senior Software Engineer', 'San Francisco, California', 'About', paragraph(80)]
+    lines += ['Experience']
+    for index in range(max(1, pages * 3)):
+        lines += [f'Engineer {index}', f'Company {index}', f'January {2000 + index % 20} - Present',
+                  paragraph(120)]
+    lines += ['Education', 'State University', 'BSc Computer Science', 'September 1996 - 2000',
+              paragraph(40), 'Skills', 'Python, Docker, AWS, Kubernetes']
+    return '\n'.join(lines)
+
+def _legacy_parse_text(parser, text: str) -> Dict:
+    """Section extraction as PDFParser did it before the single-pass segmenter"""
+    def section(pattern):
+        match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+        return match.group(1) if match else None
+
+    def entries(section_text):
+        blocks = re.split(r'\n(?=[A-Z][a-z]+\s+\d{4}\s*[-–]\s*(?:Present|\d{4}))', section_text or '')
+        return [block for block in blocks if block.strip()]
+
+    lines = text.split('\n')
+    name, headline = lines[0], lines[1] if len(lines) > 1 else ''
+    location = re.search(r"([A-Za-z\s]+,\s*[A-Za-z\s]+)", text)
+    about = section(r"About\s*(.*?)(?=Experience|Education|Skills|$)")
+    skills = section(r"Skills\s*(.*?)(?=Experience|Education|$)")
+    experience = entries(section(r"Experience\s*(.*?)(?=Education|Skills|$)"))
+    education = entries(section(r"Education\s*(.*?)(?=Experience|Skills|$)"))
+    return {
+        'name': name, 'headline': headline, 'location': location, 'about': about,
+        'skills': parser.skill_processor.extract_skills_from_text(skills) if skills else [],
+        'experience': [(parser._extract_job_title(b), parser._extract_company(b),
+                        parser._extract_duration(b), parser._extract_job_description(b)) for b in experience],
+        'education': [(parser._extract_school(b), parser._extract_degree(b),
+                       parser._extract_duration(b), parser._extract_education_description(b)) for b in education],
+    }
+
+def bench_section_segmenter(pages: List[int] = (1, 5, 10, 25, 50)):
+    """Compare the single-pass section segmenter against the per-section regex scans"""
+    from src.processors.pdf_parser import PDFParser
+    from src.processors.profile_cache import ProfileCache
+
+    parser = PDFParser(cache=ProfileCache())
+    print('section-segmenter: synthetic profile exports')
+    print(f'{"pages":>6} {"chars":>9} {"legacy ms":>10} {"segmenter ms":>13} {"us/char":>8}')
+    for count in pages:
+        text = _synthetic_profile_text(count)
+        legacy_ms = _timeit(lambda: _legacy_parse_text(parser, text), repeat=3)
+        segmenter_ms = _timeit(lambda: parser.parse_profile_text(text), repeat=3)
+        print(f'{count:>6} {len(text):>9} {legacy_ms:>10.2f} {segmenter_ms:>13.2f} '
+              f'{segmenter_ms * 1000 / len(text):>8.3f}')
+
+def _synthetic_jobs(count: int, seed: int = 11) -> List[Dict]:
+    """Generate scraped jobs with unique URLs and a handful of skills each"""
+    rng = random.Random(seed)
+    skills = [f'skill{index}' for index in range(200)]
+    return [{
+        'title': 'Software Engineer',
+        'company': f'Company {index}',
+        'location': 'Remote',
+        'description': 'Job description',
+        'url': f'https://example.com/jobs/{seed}/{index}',
+        'skills': rng.sample(skills, 8)
+    } for index in range(count)]
+
+def _legacy_save_jobs(db, jobs: List[Dict]):
+    """Per-row lookups and commits, as the trends endpoint did before the repository layer"""
+    from datetime import datetime
+    from src.database.models import JobPosting, JobRequirement, Skill
+
+    for job in jobs:
+        job_posting = JobPosting(title=job['title'], company=job['company'], location=job['location'],
+                                 description=job['description'], url=job['url'], posted_date=datetime.now())
+        db.add(job_posting)
+        db.commit()
+        for skill_name in job['skills']:
+            skill = db.query(Skill).filter_by(name=skill_name).first()
+            if not skill:
+                skill = Skill(name=skill_name)
+                db.add(skill)
+                db.commit()
+            db.add(JobRequirement(job_posting_id=job_posting.id, skill_id=skill.id, importance_score=1.0))
+        db.commit()
+
+def bench_bulk_persistence(sizes: List[int] = (10, 100, 1000)):
+    """Compare per-row persistence of scraped jobs against the bulk repository path"""
+    import tempfile
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src.database.database import Base
+    from src.database.repository import save_job_postings
+
+    print('bulk-persistence: saving scraped jobs to a fresh SQLite file')
+    print(f'{"jobs":>6} {"legacy ms":>10} {"bulk ms":>9} {"speedup":>8}')
+    for size in sizes:
+        timings = []
+        for save in (_legacy_save_jobs, save_job_postings):
+            with tempfile.TemporaryDirectory() as directory:
+                engine = create_engine(f'sqlite:///{directory}/bench.db')
+                Base.metadata.create_all(bind=engine)
+                db = sessionmaker(bind=engine)()
+                jobs = _synthetic_jobs(size)
+                start = time.perf_counter()
+                save(db, jobs)
+                timings.append((time.perf_counter() - start) * 1000)
+                db.close()
+                engine.dispose()
+        print(f'{size:>6} {timings[0]:>10.1f} {timings[1]:>9.1f} {timings[0] / timings[1]:>7.1f}x')
+
+def bench_incremental_ingest(stored: int = 2000, new_counts: List[int] = (0, 20, 200, 2000)):
+    """Measure re-saving a scrape of already stored postings plus a varying number of new ones"""
+    import tempfile
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src.database.database import Base
+    from src.database.repository import save_job_postings
+    from src.processors.skill_processor import get_skill_processor
+
+    processor = get_skill_processor()
+    extracted = []
+
+    def extract_skills(descriptions):
+        extracted.append(len(descriptions))
+        return processor.extract_skills_batch(descriptions)[0]
+
+    def scraped(count: int, offset: int = 0) -> List[Dict]:
+        return [{
+            'title': 'Software Engineer',
+            'company': f'Company {index}',
+            'location': 'Remote',
+            'description': f'Python, Docker and AWS experience required. Posting {index}. ' * 10,
+            'url': f'https://example.com/jobs/{index}'
+        } for index in range(offset, offset + count)]
+
+    print(f'incremental-ingest: refreshing {stored} stored postings')
+    print(f'{"new":>6} {"extracted":>10} {"refresh ms":>11}')
+    for new in new_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f'sqlite:///{directory}/bench.db')
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            save_job_postings(db, scraped(stored), extract_skills)
+            extracted.clear()
+            start = time.perf_counter()
+            save_job_postings(db, scraped(stored) + scraped(new, offset=stored), extract_skills)
+            elapsed = (time.perf_counter() - start) * 1000
+            db.close()
+            engine.dispose()
+        print(f'{new:>6} {sum(extracted):>10} {elapsed:>11.1f}')
+
+def bench_skill_trend_rollups(postings: int = 5000, days: int = 30):
+    """Compare answering a trends query from the rollups with aggregating stored postings"""
+    import tempfile
+    from datetime import datetime, timedelta
+    from sqlalchemy import create_engine, update
+    from sqlalchemy.orm import sessionmaker
+    from src.database.database import Base
+    from src.database.models import JobPosting
+    from src.database.repository import save_job_postings
+    from src.database.skill_trends import query_skill_trends, rebuild_skill_trends, update_skill_trends
+    from src.processors.skill_processor import get_skill_processor
+
+    processor = get_skill_processor()
+    extract_skills = lambda descriptions: processor.extract_skills_batch(descriptions)[0]
+    titles = ['Software Engineer', 'Data Engineer', 'Python Developer', 'DevOps Engineer']
+    jobs = [{
+        'title': titles[index % len(titles)],
+        'company': f'Company {index}',
+        'location': 'Remote',
+        'description': random.Random(index).choice(['Python and AWS', 'Docker and Kubernetes',
+                                                   'SQL and Spark', 'React and Node.js']),
+        'url': f'https://example.com/jobs/{index}'
+    } for index in range(postings)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f'sqlite:///{directory}/bench.db')
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        save_job_postings(db, jobs, extract_skills)
+        today = datetime.utcnow()
+        for offset in range(days):
+            db.execute(update(JobPosting).where(JobPosting.id % days == offset)
+                       .values(posted_date=today - timedelta(days=offset)))
+        db.commit()
+
+        start = time.perf_counter()
+        rows = rebuild_skill_trends(db)
+        rebuild = (time.perf_counter() - start) * 1000
+
+        def live():
+            postings = db.query(JobPosting).filter(JobPosting.title.ilike('%software engineer%')).all()
+            processor.get_skill_frequency([[r.skill.name for r in p.requirements] for p in postings])
+            db.expire_all()
+
+        new = save_job_postings(db, [dict(job, url=f'{job["url"]}-new') for job in jobs[:50]], extract_skills)
+        start = time.perf_counter()
+        update_skill_trends(db, new)
+        incremental = (time.perf_counter() - start) * 1000
+
+        print(f'skill-trend-rollups: {postings} postings over {days} days, {rows} rollup rows')
+        print(f'full rebuild: {rebuild:.1f} ms, incremental update of 50 postings: {incremental:.1f} ms')
+        print(f'query from postings: {_timeit(live, repeat=3):.1f} ms')
+        print(f'query from rollups:  {_timeit(lambda: query_skill_trends(db, "software engineer")):.1f} ms')
+        print(f'rollups by week:     {_timeit(lambda: query_skill_trends(db, "software engineer", granularity="week")):.1f} ms')
+        db.close()
+        engine.dispose()
+
+def bench_skill_gap_scoring(profiles: int = 10000, roles: int = 500, vocabulary: int = 2000):
+    """Score every profile against every role, vectorized and with per-pair set operations"""
+    from src.processors.skill_matrix import SkillGapScorer
+    from src.processors.skill_processor import SkillProcessor
+
+    rng = random.Random(42)
+    skills = [f'skill-{index}' for index in range(vocabulary)]
+    role_skills = {f'role-{index}': rng.sample(skills, rng.randint(10, 30)) for index in range(roles)}
+    profile_skills = [rng.sample(skills, rng.randint(5, 40)) for _ in range(profiles)]
+
+    start = time.perf_counter()
+    scorer = SkillGapScorer(role_skills)
+    encode = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    streamed = sum(1 for _ in scorer.top_k(profile_skills, k=10))
+    vectorized = (time.perf_counter() - start) * 1000
+
+    # Per-pair baseline on a sample, extrapolated to every pair
+    processor = SkillProcessor()
+    sample = profile_skills[:100]
+    start = time.perf_counter()
+    for user_skills in sample:
+        for required in role_skills.values():
+            processor.compare_skills(user_skills, required)
+    per_pair = (time.perf_counter() - start) * 1000 * profiles / len(sample)
+
+    print(f'skill-gap-scoring: {profiles} profiles x {roles} roles ({profiles * roles} pairs)')
+    print(f'encode roles:             {encode:>9.1f} ms')
+    print(f'vectorized top-10 stream: {vectorized:>9.1f} ms for {streamed} profiles')
+    print(f'compare_skills per pair:  {per_pair:>9.1f} ms (extrapolated from {len(sample)} profiles)')
+
+def bench_skill_index(profiles: int = 1000000, skills: int = 2000, skills_per_profile: int = 15):
+    """Measure boolean skill search latency over an in-memory index of a million profiles"""
+    import numpy as np
+    from src.database.skill_index import SkillIndex
+
+    # Zipf-like popularity so a few skills are on a large share of profiles
+    rng = np.random.default_rng(42)
+    popularity = 1.0 / np.arange(1, skills + 1)
+    popularity /= popularity.sum()
+    names = [f'skill-{rank}' for rank in range(skills)]
+    picks = rng.choice(skills, size=(profiles, skills_per_profile), p=popularity)
+    profile_ids = np.repeat(np.arange(1, profiles + 1, dtype=np.uint32), skills_per_profile)
+    order = np.argsort(picks.ravel(), kind='stable')
+    bounds = np.searchsorted(picks.ravel()[order], np.arange(skills + 1))
+
+    start = time.perf_counter()
+    index = SkillIndex('profiles')
+    index.load({names[rank]: profile_ids[order[bounds[rank]:bounds[rank + 1]]] for rank in range(skills)})
+    load = (time.perf_counter() - start) * 1000
+
+    queries = {
+        'AND of 3 common': dict(all_of=['skill-0', 'skill-1', 'skill-2']),
+        'AND of common + rare': dict(all_of=['skill-0', 'skill-500']),
+        'OR of 3 common, ranked': dict(any_of=['skill-0', 'skill-1', 'skill-2']),
+        'AND + OR + NOT': dict(all_of=['skill-3'], any_of=['skill-4', 'skill-5', 'skill-6'], none_of=['skill-0']),
+        'OR of 10 mid': dict(any_of=[f'skill-{rank}' for rank in range(20, 30)]),
+    }
+    print(f'skill-index: {profiles} profiles, {skills} skills, load {load:.0f} ms')
+    print(f'{"query":<26} {"matches":>9} {"p50 ms":>8} {"p95 ms":>8}')
+    for label, query in queries.items():
+        timings = []
+        for _ in range(50):
+            started = time.perf_counter()
+            total = index.search(**query)['total']
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        print(f'{label:<26} {total:>9} {timings[len(timings) // 2]:>8.2f} {timings[int(len(timings) * 0.95)]:>8.2f}')
+
+class _StubJobScraper:
+    """JobScraper stand-in that blocks like a browser would and returns synthetic jobs"""
+
+    latency = 0.2
+    _batches = itertools.count()
+
+    def __init__(self, skill_processor=None):
+        pass
+
+    def _scrape(self) -> List[Dict]:
+        time.sleep(self.latency)
+        return _synthetic_jobs(10, seed=next(self._batches) + 1000)
+
+    def scrape_jobs(self, job_title: str, location: str = None, **kwargs) -> List[Dict]:
+        # Two sites scraped back to back, as the seed scraper did
+        return self._scrape() + self._scrape()
+
+    def close(self):
+        pass
+
+async def _heartbeat(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Measure the worst event loop stall while requests are in flight"""
+    loop = asyncio.get_running_loop()
+    worst = 0.0
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        worst = max(worst, loop.time() - start - interval)
+    return worst
+
+def bench_endpoint_load(concurrency: List[int] = (1, 4, 8, 16), latency: float = 0.2):
+    """Load test /skills/trends with stubbed scrapers, inline blocking calls vs executors"""
+    import tempfile
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src import main as app_main
+    from src.database.database import Base
+    from src.database.repository import save_job_postings
+    from src.processors.skill_processor import get_skill_processor
+    from src.utils.executors import get_executor
+
+    app_main.JobScraper = _StubJobScraper
+    _StubJobScraper.latency = latency
+    processor = get_skill_processor()
+
+    async def legacy(db):
+        # Previous behaviour: scraping and persistence called directly on the event loop
+        jobs = app_main.scrape_job_postings('Software Engineer', None, processor)
+        save_job_postings(db, jobs)
+
+    async def offloaded(db):
+        await app_main.get_skill_trends('Software Engineer', None, db, processor)
+
+    async def run(handler, requests: int, session_factory):
+        stop = asyncio.Event()
+        heartbeat = asyncio.ensure_future(_heartbeat(stop))
+        sessions = [session_factory() for _ in range(requests)]
+        start = time.perf_counter()
+        await asyncio.gather(*(handler(db) for db in sessions))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        stall = await heartbeat
+        for db in sessions:
+            db.close()
+        return elapsed, stall
+
+    print(f'endpoint-load: /skills/trends with {latency * 1000:.0f} ms per scraped site, '
+          f'{get_executor("browser").max_workers} browser workers')
+    print(f'{"requests":>8} {"legacy req/s":>13} {"legacy stall ms":>16} '
+          f'{"executor req/s":>15} {"executor stall ms":>18}')
+    for requests in concurrency:
+        row = []
+        for handler in (legacy, offloaded):
+            with tempfile.TemporaryDirectory() as directory:
+                engine = create_engine(f'sqlite:///{directory}/bench.db',
+                                       connect_args={'check_same_thread': False})
+                Base.metadata.create_all(bind=engine)
+                elapsed, stall = asyncio.run(run(handler, requests, sessionmaker(bind=engine)))
+                engine.dispose()
+            row.extend([requests / elapsed, stall * 1000])
+        print(f'{requests:>8} {row[0]:>13.2f} {row[1]:>16.0f} {row[2]:>15.2f} {row[3]:>18.0f}')
+
+def _bench_engine(kind: str, url: str):
+    from sqlalchemy import create_engine
+    from src.database.database import PoolMetrics, create_db_engine
+    if kind == 'default engine':
+        return create_engine(url, connect_args={'check_same_thread': False})
+    return create_db_engine(url, PoolMetrics())
+
+def _bench_db_writer(kind: str, url: str, worker: int, writes: int, results):
+    """Commit one posting per transaction, as a separate worker process would"""
+    from sqlalchemy import insert
+    from sqlalchemy.exc import OperationalError
+    from src.database.models import JobPosting
+
+    engine = _bench_engine(kind, url)
+    latencies, errors = [], 0
+    for index in range(writes):
+        started = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(JobPosting).values(title='Engineer', url=f'https://example.com/{worker}/{index}'))
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors += 1
+    engine.dispose()
+    results.put((latencies, errors))
+
+def _bench_db_reader(kind: str, url: str, stop):
+    """Run a scanning read query until stopped"""
+    from sqlalchemy import func, select
+    from src.database.models import JobPosting
+
+    engine = _bench_engine(kind, url)
+    while not stop.is_set():
+        with engine.connect() as conn:
+            conn.execute(select(func.count(JobPosting.id)).where(JobPosting.title.like('%e%'))).scalar()
+    engine.dispose()
+
+def bench_db_concurrency(writers: int = 4, readers: int = 2, writes: int = 100, stored: int = 20000):
+    """Measure concurrent commits to one SQLite file from several processes, with and without the tuned engine"""
+    import multiprocessing
+    import tempfile
+    from sqlalchemy import insert
+    from src.database.database import Base
+    from src.database.models import JobPosting
+
+    print(f'db-concurrency: {writers} writer processes x {writes} commits, {readers} reader processes')
+    print(f'{"engine":<18} {"writes/s":>9} {"p95 ms":>8} {"locked":>7}')
+    for kind in ('default engine', 'create_db_engine'):
+        with tempfile.TemporaryDirectory() as directory:
+            url = f'sqlite:///{directory}/bench.db'
+            engine = _bench_engine(kind, url)
+            Base.metadata.create_all(bind=engine)
+            with engine.begin() as conn:
+                conn.execute(insert(JobPosting), [{'title': f'Seed {index}', 'url': f'https://example.com/seed/{index}'}
+                                                  for index in range(stored)])
+            engine.dispose()
+
+            results, stop = multiprocessing.Queue(), multiprocessing.Event()
+            reading = [multiprocessing.Process(target=_bench_db_reader, args=(kind, url, stop)) for _ in range(readers)]
+            writing = [multiprocessing.Process(target=_bench_db_writer, args=(kind, url, worker, writes, results))
+                       for worker in range(writers)]
+            start = time.perf_counter()
+            for process in reading + writing:
+                process.start()
+            outcomes = [results.get() for _ in writing]
+            elapsed = time.perf_counter() - start
+            stop.set()
+            for process in reading + writing:
+                process.join()
+
+        latencies = sorted(latency for batch, _ in outcomes for latency in batch)
+        errors = sum(failed for _, failed in outcomes)
+        p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0
+        print(f'{kind:<18} {len(latencies) / elapsed:>9.0f} {p95:>8.1f} {errors:>7}')
+
+BENCHMARKS = {
+    'skill-matcher': bench_skill_matcher,
+    'shared-processor': bench_shared_processor,
+    'section-segmenter': bench_section_segmenter,
+    'bulk-persistence': bench_bulk_persistence,
+    'endpoint-load': bench_endpoint_load,
+    'incremental-ingest': bench_incremental_ingest,
+    'skill-trend-rollups': bench_skill_trend_rollups,
+    'skill-gap-scoring': bench_skill_gap_scoring,
+    'skill-index': bench_skill_index,
+    'db-concurrency': bench_db_concurrency,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description='Run performance benchmarks')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS) + ['all'])
+    args = parser.parse_args()
+
+    selected = BENCHMARKS.values() if args.benchmark == 'all' else [BENCHMARKS[args.benchmark]]
+    for bench in selected:
+        bench()
+        print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""
+Bulk ingestion of exported LinkedIn profile PDFs.
+
+Walks a directory (recursively) or a .zip archive, parses the PDFs across a process pool
+and writes Profile, Skill and profile_skills rows in one transaction per batch. Profiles
+are keyed by the SHA-256 of their PDF, so a batch committed just before a crash, and
+thus not yet in the checkpoint, is not stored twice when the run is resumed.
+
+Usage:
+
+    python -m src.processors.bulk_ingest exports/ --workers 8 --checkpoint ingest.ckpt
+"""
+import argparse
+import json
+import logging
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from ..database.database import SessionLocal, init_db
+from ..database.repository import save_profiles
+from .pdf_parser import PDFParser
+from .profile_cache import ProfileCache
+from .skill_processor import get_skill_processor
+
+logger = logging.getLogger(__name__)
+
+# Reference to a PDF inside the corpus: ('file', path) or ('zip', archive path, member name)
+SourceRef = Tuple[str, ...]
+
+class IngestionCheckpoint:
+    """
+    Resumable progress marker for an ingestion run.
+
+    Sources are enumerated in a deterministic order. The checkpoint stores the index below
+    which every source is settled, plus the few settled indexes above it, so its size is
+    bounded by the number of in-flight documents rather than the size of the corpus.
+    Sources that failed are settled too but kept in a separate set, so a resumed run
+    retries them.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self.watermark = 0
+        self.done_above: Set[int] = set()
+        self.failed: Set[int] = set()
+
+        if self.path and self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.watermark = state.get('watermark', 0)
+            self.done_above = set(state.get('done_above', []))
+            self.failed = set(state.get('failed', []))
+            logger.info(f"Resuming ingestion from checkpoint {self.path} at source {self.watermark}, "
+                        f"retrying {len(self.failed)} failed sources")
+
+    def is_done(self, index: int) -> bool:
+        """Check whether a source was already ingested"""
+        return (index < self.watermark or index in self.done_above) and index not in self.failed
+
+    def mark_done(self, indexes: List[int], failed: Sequence[int] = ()):
+        """
+        Record ingested sources and persist the checkpoint
+
+        Args:
+            indexes (List[int]): Indexes of sources that were committed to the database
+            failed (Sequence[int]): Indexes of sources that failed and must be retried
+        """
+        self.failed.difference_update(indexes)
+        self.failed.update(failed)
+        self.done_above.update(indexes)
+        self.done_above.update(failed)
+        while self.watermark in self.done_above:
+            self.done_above.remove(self.watermark)
+            self.watermark += 1
+
+        if self.path:
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'watermark': self.watermark, 'done_above': sorted(self.done_above),
+                           'failed': sorted(self.failed)}, f)
+            os.replace(tmp_path, self.path)
+
+class IngestionStats:
+    """Throughput counters for an ingestion run"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.documents = 0
+        self.failed = 0
+        self.skipped = 0
+        self.bytes = 0
+
+    def report(self) -> Dict:
+        """
+        Summarize throughput so far
+
+        Returns:
+            Dict with document counts, docs/sec and MB/sec
+        """
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            'documents': self.documents,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'megabytes': round(self.bytes / 1024 / 1024, 2),
+            'elapsed_seconds': round(elapsed, 2),
+            'docs_per_second': round(self.documents / elapsed, 2),
+            'mb_per_second': round(self.bytes / 1024 / 1024 / elapsed, 2),
+        }
+
+def iter_pdf_sources(path: str) -> Iterator[SourceRef]:
+    """
+    Enumerate the PDFs of a corpus in a deterministic order without loading them
+
+    Args:
+        path (str): Directory to walk recursively, or a .zip archive
+
+    Yields:
+        SourceRef: Reference to each PDF
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            names = sorted(name for name in archive.namelist() if name.lower().endswith('.pdf'))
+        for name in names:
+            yield ('zip', path, name)
+        return
+
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith('.pdf'):
+                yield ('file', os.path.join(root, name))
+
+_worker_parser: Optional[PDFParser] = None
+
+def _init_worker():
+    """Create one parser per worker process; parsed profiles are not cached in bulk runs"""
+    global _worker_parser
+    _worker_parser = PDFParser(get_skill_processor(), cache=ProfileCache(max_entries=0))
+
+def _parse_source(ref: SourceRef) -> Dict:
+    """Read and parse one PDF inside a worker process"""
+    try:
+        if ref[0] == 'zip':
+            with zipfile.ZipFile(ref[1]) as archive:
+                data = archive.read(ref[2])
+        else:
+            with open(ref[1], 'rb') as f:
+                data = f.read()
+
+        profile_data = _worker_parser.parse_profile_pdf(data)
+        profile_data['skills'] = _worker_parser.skill_processor.extract_profile_skills(profile_data)
+        profile_data['source_hash'] = ProfileCache.key_for(data)
+        return {'profile': profile_data, 'bytes': len(data)}
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {str(e)}", 'bytes': 0}
+
+def ingest(path: str, workers: int = os.cpu_count() or 1, batch_size: int = 200,
+           max_in_flight: Optional[int] = None, checkpoint_path: Optional[str] = None,
+           session_factory: Callable = SessionLocal, report_every: int = 10) -> Dict:
+    """
+    Ingest every profile PDF of a corpus
+
+    Args:
+        path (str): Directory or .zip archive of PDFs
+        workers (int): Number of parser processes
+        batch_size (int): Number of profiles written per transaction
+        max_in_flight (Optional[int]): Maximum number of submitted but unfinished documents;
+            bounds memory use regardless of corpus size. Defaults to 4 per worker.
+        checkpoint_path (Optional[str]): File used to resume an interrupted run
+        session_factory (Callable): Creates database sessions
+        report_every (int): Log a throughput report every this many batches
+
+    Returns:
+        Dict with the final throughput report
+    """
+    max_in_flight = max_in_flight or workers * 4
+    checkpoint = IngestionCheckpoint(checkpoint_path)
+    stats = IngestionStats()
+    batch: List[Tuple[int, Dict]] = []
+    batches_written = 0
+
+    db = session_factory()
+
+    def flush():
+        nonlocal batch, batches_written
+        if not batch:
+            return
+        save_profiles(db, [profile for _, profile in batch if profile is not None])
+        checkpoint.mark_done([index for index, profile in batch if profile is not None],
+                             failed=[index for index, profile in batch if profile is None])
+        batch = []
+        batches_written += 1
+        if batches_written % report_every == 0:
+            logger.info(f"Ingestion progress: {stats.report()}")
+
+    def collect(futures: Dict):
+        for future in list(futures):
+            if not future.done():
+                continue
+            index, ref = futures.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # A crashed worker breaks the pool and fails every document it held
+                result = {'error': f"{type(e).__name__}: {str(e)}", 'bytes': 0}
+            stats.bytes += result['bytes']
+            if 'error' in result:
+                stats.failed += 1
+                logger.error(f"Error ingesting {ref[-1]}: {result['error']}")
+                batch.append((index, None))
+            else:
+                stats.documents += 1
+                batch.append((index, result['profile']))
+            if len(batch) >= batch_size:
+                flush()
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    try:
+        futures: Dict = {}
+        for index, ref in enumerate(iter_pdf_sources(path)):
+            if checkpoint.is_done(index):
+                stats.skipped += 1
+                continue
+
+            while len(futures) >= max_in_flight:
+                wait(futures, return_when=FIRST_COMPLETED)
+                collect(futures)
+
+            try:
+                futures[executor.submit(_parse_source, ref)] = (index, ref)
+            except BrokenProcessPool:
+                logger.error("Ingestion worker pool broke, starting a new one")
+                wait(futures)
+                collect(futures)
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+                futures[executor.submit(_parse_source, ref)] = (index, ref)
+
+        while futures:
+            wait(futures, return_when=FIRST_COMPLETED)
+            collect(futures)
+        flush()
+    finally:
+        executor.shutdown()
+        db.close()
+
+    report = stats.report()
+    logger.info(f"Ingestion finished: {report}")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk ingest exported LinkedIn profile PDFs')
+    parser.add_argument('path', help='Directory of PDFs or .zip archive')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--max-in-flight', type=int, default=None)
+    parser.add_argument('--checkpoint', default=None, help='Checkpoint file for resumable runs')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    init_db()
+    report = ingest(args.path, workers=args.workers, batch_size=args.batch_size,
+                    max_in_flight=args.max_in_flight, checkpoint_path=args.checkpoint)
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
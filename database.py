@@ -1,7 +1,13 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import QueuePool
 import os
+import threading
+import time
+from typing import Dict, Optional
 from dotenv import load_dotenv
 import logging
 
@@ -13,8 +19,173 @@ logger = logging.getLogger(__name__)
 # Database configuration
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///data/linkedin_skills.db')
 
+class PoolMetrics:
+    """Connection pool counters collected from pool events and timed checkouts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self._counters = {'checkouts': 0, 'connects': 0, 'invalidated': 0, 'timeouts': 0,
+                          'wait_seconds': 0.0, 'max_wait_seconds': 0.0}
+        self._in_use = 0
+        self._peak_in_use = 0
+
+    def attach(self, engine: Engine):
+        """
+        Start collecting counters for an engine's pool
+
+        Args:
+            engine (Engine): Engine created by create_db_engine
+        """
+        self._engine = engine
+        event.listen(engine, 'connect', lambda *args: self._count('connects'))
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        event.listen(engine, 'invalidate', lambda *args: self._count('invalidated'))
+        if isinstance(engine.pool, TimedQueuePool):
+            engine.pool.metrics = self
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        """Record how long a checkout waited for a connection"""
+        with self._lock:
+            self._counters['wait_seconds'] += seconds
+            self._counters['max_wait_seconds'] = max(self._counters['max_wait_seconds'], seconds)
+            if timed_out:
+                self._counters['timeouts'] += 1
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _on_checkout(self, *args):
+        with self._lock:
+            self._counters['checkouts'] += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+
+    def _on_checkin(self, *args):
+        with self._lock:
+            self._in_use -= 1
+
+    def stats(self) -> Dict:
+        """
+        Get pool counters for monitoring
+
+        Returns:
+            Dict with lifetime counters, connections in use (now and at peak) and, for
+            queue pools, the configured size and current overflow
+        """
+        with self._lock:
+            stats = {**self._counters, 'wait_seconds': round(self._counters['wait_seconds'], 3),
+                     'max_wait_seconds': round(self._counters['max_wait_seconds'], 3),
+                     'in_use': self._in_use, 'peak_in_use': self._peak_in_use}
+        pool = self._engine.pool if self._engine is not None else None
+        if isinstance(pool, QueuePool):
+            stats.update({'size': pool.size(), 'idle': pool.checkedin(), 'overflow': max(pool.overflow(), 0),
+                          'max_overflow': pool._max_overflow})
+        return stats
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited to its PoolMetrics"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.monotonic()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.monotonic() - started, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.monotonic() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes')
+
+def _sqlite_pragmas(in_memory: bool) -> Dict[str, str]:
+    """Per-connection SQLite settings, configured from SQLITE_* environment variables"""
+    pragmas = {
+        # Readers no longer block the writer and commits append to the log
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        # Writers wait for the lock instead of failing with "database is locked"
+        'busy_timeout': os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'),
+        # Safe with WAL: only the last commits can be lost on power failure, never integrity
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'mmap_size': os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)),
+        # Negative sizes are in KiB
+        'cache_size': os.getenv('SQLITE_CACHE_SIZE', str(-64 * 1024))
+    }
+    if in_memory:
+        del pragmas['journal_mode'], pragmas['mmap_size']
+    return pragmas
+
+def create_db_engine(url: str = DATABASE_URL, metrics: Optional[PoolMetrics] = None, **options) -> Engine:
+    """
+    Create an engine tuned for the database behind a URL
+
+    SQLite connections get WAL journaling, a busy timeout, synchronous=NORMAL and larger
+    page and mmap caches. Server databases such as PostgreSQL get a sized pool that
+    pre-pings and recycles its connections. Pool settings come from DB_POOL_* and
+    SQLite settings from SQLITE_* environment variables.
+
+    Args:
+        url (str): Database URL
+        metrics (Optional[PoolMetrics]): Collects pool counters for the engine
+        **options: create_engine arguments overriding the computed ones
+
+    Returns:
+        Engine: Configured engine
+    """
+    database_url = make_url(url)
+    pool_options = {
+        'poolclass': TimedQueuePool,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '10')),
+        'max_overflow': int(os.getenv('DB_POOL_MAX_OVERFLOW', '20')),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    }
+
+    pragmas = None
+    if database_url.get_backend_name() == 'sqlite':
+        in_memory = database_url.database in (None, '', ':memory:') or 'mode=memory' in str(database_url)
+        pragmas = _sqlite_pragmas(in_memory)
+        engine_options = {'connect_args': {'check_same_thread': False}}
+        if not in_memory:
+            # Each in-memory connection is its own database, so those keep SQLite's default pool
+            engine_options.update(pool_options)
+    else:
+        engine_options = {
+            **pool_options,
+            'pool_pre_ping': _env_flag('DB_POOL_PRE_PING', 'true'),
+            'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800'))
+        }
+    engine_options.update(options)
+    engine = create_engine(url, **engine_options)
+
+    if pragmas:
+        @event.listens_for(engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f'PRAGMA {name}={value}')
+            finally:
+                cursor.close()
+
+    if metrics is not None:
+        metrics.attach(engine)
+    return engine
+
 # Create engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {})
+pool_metrics = PoolMetrics()
+engine = create_db_engine(DATABASE_URL, pool_metrics)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -35,18 +206,33 @@ def get_db():
     finally:
         db.close()
 
+def db_pool_stats() -> Dict:
+    """
+    Get the counters of the shared engine's connection pool
+
+    Returns:
+        Dict: PoolMetrics.stats of the shared engine
+    """
+    return pool_metrics.stats()
+
 def init_db():
     """
-    Initialize database by creating all tables
+    Initialize database by creating all tables and applying pending schema migrations
     """
     print("Initializing database...")
     try:
         # Import all models here to ensure they are registered with Base
-        from .models import Profile, Skill, Experience, JobPosting, JobRequirement, SkillTrend
+        from .models import Profile, Skill, Experience, JobPosting, JobRequirement, SkillTrend, ScrapeCacheEntry, AnalysisJob, SchemaMigration
+        from .migrations import migrate
         
         # Create all tables
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
+
+        # Bring tables created by earlier versions up to date
+        migrated = migrate(engine)
+        if migrated:
+            logger.info(f"Applied schema migrations {migrated}")
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}")
         raise
@@ -56,7 +242,12 @@ def drop_db():
     Drop all database tables
     """
     try:
+        from .skill_cache import clear_skill_id_caches
+        from .skill_index import clear_skill_indexes
+        
         Base.metadata.drop_all(bind=engine)
+        clear_skill_id_caches()
+        clear_skill_indexes()
         logger.info("Database tables dropped successfully")
     except Exception as e:
         logger.error(f"Error dropping database tables: {str(e)}")
@@ -0,0 +1,299 @@
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+class DriverCheckoutTimeout(Exception):
+    """Raised when no pooled driver becomes available in time"""
+
+def create_chrome_driver():
+    """
+    Launch a headless Chrome with the options the scrapers use
+
+    Returns:
+        webdriver.Chrome: New driver
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    # Add user agent to avoid detection
+    options.add_argument(f'user-agent={USER_AGENT}')
+    return webdriver.Chrome(options=options)
+
+def is_driver_alive(driver) -> bool:
+    """
+    Check that a driver's browser still responds
+
+    Args:
+        driver: WebDriver to check
+
+    Returns:
+        bool: True if the browser answered
+    """
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+def js_heap_megabytes(driver) -> Optional[float]:
+    """
+    Read the JavaScript heap size of the driver's current page (Chrome only)
+
+    Args:
+        driver: WebDriver to probe
+
+    Returns:
+        Optional[float]: Used heap in megabytes, or None if unavailable
+    """
+    try:
+        used = driver.execute_script('return performance.memory ? performance.memory.usedJSHeapSize : null')
+        return used / 1024 / 1024 if used else None
+    except Exception:
+        return None
+
+class _PooledDriver:
+    """A driver with the bookkeeping needed to decide when to recycle it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+
+class DriverPool:
+    """
+    Bounded pool of reusable WebDriver sessions.
+
+    Browsers are launched lazily up to size and handed out with checkout/checkin. Idle
+    browsers are health checked before reuse, and a browser is recycled (quit and
+    replaced on demand) after max_uses checkouts, when its memory probe exceeds
+    max_memory_mb, or when the borrower reports it broken.
+    """
+
+    def __init__(self, factory: Callable = create_chrome_driver, size: int = 2, max_uses: int = 50,
+                 max_memory_mb: Optional[float] = 512, checkout_timeout: float = 30.0,
+                 health_check: Callable = is_driver_alive, memory_probe: Callable = js_heap_megabytes):
+        """
+        Initialize the pool
+
+        Args:
+            factory (Callable): Creates a new driver
+            size (int): Maximum number of live drivers
+            max_uses (int): Checkouts after which a driver is recycled
+            max_memory_mb (Optional[float]): Memory probe reading above which a driver is
+                recycled on checkin; None disables the probe
+            checkout_timeout (float): Default seconds to wait for a free driver
+            health_check (Callable): Returns False for drivers that must be replaced
+            memory_probe (Callable): Returns a driver's memory use in megabytes, or None
+        """
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.checkout_timeout = checkout_timeout
+        self.health_check = health_check
+        self.memory_probe = memory_probe
+        self._idle: List[_PooledDriver] = []
+        self._borrowed: Dict[int, _PooledDriver] = {}
+        self._live = 0
+        self._closed = False
+        self._available = threading.Condition()
+        self._counters = {'checkouts': 0, 'created': 0, 'recycled': 0, 'unhealthy': 0,
+                          'timeouts': 0, 'wait_seconds': 0.0}
+
+    def checkout(self, timeout: Optional[float] = None):
+        """
+        Borrow a driver, launching one if the pool is below size
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for a free driver; defaults to
+                checkout_timeout
+
+        Returns:
+            A healthy WebDriver
+
+        Raises:
+            DriverCheckoutTimeout: If no driver became available in time
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        while True:
+            entry = None
+            with self._available:
+                while not self._idle and self._live >= self.size:
+                    if self._closed:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._available.wait(remaining):
+                        if not self._idle and self._live >= self.size:
+                            self._counters['timeouts'] += 1
+                            raise DriverCheckoutTimeout(f"No driver available within {timeout}s")
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    entry = self._idle.pop()
+                else:
+                    self._live += 1
+
+            if entry is None:
+                entry = self._create()
+            elif not self.health_check(entry.driver):
+                logger.warning("Discarding unresponsive pooled driver")
+                self._discard(entry, 'unhealthy')
+                continue
+
+            entry.uses += 1
+            with self._available:
+                self._borrowed[id(entry.driver)] = entry
+                self._counters['checkouts'] += 1
+                self._counters['wait_seconds'] += time.monotonic() - started
+            return entry.driver
+
+    def checkin(self, driver, broken: bool = False):
+        """
+        Return a borrowed driver to the pool
+
+        Args:
+            driver: Driver obtained from checkout
+            broken (bool): True if the borrower saw the browser fail; it is replaced
+        """
+        with self._available:
+            entry = self._borrowed.pop(id(driver), None)
+        if entry is None:
+            logger.warning("Ignoring checkin of a driver that is not borrowed from this pool")
+            return
+
+        if broken or self._closed or self._should_recycle(entry):
+            self._discard(entry, 'recycled')
+            return
+
+        with self._available:
+            self._idle.append(entry)
+            self._available.notify()
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """
+        Borrow a driver for the duration of a with block
+
+        A WebDriverException escaping the block marks the driver broken.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for a free driver
+        """
+        driver = self.checkout(timeout)
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.checkin(driver, broken=broken)
+
+    def _should_recycle(self, entry: _PooledDriver) -> bool:
+        """Decide whether a returned driver has reached its use or memory limit"""
+        if entry.uses >= self.max_uses:
+            return True
+        if self.max_memory_mb is not None:
+            memory = self.memory_probe(entry.driver)
+            if memory is not None and memory > self.max_memory_mb:
+                logger.info(f"Recycling driver using {memory:.0f} MB")
+                return True
+        return False
+
+    def _create(self) -> _PooledDriver:
+        """Launch a driver for a slot already reserved in _live"""
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._available:
+                self._live -= 1
+                self._available.notify()
+            raise
+        with self._available:
+            self._counters['created'] += 1
+        return _PooledDriver(driver)
+
+    def _discard(self, entry: _PooledDriver, reason: Optional[str] = None):
+        """Quit a driver and free its slot, counting the reason it was dropped"""
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            logger.error(f"Error quitting driver: {str(e)}")
+        with self._available:
+            self._live -= 1
+            if reason:
+                self._counters[reason] += 1
+            self._available.notify()
+
+    def stats(self) -> Dict:
+        """
+        Get pool counters for monitoring
+
+        Returns:
+            Dict with live, idle and borrowed counts plus lifetime counters
+        """
+        with self._available:
+            return {**self._counters, 'wait_seconds': round(self._counters['wait_seconds'], 3),
+                    'live': self._live, 'idle': len(self._idle), 'borrowed': len(self._borrowed),
+                    'size': self.size}
+
+    def close(self):
+        """Quit idle drivers; borrowed ones are quit when they are checked in"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for entry in idle:
+            self._discard(entry)
+
+_pool: Optional[DriverPool] = None
+_pool_lock = threading.Lock()
+
+def driver_pool_size() -> int:
+    """
+    Number of drivers in the shared pool, from DRIVER_POOL_SIZE or BROWSER_POOL_SIZE
+
+    Returns:
+        int: Pool size
+    """
+    return int(os.getenv('DRIVER_POOL_SIZE', os.getenv('BROWSER_POOL_SIZE', '2')))
+
+def get_driver_pool() -> DriverPool:
+    """
+    Get the process-wide driver pool, configured from DRIVER_POOL_* environment variables
+
+    Returns:
+        DriverPool: Shared pool
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                max_memory = os.getenv('DRIVER_POOL_MAX_MEMORY_MB', '512')
+                _pool = DriverPool(
+                    size=driver_pool_size(),
+                    max_uses=int(os.getenv('DRIVER_POOL_MAX_USES', '50')),
+                    max_memory_mb=float(max_memory) if max_memory else None,
+                    checkout_timeout=float(os.getenv('DRIVER_POOL_CHECKOUT_TIMEOUT', '30'))
+                )
+    return _pool
+
+def close_driver_pool():
+    """Quit the shared pool's drivers"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
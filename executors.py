@@ -0,0 +1,174 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+# Default (workers, queue limit) of each executor, overridable with
+# <NAME>_POOL_SIZE and <NAME>_QUEUE_LIMIT environment variables
+EXECUTOR_DEFAULTS = {
+    'browser': (2, 16),
+    'parser': (os.cpu_count() or 2, 64),
+    'database': (8, 128),
+}
+
+class ExecutorBusyError(Exception):
+    """Raised when an executor's wait queue is full"""
+
+    def __init__(self, name: str):
+        super().__init__(f"The {name} executor is at capacity, retry later")
+        self.name = name
+
+class BoundedExecutor:
+    """
+    Thread pool for running blocking work from coroutines with bounded concurrency.
+
+    At most max_workers calls run at once. Up to max_queue further calls wait their turn
+    without blocking the event loop; calls beyond that are rejected with
+    ExecutorBusyError so callers can shed load instead of piling up.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        """
+        Initialize the executor
+
+        Args:
+            name (str): Executor name, used in thread names and metrics
+            max_workers (int): Maximum number of concurrent calls
+            max_queue (int): Maximum number of calls waiting for a worker
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-worker")
+        self._lock = threading.Lock()
+        self._counters = {'active': 0, 'waiting': 0, 'completed': 0, 'failed': 0, 'rejected': 0}
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable in the pool and await its result
+
+        Args:
+            func (Callable): Blocking function
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The function's return value
+
+        Raises:
+            ExecutorBusyError: If the wait queue is full
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._counters['active'] + self._counters['waiting'] >= self.max_workers + self.max_queue:
+                self._counters['rejected'] += 1
+                raise ExecutorBusyError(self.name)
+            self._counters['waiting'] += 1
+
+        call = functools.partial(func, *args, **kwargs)
+        future = self._executor.submit(self._run_counted, call)
+        # Cancelling the awaiting coroutine cancels a queued call before _run_counted runs
+        future.add_done_callback(self._release_cancelled)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _release_cancelled(self, future: Future):
+        """Free the waiting slot of a call cancelled before it started"""
+        if future.cancelled():
+            with self._lock:
+                self._counters['waiting'] -= 1
+
+    def _run_counted(self, call: Callable) -> Any:
+        """Track a call through the waiting, active and finished states"""
+        with self._lock:
+            self._counters['waiting'] -= 1
+            self._counters['active'] += 1
+        try:
+            result = call()
+            with self._lock:
+                self._counters['completed'] += 1
+            return result
+        except Exception:
+            with self._lock:
+                self._counters['failed'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._counters['active'] -= 1
+
+    def stats(self) -> Dict:
+        """
+        Get executor counters for monitoring
+
+        Returns:
+            Dict with active, waiting, completed, failed and rejected counts
+        """
+        with self._lock:
+            return {**self._counters, 'max_workers': self.max_workers, 'max_queue': self.max_queue}
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=wait)
+
+_executors: Dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+def get_executor(name: str) -> BoundedExecutor:
+    """
+    Get a process-wide executor by name ('browser', 'parser' or 'database')
+
+    Args:
+        name (str): Executor name
+
+    Returns:
+        BoundedExecutor: Shared executor
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                workers, queue = EXECUTOR_DEFAULTS[name]
+                executor = BoundedExecutor(
+                    name,
+                    max_workers=int(os.getenv(f'{name.upper()}_POOL_SIZE', str(workers))),
+                    max_queue=int(os.getenv(f'{name.upper()}_QUEUE_LIMIT', str(queue)))
+                )
+                _executors[name] = executor
+    return executor
+
+async def run_blocking(name: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking callable on a named executor
+
+    Args:
+        name (str): Executor name
+        func (Callable): Blocking function
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The function's return value
+    """
+    return await get_executor(name).run(func, *args, **kwargs)
+
+def executor_stats() -> Dict:
+    """
+    Get the counters of every executor for monitoring
+
+    Returns:
+        Dict mapping executor names to their counters
+    """
+    with _executors_lock:
+        return {name: executor.stats() for name, executor in _executors.items()}
+
+def shutdown_executors():
+    """Stop every executor"""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=False)
+        _executors.clear()
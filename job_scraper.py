@@ -1,15 +1,11 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
 import logging
-import time
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Sequence
 import os
 from dotenv import load_dotenv
-from ..utils.helpers import clean_text, parse_date
-from ..processors.skill_processor import SkillProcessor
+from ..processors.skill_processor import SkillProcessor, get_skill_processor
+from .driver_pool import DriverPool, get_driver_pool
+from .job_sources import JOB_SOURCES, GlassdoorSource, IndeedSource, JobSource, scrape_sources
+from .scrape_cache import ScrapeCache
 
 # Load environment variables
 load_dotenv()
@@ -17,86 +13,83 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 class JobScraper:
-    def __init__(self):
-        """Initialize the job scraper with Selenium WebDriver"""
-        self.driver = None
-        self.skill_processor = SkillProcessor()
-        self.setup_driver()
-
-    def setup_driver(self):
-        """Set up the Selenium WebDriver with appropriate options"""
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+    def __init__(self, skill_processor: Optional[SkillProcessor] = None,
+                 driver_pool: Optional[DriverPool] = None,
+                 sources: Optional[Sequence[JobSource]] = None,
+                 scrape_cache: Optional[ScrapeCache] = None):
+        """
+        Initialize the job scraper
         
-        self.driver = webdriver.Chrome(options=options)
-        self.wait = WebDriverWait(self.driver, 10)
+        Args:
+            skill_processor (Optional[SkillProcessor]): Processor used to extract skills
+            driver_pool (Optional[DriverPool]): Pool each results page borrows a WebDriver from
+            sources (Optional[Sequence[JobSource]]): Job boards to search; defaults to all
+            scrape_cache (Optional[ScrapeCache]): Cache of result pages; None always scrapes
+        """
+        self.skill_processor = skill_processor or get_skill_processor()
+        self.driver_pool = driver_pool or get_driver_pool()
+        self.sources = list(sources) if sources else [source() for source in JOB_SOURCES.values()]
+        self.scrape_cache = scrape_cache
 
-    def scrape_indeed_jobs(self, job_title: str, location: str = "", max_pages: int = 5) -> List[Dict]:
+    def scrape_jobs(self, job_title: str, location: str = "", max_pages: int = 5,
+                    deadline_seconds: Optional[float] = None,
+                    sources: Optional[Sequence[JobSource]] = None,
+                    extract_skills: bool = True,
+                    on_page: Optional[Callable[[List[Dict]], Optional[bool]]] = None) -> List[Dict]:
         """
-        Scrape job postings from Indeed
+        Scrape job postings from several sources in parallel
+        
+        Pages are merged as they arrive, dropping postings already seen under the same URL.
+        When the deadline passes, or on_page returns False, the jobs scraped so far are
+        returned.
         
         Args:
             job_title (str): Job title to search for
             location (str): Location to search in
-            max_pages (int): Maximum number of pages to scrape
+            max_pages (int): Maximum number of pages to scrape per source
+            deadline_seconds (Optional[float]): Time budget for the whole scrape
+            sources (Optional[Sequence[JobSource]]): Sources to use instead of self.sources
+            extract_skills (bool): Attach a 'skills' list to each job; callers that only
+                extract skills for new postings pass False
+            on_page (Optional[Callable]): Called with the new postings of each page as it
+                arrives; returning False stops the scrape
             
         Returns:
             List of job posting data
         """
         jobs = []
+        seen_urls = set()
         try:
-            # Format search URL
-            search_url = f"https://www.indeed.com/jobs?q={job_title.replace(' ', '+')}"
-            if location:
-                search_url += f"&l={location.replace(' ', '+')}"
-            
-            self.driver.get(search_url)
-            time.sleep(3)  # Allow page to load
-            
-            for page in range(max_pages):
-                # Get job cards
-                job_cards = self.driver.find_elements(By.CSS_SELECTOR, ".job_seen_beacon")
-                
-                for card in job_cards:
-                    try:
-                        # Extract job data
-                        job_data = {
-                            'title': self._get_text(card, ".jobTitle"),
-                            'company': self._get_text(card, ".companyName"),
-                            'location': self._get_text(card, ".companyLocation"),
-                            'description': self._get_text(card, ".job-snippet"),
-                            'posted_date': self._get_text(card, ".date"),
-                            'url': self._get_job_url(card)
-                        }
-                        
-                        # Extract skills from description
-                        job_data['skills'] = self.skill_processor.extract_skills_from_text(
-                            job_data['description']
-                        )
-                        
-                        jobs.append(job_data)
-                        
-                    except Exception as e:
-                        logger.error(f"Error extracting job data: {str(e)}")
+            for page_jobs in scrape_sources(sources or self.sources, self.driver_pool, job_title,
+                                            location or "", max_pages, deadline_seconds,
+                                            self.scrape_cache):
+                new_jobs = []
+                for job in page_jobs:
+                    if job['url'] and job['url'] in seen_urls:
                         continue
-                
-                # Try to click next page
-                try:
-                    next_button = self.driver.find_element(By.CSS_SELECTOR, "[aria-label='Next Page']")
-                    if not next_button.is_enabled():
-                        break
-                    next_button.click()
-                    time.sleep(3)
-                except:
+                    seen_urls.add(job['url'])
+                    new_jobs.append(job)
+                jobs.extend(new_jobs)
+                if on_page is not None and on_page(new_jobs) is False:
                     break
-                    
         except Exception as e:
-            logger.error(f"Error scraping Indeed jobs: {str(e)}")
+            logger.error(f"Error scraping jobs: {str(e)}")
             
-        return jobs
+        return self._attach_skills(jobs) if extract_skills else jobs
+
+    def scrape_indeed_jobs(self, job_title: str, location: str = "", max_pages: int = 5) -> List[Dict]:
+        """
+        Scrape job postings from Indeed
+        
+        Args:
+            job_title (str): Job title to search for
+            location (str): Location to search in
+            max_pages (int): Maximum number of pages to scrape
+            
+        Returns:
+            List of job posting data
+        """
+        return self.scrape_jobs(job_title, location, max_pages, sources=[IndeedSource()])
 
     def scrape_glassdoor_jobs(self, job_title: str, location: str = "", max_pages: int = 5) -> List[Dict]:
         """
@@ -110,87 +103,16 @@ class JobScraper:
         Returns:
             List of job posting data
         """
-        jobs = []
-        try:
-            # Format search URL
-            search_url = f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={job_title.replace(' ', '+')}"
-            if location:
-                search_url += f"&loc={location.replace(' ', '+')}"
-            
-            self.driver.get(search_url)
-            time.sleep(3)
-            
-            for page in range(max_pages):
-                # Get job cards
-                job_cards = self.driver.find_elements(By.CSS_SELECTOR, ".react-job-listing")
-                
-                for card in job_cards:
-                    try:
-                        # Extract job data
-                        job_data = {
-                            'title': self._get_text(card, ".job-title"),
-                            'company': self._get_text(card, ".employer-name"),
-                            'location': self._get_text(card, ".location"),
-                            'description': self._get_job_description(card),
-                            'posted_date': self._get_text(card, ".listing-age"),
-                            'url': self._get_job_url(card)
-                        }
-                        
-                        # Extract skills from description
-                        job_data['skills'] = self.skill_processor.extract_skills_from_text(
-                            job_data['description']
-                        )
-                        
-                        jobs.append(job_data)
-                        
-                    except Exception as e:
-                        logger.error(f"Error extracting job data: {str(e)}")
-                        continue
-                
-                # Try to click next page
-                try:
-                    next_button = self.driver.find_element(By.CSS_SELECTOR, "[data-test='pagination-next']")
-                    if not next_button.is_enabled():
-                        break
-                    next_button.click()
-                    time.sleep(3)
-                except:
-                    break
-                    
-        except Exception as e:
-            logger.error(f"Error scraping Glassdoor jobs: {str(e)}")
-            
-        return jobs
-
-    def _get_text(self, element, selector: str) -> str:
-        """Helper method to safely extract text from an element"""
-        try:
-            text = element.find_element(By.CSS_SELECTOR, selector).text
-            return clean_text(text)
-        except:
-            return ""
+        return self.scrape_jobs(job_title, location, max_pages, sources=[GlassdoorSource()])
 
-    def _get_job_url(self, element) -> str:
-        """Extract job URL from element"""
-        try:
-            return element.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
-        except:
-            return ""
-
-    def _get_job_description(self, element) -> str:
-        """Extract full job description"""
-        try:
-            # Click on job card to load description
-            element.click()
-            time.sleep(2)
-            
-            # Get description from modal or new page
-            description = self._get_text(self.driver, ".jobDescriptionContent")
-            return description
-        except:
-            return ""
+    def _attach_skills(self, jobs: List[Dict]) -> List[Dict]:
+        """Extract skills from all scraped descriptions in one batch"""
+        document_skills, _ = self.skill_processor.extract_skills_batch(
+            job['description'] for job in jobs
+        )
+        for job, skills in zip(jobs, document_skills):
+            job['skills'] = skills
+        return jobs
 
     def close(self):
-        """Close the WebDriver"""
-        if self.driver:
-            self.driver.quit() 
\ No newline at end of file
+        """Nothing to release; each page returns its WebDriver to the pool when done"""
@@ -0,0 +1,382 @@
+from selenium.webdriver.common.by import By
+from bs4 import BeautifulSoup
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urljoin
+from urllib3.util.retry import Retry
+import functools
+import logging
+import os
+import requests
+import threading
+import time
+from ..utils.helpers import clean_text
+from .driver_pool import DriverPool, USER_AGENT, driver_pool_size
+from .scrape_cache import ScrapeCache
+from .waits import AdaptiveWaiter, text_changed
+
+logger = logging.getLogger(__name__)
+
+# Seconds a static page fetch may take before falling back to the browser
+STATIC_FETCH_TIMEOUT = float(os.getenv('JOB_STATIC_FETCH_TIMEOUT', '10'))
+
+class JobSource:
+    """
+    Adapter for one job board.
+
+    Subclasses describe how to address a results page by URL and how to read a job card,
+    so every page can be scraped independently on its own pooled driver. Sources whose
+    cards are server-rendered set supports_static, and their pages are first fetched over
+    plain HTTP and parsed without a browser. Their results_page_selectors recognise a
+    genuine results page, so one without cards counts as empty instead of blocked.
+    """
+
+    name = ''
+    base_url = ''
+    card_selector = ''
+    # Maps job fields to CSS selectors inside a card
+    card_fields: Dict[str, str] = {}
+    supports_static = False
+    # Markup present on real results pages, including past-the-end and no-result ones
+    results_page_selectors: Sequence[str] = ()
+
+    def __init__(self, base_url: Optional[str] = None):
+        """
+        Initialize the source
+
+        Args:
+            base_url (Optional[str]): Site root to use instead of the public one
+        """
+        if base_url:
+            self.base_url = base_url.rstrip('/')
+
+    def search_url(self, job_title: str, location: str, page: int) -> str:
+        """
+        Build the URL of a results page
+
+        Args:
+            job_title (str): Job title to search for
+            location (str): Location to search in
+            page (int): Zero-based page number
+
+        Returns:
+            str: Page URL
+        """
+        raise NotImplementedError
+
+    def parse_card(self, card, driver, waiter: AdaptiveWaiter) -> Dict:
+        """
+        Extract job data from one result card
+
+        Args:
+            card: Card element
+            driver: WebDriver showing the results page
+            waiter (AdaptiveWaiter): Waiter for the page
+
+        Returns:
+            Dict: Job data
+        """
+        job_data = {field: self._get_text(card, selector) for field, selector in self.card_fields.items()}
+        job_data['url'] = self._get_job_url(card)
+        return job_data
+
+    def parse_html(self, html: str, page_url: str) -> Optional[List[Dict]]:
+        """
+        Extract job data from the cards of a server-rendered results page
+
+        Args:
+            html (str): Page HTML
+            page_url (str): URL the page was fetched from, for resolving links
+
+        Returns:
+            List of job posting data, empty for a results page without cards, or None if
+            the markup is not a recognised results page
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        jobs = []
+        for card in soup.select(self.card_selector):
+            job_data = {}
+            for field, selector in self.card_fields.items():
+                element = card.select_one(selector)
+                job_data[field] = clean_text(element.get_text(' ')) if element else ""
+            link = card.select_one('a[href]')
+            job_data['url'] = urljoin(page_url, link['href']) if link else ""
+            job_data['source'] = self.name
+            jobs.append(job_data)
+        if not jobs and not any(soup.select_one(selector) for selector in self.results_page_selectors):
+            return None
+        return jobs
+
+    def scrape_page_static(self, session: requests.Session, job_title: str, location: str,
+                           page: int) -> Optional[List[Dict]]:
+        """
+        Scrape one results page over HTTP without a browser
+
+        Args:
+            session (requests.Session): Pooled keep-alive session
+            job_title (str): Job title to search for
+            location (str): Location to search in
+            page (int): Zero-based page number
+
+        Returns:
+            List of job posting data (empty past the last page or without results), or
+            None if the page needs a browser (blocked, failed, or unrecognised markup)
+        """
+        url = self.search_url(job_title, location, page)
+        try:
+            response = session.get(url, timeout=STATIC_FETCH_TIMEOUT)
+        except requests.RequestException as e:
+            logger.info(f"Static fetch of {self.name} page {page + 1} failed: {str(e)}")
+            return None
+        if response.status_code != 200:
+            logger.info(f"Static fetch of {self.name} page {page + 1} returned {response.status_code}")
+            return None
+        jobs = self.parse_html(response.text, response.url)
+        if jobs is None:
+            logger.info(f"Static {self.name} page {page + 1} is not a recognised results page")
+        return jobs
+
+    def scrape_page(self, driver, job_title: str, location: str, page: int) -> List[Dict]:
+        """
+        Scrape one results page
+
+        Args:
+            driver: WebDriver borrowed for this page
+            job_title (str): Job title to search for
+            location (str): Location to search in
+            page (int): Zero-based page number
+
+        Returns:
+            List of job posting data
+        """
+        waiter = AdaptiveWaiter(driver, self.name)
+        driver.get(self.search_url(job_title, location, page))
+        waiter.results_loaded(self.card_selector)
+
+        jobs = []
+        for card in driver.find_elements(By.CSS_SELECTOR, self.card_selector):
+            try:
+                job_data = self.parse_card(card, driver, waiter)
+                job_data['source'] = self.name
+                jobs.append(job_data)
+            except Exception as e:
+                logger.error(f"Error extracting {self.name} job data: {str(e)}")
+        return jobs
+
+    def _get_text(self, element, selector: str) -> str:
+        """Helper method to safely extract text from an element"""
+        try:
+            text = element.find_element(By.CSS_SELECTOR, selector).text
+            return clean_text(text)
+        except:
+            return ""
+
+    def _get_job_url(self, element) -> str:
+        """Extract job URL from element"""
+        try:
+            return element.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
+        except:
+            return ""
+
+class IndeedSource(JobSource):
+    """Indeed search results, 10 jobs per page addressed with &start="""
+
+    name = 'indeed'
+    base_url = 'https://www.indeed.com'
+    card_selector = '.job_seen_beacon'
+    card_fields = {
+        'title': '.jobTitle',
+        'company': '.companyName',
+        'location': '.companyLocation',
+        'description': '.job-snippet',
+        'posted_date': '.date',
+    }
+    supports_static = True
+    results_page_selectors = ('#mosaic-provider-jobcards', '.jobsearch-NoResult-messageContainer')
+
+    def search_url(self, job_title: str, location: str, page: int) -> str:
+        url = f"{self.base_url}/jobs?q={job_title.replace(' ', '+')}"
+        if location:
+            url += f"&l={location.replace(' ', '+')}"
+        if page:
+            url += f"&start={page * 10}"
+        return url
+
+class GlassdoorSource(JobSource):
+    """
+    Glassdoor search results addressed with &p=.
+
+    Full descriptions only load in a side pane after clicking a card, so Glassdoor always
+    needs the browser.
+    """
+
+    name = 'glassdoor'
+    base_url = 'https://www.glassdoor.com'
+    card_selector = '.react-job-listing'
+    card_fields = {
+        'title': '.job-title',
+        'company': '.employer-name',
+        'location': '.location',
+        'posted_date': '.listing-age',
+    }
+
+    def search_url(self, job_title: str, location: str, page: int) -> str:
+        url = f"{self.base_url}/Job/jobs.htm?sc.keyword={job_title.replace(' ', '+')}"
+        if location:
+            url += f"&loc={location.replace(' ', '+')}"
+        if page:
+            url += f"&p={page + 1}"
+        return url
+
+    def parse_card(self, card, driver, waiter: AdaptiveWaiter) -> Dict:
+        job_data = super().parse_card(card, driver, waiter)
+        job_data['description'] = self._get_job_description(card, driver, waiter)
+        return job_data
+
+    def _get_job_description(self, element, driver, waiter: AdaptiveWaiter) -> str:
+        """Extract full job description"""
+        try:
+            previous = self._get_text(driver, ".jobDescriptionContent")
+
+            # Click on job card and wait for its description to replace the previous one
+            element.click()
+            waiter.until(text_changed(".jobDescriptionContent", previous), 'description')
+
+            return self._get_text(driver, ".jobDescriptionContent")
+        except:
+            return ""
+
+# Registered sources by name
+JOB_SOURCES = {
+    'indeed': IndeedSource,
+    'glassdoor': GlassdoorSource,
+}
+
+_fanout_executor: Optional[ThreadPoolExecutor] = None
+_fanout_lock = threading.Lock()
+
+def get_fanout_executor() -> ThreadPoolExecutor:
+    """
+    Get the process-wide thread pool that scrapes pages, sized like the driver pool
+
+    Pages queue on the driver pool, so more workers than drivers only adds waiting threads.
+    """
+    global _fanout_executor
+    if _fanout_executor is None:
+        with _fanout_lock:
+            if _fanout_executor is None:
+                _fanout_executor = ThreadPoolExecutor(max_workers=_fanout_workers(),
+                                                      thread_name_prefix='job-fanout')
+    return _fanout_executor
+
+def _fanout_workers() -> int:
+    """Number of pages scraped at once; one per pooled driver unless JOB_FANOUT_WORKERS is set"""
+    workers = os.getenv('JOB_FANOUT_WORKERS')
+    return int(workers) if workers else driver_pool_size()
+
+_http_session: Optional[requests.Session] = None
+
+def get_http_session() -> requests.Session:
+    """
+    Get the process-wide keep-alive HTTP session used for static page fetches
+
+    Its connection pool is sized to the fan-out workers so concurrent pages reuse
+    connections instead of opening new ones.
+    """
+    global _http_session
+    if _http_session is None:
+        with _fanout_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=len(JOB_SOURCES), pool_maxsize=_fanout_workers(),
+                                      max_retries=Retry(total=2, backoff_factor=0.3,
+                                                        status_forcelist=(502, 503, 504)))
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update({'User-Agent': USER_AGENT, 'Accept-Language': 'en-US,en;q=0.9'})
+                _http_session = session
+    return _http_session
+
+def _scrape_page(source: JobSource, driver_pool: DriverPool, job_title: str, location: str,
+                 page: int, checkout_timeout: Optional[float] = None) -> List[Dict]:
+    """Scrape one page, over plain HTTP when the source allows it, otherwise on a pooled driver"""
+    if source.supports_static:
+        jobs = source.scrape_page_static(get_http_session(), job_title, location, page)
+        if jobs is not None:
+            return jobs
+        logger.info(f"Falling back to the browser for {source.name} page {page + 1}")
+
+    with driver_pool.driver(timeout=checkout_timeout) as driver:
+        return source.scrape_page(driver, job_title, location, page)
+
+def _scrape_page_task(source: JobSource, driver_pool: DriverPool, job_title: str, location: str,
+                      page: int, deadline: float, cache: Optional[ScrapeCache] = None) -> List[Dict]:
+    """
+    Scrape one page through the cache when one is given, otherwise giving up if no
+    driver frees up before the deadline
+    """
+    if cache is None:
+        return _scrape_page(source, driver_pool, job_title, location, page,
+                            checkout_timeout=max(deadline - time.monotonic(), 0))
+
+    # A cached page is worth finishing after the deadline, and background refreshes of
+    # stale pages have none, so they wait on the pool's own checkout timeout
+    scrape = functools.partial(_scrape_page, source, driver_pool, job_title, location, page)
+    return cache.get_or_scrape(cache.key_for(source.name, job_title, location, page), scrape)
+
+def scrape_sources(sources: Sequence[JobSource], driver_pool: DriverPool, job_title: str,
+                   location: str = "", max_pages: int = 5, deadline_seconds: Optional[float] = None,
+                   cache: Optional[ScrapeCache] = None) -> Iterator[List[Dict]]:
+    """
+    Scrape every page of every source in parallel, yielding each page's jobs as it finishes
+
+    Each page runs on its own pooled driver. Once a source returns an empty page its later
+    pages are cancelled if they have not started. When the deadline passes, unfinished
+    pages are abandoned and the generator stops, so callers get partial results instead of
+    waiting for the slowest site.
+
+    Args:
+        sources (Sequence[JobSource]): Sources to scrape
+        driver_pool (DriverPool): Pool the pages borrow drivers from
+        job_title (str): Job title to search for
+        location (str): Location to search in
+        max_pages (int): Maximum number of pages per source
+        deadline_seconds (Optional[float]): Time budget for the whole fan-out
+        cache (Optional[ScrapeCache]): Cache consulted before scraping each page
+
+    Yields:
+        List of job posting data from one page
+    """
+    deadline = time.monotonic() + (deadline_seconds if deadline_seconds is not None else float('inf'))
+    checkout_deadline = min(deadline, time.monotonic() + driver_pool.checkout_timeout)
+    executor = get_fanout_executor()
+    futures = {
+        executor.submit(_scrape_page_task, source, driver_pool, job_title, location, page,
+                        checkout_deadline, cache): (source, page)
+        for source in sources for page in range(max_pages)
+    }
+
+    try:
+        while futures:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Job scrape deadline reached with {len(futures)} pages unfinished")
+                return
+            done, _ = wait(futures, timeout=remaining if remaining != float('inf') else None,
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                source, page = futures.pop(future)
+                try:
+                    jobs = future.result()
+                except Exception as e:
+                    logger.error(f"Error scraping {source.name} page {page + 1}: {str(e)}")
+                    continue
+                if not jobs:
+                    for pending, (other, other_page) in list(futures.items()):
+                        if other is source and other_page > page and pending.cancel():
+                            del futures[pending]
+                yield jobs
+    finally:
+        for future in futures:
+            future.cancel()
@@ -1,14 +1,12 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
 import logging
-import time
 from typing import Dict, List, Optional
 import os
 from dotenv import load_dotenv
+from .driver_pool import DriverPool, get_driver_pool
+from .linkedin_session import LinkedInSessionStore, get_linkedin_session_store
+from .waits import AdaptiveWaiter
 
 # Load environment variables
 load_dotenv()
@@ -16,33 +14,42 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 class LinkedInScraper:
-    def __init__(self):
-        """Initialize the LinkedIn scraper with Selenium WebDriver"""
+    def __init__(self, driver_pool: Optional[DriverPool] = None,
+                 session_store: Optional[LinkedInSessionStore] = None):
+        """Initialize the LinkedIn scraper; a WebDriver is borrowed from the pool on first use"""
         self.driver = None
-        self.setup_driver()
+        self.waiter = None
+        self.driver_pool = driver_pool or get_driver_pool()
+        self.session_store = session_store or get_linkedin_session_store()
 
     def setup_driver(self):
-        """Set up the Selenium WebDriver with appropriate options"""
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')  # Run in headless mode
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        
-        # Add user agent to avoid detection
-        options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-        
-        self.driver = webdriver.Chrome(options=options)
-        self.wait = WebDriverWait(self.driver, 10)
+        """Borrow a Selenium WebDriver from the driver pool unless one is already held"""
+        if self.driver is None:
+            self.driver = self.driver_pool.checkout()
+            self.waiter = AdaptiveWaiter(self.driver, 'linkedin')
 
     def login(self):
+        """
+        Authenticate the driver, reusing the shared LinkedIn session when one exists
+        
+        The login form is only submitted when no session has been captured yet.
+        """
+        try:
+            self.setup_driver()
+            return self.session_store.ensure(self.driver, self._submit_login)
+        except Exception as e:
+            logger.error(f"Login failed: {str(e)}")
+            return False
+
+    def _submit_login(self) -> bool:
         """Login to LinkedIn using credentials from environment variables"""
         try:
             self.driver.get('https://www.linkedin.com/login')
             
             # Wait for login form
-            username_field = self.wait.until(
-                EC.presence_of_element_located((By.ID, "username"))
-            )
+            username_field = self.waiter.element_present("#username", 'login_form')
+            if username_field is None:
+                return False
             password_field = self.driver.find_element(By.ID, "password")
             
             # Enter credentials
@@ -53,9 +60,7 @@ class LinkedInScraper:
             self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
             
             # Wait for login to complete
-            time.sleep(3)
-            
-            return True
+            return bool(self.waiter.until(lambda driver: '/login' not in driver.current_url, 'login'))
         except Exception as e:
             logger.error(f"Login failed: {str(e)}")
             return False
@@ -71,8 +76,15 @@ class LinkedInScraper:
             Dict containing profile information including skills
         """
         try:
+            self.setup_driver()
             self.driver.get(profile_url)
-            time.sleep(3)  # Allow page to load
+            
+            # Re-login once if LinkedIn bounced the stored session
+            if self.session_store.is_expired(self.driver):
+                stale_generation = self.session_store.applied_generation(self.driver)
+                if self.session_store.refresh(self.driver, self._submit_login, stale_generation):
+                    self.driver.get(profile_url)
+            self.waiter.element_present('h1', 'profile')  # Allow page to load
             
             # Extract basic information
             profile_data = {
@@ -91,11 +103,9 @@ class LinkedInScraper:
             raise
 
     def _get_text(self, selector: str) -> str:
-        """Helper method to safely extract text from an element"""
+        """Helper method to safely extract text from an element of the loaded page"""
         try:
-            element = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-            )
+            element = self.driver.find_element(By.CSS_SELECTOR, selector)
             return element.text.strip()
         except:
             return ""
@@ -108,7 +118,7 @@ class LinkedInScraper:
             show_more = self.driver.find_elements(By.CSS_SELECTOR, "button.inline-show-more-text__button")
             if show_more:
                 show_more[0].click()
-                time.sleep(1)
+                self.waiter.results_loaded(".pv-skill-category-entity__name-text", 'skills')
             
             # Get all skill elements
             skill_elements = self.driver.find_elements(
@@ -134,7 +144,7 @@ class LinkedInScraper:
             )
             if show_more:
                 show_more[0].click()
-                time.sleep(1)
+                self.waiter.results_loaded(".pv-entity__position-group-pager", 'experience')
             
             # Get experience elements
             exp_elements = self.driver.find_elements(
@@ -157,6 +167,7 @@ class LinkedInScraper:
         return experience
 
     def close(self):
-        """Close the WebDriver"""
+        """Return the WebDriver to the pool"""
         if self.driver:
-            self.driver.quit() 
\ No newline at end of file
+            self.driver_pool.checkin(self.driver)
+            self.driver = None 
\ No newline at end of file
@@ -0,0 +1,199 @@
+from typing import Callable, Dict, List, Optional
+import json
+import logging
+import os
+import threading
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# Lightweight page on the LinkedIn origin, loaded so cookies and localStorage can be set
+SESSION_BOOTSTRAP_URL = 'https://www.linkedin.com/robots.txt'
+
+# URL fragments LinkedIn redirects to when a session is missing or has expired
+LOGIN_REDIRECT_MARKERS = ('/login', '/authwall', '/checkpoint', '/uas/login')
+
+READ_LOCAL_STORAGE = 'return Object.assign({}, window.localStorage);'
+WRITE_LOCAL_STORAGE = (
+    'window.localStorage.clear();'
+    'for (const [key, value] of Object.entries(arguments[0])) { window.localStorage.setItem(key, value); }'
+)
+
+class LinkedInSessionStore:
+    """
+    Authenticated LinkedIn session (cookies and localStorage) shared by every scraper.
+
+    A session captured from one logged-in driver is replayed into other pooled drivers
+    instead of logging in again. Each login bumps a generation counter; drivers remember
+    which generation they carry, and concurrent re-logins after an expiry are
+    single-flighted so only the first caller submits the login form.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the store
+
+        Args:
+            path (Optional[str]): JSON file the session is persisted to, so it survives
+                restarts; None keeps it in memory only
+        """
+        self.path = path
+        self.generation = 0
+        self._cookies: Optional[List[Dict]] = None
+        self._local_storage: Dict[str, str] = {}
+        self._applied = weakref.WeakKeyDictionary()
+        self._login_lock = threading.Lock()
+        self._counters = {'logins': 0, 'reuses': 0, 'expirations': 0}
+        self._load()
+
+    @property
+    def has_session(self) -> bool:
+        """True once a session has been captured"""
+        return self._cookies is not None
+
+    def ensure(self, driver, login: Callable[[], bool]) -> bool:
+        """
+        Make sure a driver carries the current session, logging in only if none exists
+
+        Args:
+            driver: WebDriver to prepare
+            login (Callable[[], bool]): Submits the login form in that driver
+
+        Returns:
+            bool: True if the driver is authenticated
+        """
+        generation = self.generation
+        if not self.has_session:
+            return self.refresh(driver, login, generation)
+        if self._applied.get(driver) != generation:
+            self._apply(driver)
+        return True
+
+    def refresh(self, driver, login: Callable[[], bool], stale_generation: int) -> bool:
+        """
+        Replace an expired session, single-flighting concurrent callers
+
+        Callers pass the generation they saw expire. If another caller already logged in
+        since then, the newer session is applied instead of logging in again.
+
+        Args:
+            driver: WebDriver that needs a valid session
+            login (Callable[[], bool]): Submits the login form in that driver
+            stale_generation (int): Generation of the session that failed
+
+        Returns:
+            bool: True if the driver is authenticated
+        """
+        with self._login_lock:
+            if self.has_session and self.generation != stale_generation:
+                self._apply(driver)
+                return True
+
+            if not login():
+                return False
+
+            self._capture(driver)
+            self.generation += 1
+            self._applied[driver] = self.generation
+            self._counters['logins'] += 1
+            self._save()
+            return True
+
+    def applied_generation(self, driver) -> Optional[int]:
+        """Get the session generation a driver carries, if any"""
+        return self._applied.get(driver)
+
+    def is_expired(self, driver) -> bool:
+        """
+        Check whether LinkedIn bounced the driver to a login or authwall page
+
+        Args:
+            driver: WebDriver after loading a page that requires a session
+
+        Returns:
+            bool: True if the session must be refreshed
+        """
+        expired = any(marker in driver.current_url for marker in LOGIN_REDIRECT_MARKERS)
+        if expired:
+            self._counters['expirations'] += 1
+            logger.info("LinkedIn session expired, logging in again")
+        return expired
+
+    def stats(self) -> Dict:
+        """
+        Get session counters for monitoring
+
+        Returns:
+            Dict with login, reuse and expiration counts and the current generation
+        """
+        return {**self._counters, 'generation': self.generation, 'has_session': self.has_session}
+
+    def _capture(self, driver):
+        """Copy cookies and localStorage out of a logged-in driver"""
+        self._cookies = driver.get_cookies()
+        try:
+            self._local_storage = driver.execute_script(READ_LOCAL_STORAGE) or {}
+        except Exception as e:
+            logger.error(f"Error reading localStorage: {str(e)}")
+            self._local_storage = {}
+
+    def _apply(self, driver):
+        """Replay the stored session into a driver"""
+        generation = self.generation
+        driver.get(SESSION_BOOTSTRAP_URL)
+        driver.delete_all_cookies()
+        for cookie in self._cookies:
+            cookie = dict(cookie)
+            if 'expiry' in cookie:
+                cookie['expiry'] = int(cookie['expiry'])
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.error(f"Error restoring cookie {cookie.get('name')}: {str(e)}")
+        if self._local_storage:
+            driver.execute_script(WRITE_LOCAL_STORAGE, self._local_storage)
+        self._applied[driver] = generation
+        self._counters['reuses'] += 1
+
+    def _load(self):
+        """Read a persisted session"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self._cookies = state['cookies']
+            self._local_storage = state.get('local_storage', {})
+            self.generation = 1
+        except Exception as e:
+            logger.error(f"Error loading LinkedIn session from {self.path}: {str(e)}")
+
+    def _save(self):
+        """Persist the session atomically, readable by the owner only"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'cookies': self._cookies, 'local_storage': self._local_storage}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving LinkedIn session to {self.path}: {str(e)}")
+
+_store: Optional[LinkedInSessionStore] = None
+_store_lock = threading.Lock()
+
+def get_linkedin_session_store() -> LinkedInSessionStore:
+    """
+    Get the process-wide LinkedIn session store, persisted to LINKEDIN_SESSION_FILE if set
+
+    Returns:
+        LinkedInSessionStore: Shared store
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = LinkedInSessionStore(os.getenv('LINKEDIN_SESSION_FILE') or None)
+    return _store
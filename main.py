@@ -1,19 +1,32 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pathlib import Path
+from fastapi.responses import JSONResponse, StreamingResponse
+import asyncio
+import json
 import uvicorn
 import logging
 from typing import Optional, List, Dict
 import os
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 from .scrapers.linkedin_scraper import LinkedInScraper
 from .scrapers.job_scraper import JobScraper
+from .scrapers.driver_pool import close_driver_pool, get_driver_pool
+from .scrapers.linkedin_session import get_linkedin_session_store
+from .scrapers.waits import get_wait_recorder
+from .scrapers.scrape_cache import get_scrape_cache
 from .processors.pdf_parser import PDFParser
-from .processors.skill_processor import SkillProcessor
-from .database.database import get_db, init_db
-from .database.models import Profile, Skill, JobPosting, JobRequirement
+from .processors.profile_cache import get_profile_cache
+from .processors.skill_processor import SkillProcessor, get_skill_processor
+from .database.database import SessionLocal, db_pool_stats, get_db, init_db
+from .database.repository import save_profile, save_job_postings
+from .database.skill_cache import get_skill_id_cache, skill_id_cache_stats
+from .database.skill_index import INDEXED_KINDS, ensure_skill_index, search_skill_index, skill_index_stats
+from .database.skill_trends import (GRANULARITIES, query_skill_trends, rebuild_skill_trends, skill_importance,
+                                   update_skill_trends)
+from .database.models import SkillTrend
+from .utils.executors import ExecutorBusyError, executor_stats, run_blocking, shutdown_executors
+from .utils.analysis_queue import FINISHED_STATUSES, AnalysisContext, get_analysis_queue
 from sqlalchemy.orm import Session
 
 # Configure logging
@@ -44,13 +57,332 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create data directory if it doesn't exist
-Path("data/uploads").mkdir(parents=True, exist_ok=True)
+# Maximum accepted size of an uploaded profile PDF
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Process pool size for extracting pages of large PDFs; 0 extracts in-process
+PDF_PAGE_WORKERS = int(os.getenv('PDF_PAGE_WORKERS', '0'))
+
+# Seconds between skill trend rollup passes, and how many recent days each pass recomputes
+SKILL_TREND_INTERVAL = float(os.getenv('SKILL_TREND_INTERVAL', '600'))
+SKILL_TREND_WINDOW_DAYS = int(os.getenv('SKILL_TREND_WINDOW_DAYS', '7'))
+
+# Seconds a job scrape may take before the postings scraped so far are used
+JOB_SCRAPE_DEADLINE = float(os.getenv('JOB_SCRAPE_DEADLINE', '60'))
+
+# Days finished analyses are kept, and seconds between updates on an analysis event stream
+ANALYSIS_RETENTION_DAYS = int(os.getenv('ANALYSIS_RETENTION_DAYS', '7'))
+ANALYSIS_STREAM_INTERVAL = float(os.getenv('ANALYSIS_STREAM_INTERVAL', '1'))
+
+async def read_upload(upload: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> memoryview:
+    """
+    Read an uploaded file into memory, enforcing the size limit while streaming
+    
+    Args:
+        upload (UploadFile): Uploaded file
+        max_bytes (int): Maximum accepted size
+        
+    Returns:
+        memoryview: Uploaded content
+    """
+    buffer = bytearray()
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+        if len(buffer) > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Uploaded file exceeds the {max_bytes} byte limit"
+            )
+    return memoryview(buffer)
+
+def scrape_linkedin_profile(profile_url: str) -> Optional[Dict]:
+    """
+    Log in to LinkedIn and scrape a profile; blocking, runs on the browser executor
+    
+    Args:
+        profile_url (str): LinkedIn profile URL
+        
+    Returns:
+        Optional[Dict]: Profile data, or None if login failed
+    """
+    scraper = LinkedInScraper()
+    try:
+        if scraper.login():
+            return scraper.scrape_profile(profile_url)
+        return None
+    finally:
+        scraper.close()
+
+def parse_profile_upload(pdf_data: memoryview, skill_processor: SkillProcessor) -> Dict:
+    """
+    Parse an uploaded profile PDF; blocking, runs on the parser executor
+    
+    Args:
+        pdf_data (memoryview): PDF content
+        skill_processor (SkillProcessor): Shared skill processor
+        
+    Returns:
+        Dict: Profile data
+    """
+    parser = PDFParser(skill_processor, page_workers=PDF_PAGE_WORKERS)
+    return parser.parse_profile_pdf(pdf_data)
+
+def scrape_job_postings(job_title: str, location: Optional[str],
+                        skill_processor: SkillProcessor, extract_skills: bool = True) -> List[Dict]:
+    """
+    Scrape every job source in parallel; blocking, runs on the browser executor
+    
+    Args:
+        job_title (str): Job title to search for
+        location (Optional[str]): Location to search in
+        skill_processor (SkillProcessor): Shared skill processor
+        extract_skills (bool): Attach extracted skills to each posting
+        
+    Returns:
+        List[Dict]: Job postings, partial if the deadline passed
+    """
+    job_scraper = JobScraper(skill_processor, scrape_cache=get_scrape_cache())
+    try:
+        return job_scraper.scrape_jobs(job_title, location, deadline_seconds=JOB_SCRAPE_DEADLINE,
+                                       extract_skills=extract_skills)
+    finally:
+        job_scraper.close()
+
+def summarize_skill_trends(jobs: List[Dict], skill_processor: SkillProcessor) -> Dict:
+    """
+    Count how many job postings require each skill
+    
+    Args:
+        jobs (List[Dict]): Job postings with their skills
+        skill_processor (SkillProcessor): Shared skill processor
+        
+    Returns:
+        Dict with the number of postings and per-skill frequencies and percentages
+    """
+    skill_frequencies = skill_processor.get_skill_frequency([job['skills'] for job in jobs])
+    return {
+        "total_jobs": len(jobs),
+        "skill_trends": [
+            {
+                "skill": skill,
+                "frequency": count,
+                "percentage": round((count / len(jobs)) * 100, 2)
+            }
+            for skill, count in skill_frequencies.items()
+        ]
+    }
+
+def scrape_jobs_with_progress(job_title: str, location: Optional[str], skill_processor: SkillProcessor,
+                              context: AnalysisContext, report) -> List[Dict]:
+    """
+    Scrape job postings for a queued analysis, reporting after every page
+    
+    Args:
+        job_title (str): Job title to search for
+        location (Optional[str]): Location to search in
+        skill_processor (SkillProcessor): Shared skill processor
+        context (AnalysisContext): Context of the running analysis
+        report (Callable): Builds the partial result from the postings scraped so far
+        
+    Returns:
+        List[Dict]: Job postings with their skills
+    """
+    jobs = []
+    
+    def on_page(page_jobs: List[Dict]) -> bool:
+        for job in page_jobs:
+            job['skill_positions'] = skill_processor.extract_skill_positions(job['description'])
+            job['skills'] = list(job['skill_positions'])
+        jobs.extend(page_jobs)
+        context.report(report(jobs))
+        return not context.cancelled()
+    
+    job_scraper = JobScraper(skill_processor, scrape_cache=get_scrape_cache())
+    try:
+        job_scraper.scrape_jobs(job_title, location, deadline_seconds=JOB_SCRAPE_DEADLINE,
+                                extract_skills=False, on_page=on_page)
+    finally:
+        job_scraper.close()
+    context.check_cancelled()
+    return jobs
+
+def run_trends_analysis(params: Dict, context: AnalysisContext) -> Dict:
+    """
+    Queued version of /skills/trends; runs on an analysis worker
+    
+    Args:
+        params (Dict): job_title and location
+        context (AnalysisContext): Context of the running analysis
+        
+    Returns:
+        Dict: Skill trends of the scraped postings
+    """
+    skill_processor = get_skill_processor()
+    jobs = scrape_jobs_with_progress(
+        params['job_title'], params.get('location'), skill_processor, context,
+        lambda jobs: summarize_skill_trends(jobs, skill_processor)
+    )
+    
+    db = SessionLocal()
+    try:
+        save_job_postings_and_trends(db, jobs, None)
+    finally:
+        db.close()
+    return {"job_title": params['job_title'], "location": params.get('location'),
+            **summarize_skill_trends(jobs, skill_processor)}
+
+def run_compare_analysis(params: Dict, context: AnalysisContext) -> Dict:
+    """
+    Queued version of /skills/compare for a LinkedIn profile URL; runs on an analysis worker
+    
+    Args:
+        params (Dict): profile_url, job_title and location
+        context (AnalysisContext): Context of the running analysis
+        
+    Returns:
+        Dict: Comparison of the profile's skills with the postings' skills
+    """
+    skill_processor = get_skill_processor()
+    profile_data = scrape_linkedin_profile(params['profile_url'])
+    if not profile_data:
+        raise ValueError("Failed to extract profile data")
+    profile = {"name": profile_data['name'], "headline": profile_data['headline']}
+    profile_skills = skill_processor.extract_profile_skills(profile_data)
+    context.report({"profile": profile, "total_jobs": 0})
+    context.check_cancelled()
+    
+    jobs = scrape_jobs_with_progress(
+        params['job_title'], params.get('location'), skill_processor, context,
+        lambda jobs: {"profile": profile, "total_jobs": len(jobs)}
+    )
+    job_skills = {skill for job in jobs for skill in job['skills']}
+    db = SessionLocal()
+    try:
+        weights = skill_importance(db, params['job_title'])
+    finally:
+        db.close()
+    return {
+        "profile": profile,
+        "job_title": params['job_title'],
+        "location": params.get('location'),
+        "comparison": skill_processor.compare_skills(profile_skills, list(job_skills), weights or None)
+    }
+
+async def get_profile_data(profile_url: Optional[str], pdf_data: Optional[memoryview],
+                           skill_processor: SkillProcessor) -> Optional[Dict]:
+    """
+    Scrape or parse a profile off the event loop
+    
+    Args:
+        profile_url (Optional[str]): LinkedIn profile URL
+        pdf_data (Optional[memoryview]): Uploaded PDF content, used without a URL
+        skill_processor (SkillProcessor): Shared skill processor
+        
+    Returns:
+        Optional[Dict]: Profile data, or None if nothing could be extracted
+    """
+    if profile_url:
+        return await run_blocking('browser', scrape_linkedin_profile, profile_url)
+    if pdf_data is not None:
+        return await run_blocking('parser', parse_profile_upload, pdf_data, skill_processor)
+    return None
+
+def refresh_skill_trends(full: bool = False) -> int:
+    """
+    Recompute skill trend rollups in a session of its own
+
+    Args:
+        full (bool): Rebuild every day instead of the recent window
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    db = SessionLocal()
+    try:
+        if full or db.query(SkillTrend.id).first() is None:
+            return rebuild_skill_trends(db)
+        return rebuild_skill_trends(db, datetime.utcnow() - timedelta(days=SKILL_TREND_WINDOW_DAYS))
+    finally:
+        db.close()
+
+def save_job_postings_and_trends(db: Session, jobs: List[Dict], extract_skills) -> List[int]:
+    """Save job postings, then fold them into the skill trend rollups"""
+    posting_ids = save_job_postings(db, jobs, extract_skills)
+    try:
+        update_skill_trends(db, posting_ids)
+    except Exception as e:
+        # The background job will catch the rollups up
+        logger.error(f"Error updating skill trends: {str(e)}")
+    return posting_ids
+
+async def aggregate_skill_trends():
+    """Periodically roll job requirements up into skill trends"""
+    while True:
+        try:
+            await run_blocking('database', refresh_skill_trends)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error aggregating skill trends: {str(e)}")
+        await asyncio.sleep(SKILL_TREND_INTERVAL)
+
+def load_skill_indexes():
+    """Load the skill search indexes from the database"""
+    db = SessionLocal()
+    try:
+        for kind in INDEXED_KINDS:
+            ensure_skill_index(db, kind)
+    finally:
+        db.close()
+
+async def warm_skill_indexes():
+    """Load the skill search indexes in the background so startup is not delayed"""
+    try:
+        await run_blocking('database', load_skill_indexes)
+    except Exception as e:
+        logger.error(f"Error loading skill indexes: {str(e)}")
+
+@app.exception_handler(ExecutorBusyError)
+async def executor_busy_handler(request, exc: ExecutorBusyError):
+    """Shed load with a 503 when an executor's queue is full"""
+    logger.warning(str(exc))
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"})
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
+    """Initialize database, shared skill processor and caches on startup"""
     init_db()
+    get_skill_processor()
+    
+    db = SessionLocal()
+    try:
+        get_skill_id_cache(db).warm(db)
+    finally:
+        db.close()
+    get_scrape_cache().purge_expired()
+    app.state.skill_trend_task = asyncio.create_task(aggregate_skill_trends())
+    app.state.skill_index_task = asyncio.create_task(warm_skill_indexes())
+    
+    analysis_queue = get_analysis_queue()
+    analysis_queue.register('trends', run_trends_analysis)
+    analysis_queue.register('compare', run_compare_analysis)
+    analysis_queue.purge_finished(timedelta(days=ANALYSIS_RETENTION_DAYS))
+    analysis_queue.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background jobs and worker threads and quit pooled browsers"""
+    for name in ('skill_trend_task', 'skill_index_task'):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    get_analysis_queue().stop()
+    shutdown_executors()
+    close_driver_pool()
 
 @app.get("/")
 async def root():
@@ -60,11 +392,28 @@ async def root():
         "message": "LinkedIn Skill Analysis Bot API is running"
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime counters for monitoring"""
+    return {
+        "profile_cache": get_profile_cache().stats(),
+        "skill_id_cache": skill_id_cache_stats(),
+        "executors": executor_stats(),
+        "driver_pool": get_driver_pool().stats(),
+        "linkedin_session": get_linkedin_session_store().stats(),
+        "scraper_waits": get_wait_recorder().stats(),
+        "scrape_cache": get_scrape_cache().stats(),
+        "analysis_queue": get_analysis_queue().stats(),
+        "skill_index": skill_index_stats(),
+        "db_pool": db_pool_stats()
+    }
+
 @app.post("/analyze/profile")
 async def analyze_profile(
     profile_url: Optional[str] = None,
     pdf_file: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    skill_processor: SkillProcessor = Depends(get_skill_processor)
 ):
     """
     Analyze a LinkedIn profile either from URL or uploaded PDF
@@ -75,30 +424,11 @@ async def analyze_profile(
             detail="Either profile_url or pdf_file must be provided"
         )
     
+    pdf_data = await read_upload(pdf_file) if pdf_file and not profile_url else None
+    
     try:
-        profile_data = None
-        
-        if profile_url:
-            # Scrape profile from URL
-            scraper = LinkedInScraper()
-            try:
-                if scraper.login():
-                    profile_data = scraper.scrape_profile(profile_url)
-            finally:
-                scraper.close()
-                
-        elif pdf_file:
-            # Save uploaded file
-            file_path = f"data/uploads/{pdf_file.filename}"
-            with open(file_path, "wb") as f:
-                f.write(await pdf_file.read())
-            
-            # Parse PDF
-            parser = PDFParser()
-            profile_data = parser.parse_profile_pdf(file_path)
-            
-            # Clean up
-            os.remove(file_path)
+        # Scrape profile from URL or parse uploaded PDF in memory
+        profile_data = await get_profile_data(profile_url, pdf_data, skill_processor)
         
         if not profile_data:
             raise HTTPException(
@@ -107,32 +437,12 @@ async def analyze_profile(
             )
         
         # Process skills
-        skill_processor = SkillProcessor()
-        profile_data['skills'] = skill_processor.extract_skills_from_text(
-            profile_data.get('about', '') + ' ' + 
-            ' '.join([exp.get('description', '') for exp in profile_data.get('experience', [])])
+        profile_data['skills'] = await run_blocking(
+            'parser', skill_processor.extract_profile_skills, profile_data
         )
         
-        # Save to database
-        profile = Profile(
-            name=profile_data['name'],
-            headline=profile_data['headline'],
-            location=profile_data['location'],
-            about=profile_data['about']
-        )
-        db.add(profile)
-        db.commit()
-        
-        # Save skills
-        for skill_name in profile_data['skills']:
-            skill = db.query(Skill).filter_by(name=skill_name).first()
-            if not skill:
-                skill = Skill(name=skill_name)
-                db.add(skill)
-                db.commit()
-            profile.skills.append(skill)
-        
-        db.commit()
+        # Save profile and skills in one transaction
+        await run_blocking('database', save_profile, db, profile_data)
         
         return {
             "status": "success",
@@ -140,6 +450,8 @@ async def analyze_profile(
             "data": profile_data
         }
         
+    except (HTTPException, ExecutorBusyError):
+        raise
     except Exception as e:
         logger.error(f"Error analyzing profile: {str(e)}")
         raise HTTPException(
@@ -151,75 +463,54 @@ async def analyze_profile(
 async def get_skill_trends(
     job_title: str,
     location: Optional[str] = None,
-    db: Session = Depends(get_db)
+    mode: str = 'live',
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    granularity: Optional[str] = None,
+    db: Session = Depends(get_db),
+    skill_processor: SkillProcessor = Depends(get_skill_processor)
 ):
     """
     Get skill trends for a specific job title
+
+    mode='live' scrapes current postings; mode='rollup' answers from the precomputed
+    skill trends, optionally limited to a date range and split by day or week.
     """
+    if mode not in ('live', 'rollup'):
+        raise HTTPException(status_code=400, detail="mode must be 'live' or 'rollup'")
+    if granularity is not None and granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of {', '.join(GRANULARITIES)}")
+
     try:
+        if mode == 'rollup':
+            trends = await run_blocking('database', query_skill_trends, db, job_title,
+                                        start_date, end_date, granularity)
+            return {
+                "status": "success",
+                "job_title": job_title,
+                "start_date": start_date,
+                "end_date": end_date,
+                **trends
+            }
+
         # Scrape job postings
-        job_scraper = JobScraper()
-        indeed_jobs = job_scraper.scrape_indeed_jobs(job_title, location)
-        glassdoor_jobs = job_scraper.scrape_glassdoor_jobs(job_title, location)
-        job_scraper.close()
-        
-        # Combine and process job data
-        all_jobs = indeed_jobs + glassdoor_jobs
-        skill_processor = SkillProcessor()
+        all_jobs = await run_blocking('browser', scrape_job_postings, job_title, location,
+                                      skill_processor, False)
         
-        # Extract skills from all job descriptions
-        job_skills = []
-        for job in all_jobs:
-            skills = skill_processor.extract_skills_from_text(job['description'])
-            job_skills.append(skills)
-            
-            # Save job posting
-            job_posting = JobPosting(
-                title=job['title'],
-                company=job['company'],
-                location=job['location'],
-                description=job['description'],
-                url=job['url'],
-                posted_date=datetime.now()  # Use actual posted date if available
-            )
-            db.add(job_posting)
-            db.commit()
-            
-            # Save job requirements
-            for skill_name in skills:
-                skill = db.query(Skill).filter_by(name=skill_name).first()
-                if not skill:
-                    skill = Skill(name=skill_name)
-                    db.add(skill)
-                    db.commit()
-                
-                requirement = JobRequirement(
-                    job_posting_id=job_posting.id,
-                    skill_id=skill.id,
-                    importance_score=1.0  # Could be calculated based on position in description
-                )
-                db.add(requirement)
-            
-            db.commit()
-        
-        # Calculate skill frequencies
-        skill_frequencies = skill_processor.get_skill_frequency(job_skills)
+        # Save job postings incrementally; skills are only extracted for new or changed ones
+        await run_blocking('database', save_job_postings_and_trends, db, all_jobs,
+                           lambda descriptions: [skill_processor.extract_skill_positions(description)
+                                                 for description in descriptions])
         
         return {
             "status": "success",
             "job_title": job_title,
             "location": location,
-            "total_jobs": len(all_jobs),
-            "skill_trends": [
-                {
-                    "skill": skill,
-                    "frequency": count,
-                    "percentage": round((count / len(all_jobs)) * 100, 2)
-                }
-                for skill, count in skill_frequencies.items()
-            ]
+            **summarize_skill_trends(all_jobs, skill_processor)
         }
         
+    except ExecutorBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error getting skill trends: {str(e)}")
         raise HTTPException(
@@ -233,7 +524,8 @@ async def compare_skills(
     pdf_file: Optional[UploadFile] = File(None),
     job_title: str = None,
     location: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    skill_processor: SkillProcessor = Depends(get_skill_processor)
 ):
     """
     Compare profile skills against job requirements
@@ -250,24 +542,14 @@ async def compare_skills(
             detail="job_title is required"
         )
     
+    pdf_data = await read_upload(pdf_file) if pdf_file and not profile_url else None
+    
     try:
-        # Get profile skills
-        profile_data = None
-        if profile_url:
-            scraper = LinkedInScraper()
-            try:
-                if scraper.login():
-                    profile_data = scraper.scrape_profile(profile_url)
-            finally:
-                scraper.close()
-        elif pdf_file:
-            file_path = f"data/uploads/{pdf_file.filename}"
-            with open(file_path, "wb") as f:
-                f.write(await pdf_file.read())
-            
-            parser = PDFParser()
-            profile_data = parser.parse_profile_pdf(file_path)
-            os.remove(file_path)
+        # Get the profile and the job requirements concurrently
+        profile_data, all_jobs = await asyncio.gather(
+            get_profile_data(profile_url, pdf_data, skill_processor),
+            run_blocking('browser', scrape_job_postings, job_title, location, skill_processor)
+        )
         
         if not profile_data:
             raise HTTPException(
@@ -275,26 +557,16 @@ async def compare_skills(
                 detail="Failed to extract profile data"
             )
         
-        # Get job requirements
-        job_scraper = JobScraper()
-        indeed_jobs = job_scraper.scrape_indeed_jobs(job_title, location)
-        glassdoor_jobs = job_scraper.scrape_glassdoor_jobs(job_title, location)
-        job_scraper.close()
-        
         # Process skills
-        skill_processor = SkillProcessor()
-        profile_skills = skill_processor.extract_skills_from_text(
-            profile_data.get('about', '') + ' ' + 
-            ' '.join([exp.get('description', '') for exp in profile_data.get('experience', [])])
-        )
+        profile_skills = await run_blocking('parser', skill_processor.extract_profile_skills, profile_data)
+        
+        job_skills = [skill for job in all_jobs for skill in job['skills']]
         
-        job_skills = []
-        for job in indeed_jobs + glassdoor_jobs:
-            skills = skill_processor.extract_skills_from_text(job['description'])
-            job_skills.extend(skills)
+        # Weigh job skills by their importance for the title, from stored postings
+        weights = await run_blocking('database', skill_importance, db, job_title)
         
         # Compare skills
-        comparison = skill_processor.compare_skills(profile_skills, list(set(job_skills)))
+        comparison = skill_processor.compare_skills(profile_skills, list(set(job_skills)), weights or None)
         
         return {
             "status": "success",
@@ -307,6 +579,8 @@ async def compare_skills(
             "comparison": comparison
         }
         
+    except (HTTPException, ExecutorBusyError):
+        raise
     except Exception as e:
         logger.error(f"Error comparing skills: {str(e)}")
         raise HTTPException(
@@ -314,5 +588,98 @@ async def compare_skills(
             detail=f"Error comparing skills: {str(e)}"
         )
 
+@app.get("/search/{kind}")
+async def search_by_skills(
+    kind: str,
+    all_of: List[str] = Query([], alias="all"),
+    any_of: List[str] = Query([], alias="any"),
+    none_of: List[str] = Query([], alias="none"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Find stored profiles or job postings by skills
+
+    Matches have every 'all' skill, at least one 'any' skill and no 'none' skill, and
+    are ranked by how many of the requested skills they have.
+    """
+    if kind not in INDEXED_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown search kind: {kind}")
+    if not all_of and not any_of:
+        raise HTTPException(status_code=400, detail="At least one 'all' or 'any' skill is required")
+    
+    try:
+        found = await run_blocking('database', search_skill_index, db, kind, all_of, any_of, none_of, limit)
+        return {"status": "success", "kind": kind, **found}
+    except ExecutorBusyError:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching {kind}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error searching {kind}: {str(e)}"
+        )
+
+@app.post("/analyses/trends", status_code=202)
+async def submit_trends_analysis(job_title: str, location: Optional[str] = None):
+    """
+    Queue a skill trends analysis and return its id right away
+    """
+    job_id = await run_blocking('database', get_analysis_queue().submit, 'trends',
+                                {"job_title": job_title, "location": location})
+    return {"status": "queued", "job_id": job_id}
+
+@app.post("/analyses/compare", status_code=202)
+async def submit_compare_analysis(profile_url: str, job_title: str, location: Optional[str] = None):
+    """
+    Queue a comparison of a LinkedIn profile against job requirements and return its id right away
+    """
+    job_id = await run_blocking('database', get_analysis_queue().submit, 'compare',
+                                {"profile_url": profile_url, "job_title": job_title, "location": location})
+    return {"status": "queued", "job_id": job_id}
+
+@app.get("/analyses/{job_id}")
+async def get_analysis(job_id: str):
+    """
+    Get the status, partial result and final result of a queued analysis
+    """
+    analysis = await run_blocking('database', get_analysis_queue().get, job_id)
+    if analysis is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return analysis
+
+@app.get("/analyses/{job_id}/events")
+async def stream_analysis(job_id: str):
+    """
+    Stream a queued analysis as server-sent events until it finishes
+    """
+    analysis = await run_blocking('database', get_analysis_queue().get, job_id)
+    if analysis is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    async def events():
+        current, last_sent = analysis, None
+        while True:
+            payload = json.dumps(current, default=str)
+            if payload != last_sent:
+                yield f"data: {payload}\n\n"
+                last_sent = payload
+            if current['status'] in FINISHED_STATUSES:
+                return
+            await asyncio.sleep(ANALYSIS_STREAM_INTERVAL)
+            current = await run_blocking('database', get_analysis_queue().get, job_id)
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.post("/analyses/{job_id}/cancel")
+async def cancel_analysis(job_id: str):
+    """
+    Cancel a queued analysis; a running one stops after its current page
+    """
+    status = await run_blocking('database', get_analysis_queue().cancel, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return {"job_id": job_id, "status": status}
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+Schema migrations for databases created by earlier versions.
+
+create_all only creates missing tables, so columns, keys and indexes added to existing
+tables are applied here. Applied migrations are recorded in the schema_migrations table
+and every migration checks the live schema before changing it, so a migration that was
+interrupted, or that create_all already covered on a new database, is safe to run again.
+The statements are portable between SQLite and PostgreSQL.
+
+Usage:
+
+    python -m src.database.migrations           # apply pending migrations
+    python -m src.database.migrations --status  # list applied and pending migrations
+"""
+import argparse
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy import Index, Table, inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateIndex
+
+from .database import Base, engine
+from .models import AnalysisJob, JobPosting, JobRequirement, Profile, ScrapeCacheEntry, SchemaMigration, SkillTrend, profile_skills
+
+logger = logging.getLogger(__name__)
+
+def _add_columns(conn: Connection, table: Table, names: Sequence[str]):
+    """Add the model columns a table is missing"""
+    existing = {column['name'] for column in inspect(conn).get_columns(table.name)}
+    for name in names:
+        if name not in existing:
+            column_type = table.c[name].type.compile(dialect=conn.dialect)
+            conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {name} {column_type}'))
+
+def _model_index(table: Table, name: str) -> Index:
+    """Find an index declared on a model"""
+    for index in table.indexes:
+        if index.name == name:
+            return index
+    raise KeyError(f"No index {name} on {table.name}")
+
+def _create_indexes(conn: Connection, table: Table, names: Sequence[str]):
+    """Create the model indexes a table is missing"""
+    # IF NOT EXISTS rather than reflection, which skips expression indexes on SQLite
+    for name in names:
+        conn.execute(CreateIndex(_model_index(table, name), if_not_exists=True))
+
+def _has_unique(conn: Connection, table: Table, columns: Sequence[str]) -> bool:
+    """Whether a unique constraint or unique index covers exactly these columns"""
+    inspector = inspect(conn)
+    keys = [constraint['column_names'] for constraint in inspector.get_unique_constraints(table.name)]
+    keys += [index['column_names'] for index in inspector.get_indexes(table.name) if index['unique']]
+    return any(set(key) == set(columns) for key in keys)
+
+def _add_unique(conn: Connection, table: Table, name: str, columns: Sequence[str]):
+    """Drop duplicate rows, keeping the oldest, and add a unique index over the columns"""
+    if _has_unique(conn, table, columns):
+        return
+    column_list = ', '.join(columns)
+    removed = conn.execute(text(
+        f'DELETE FROM {table.name} WHERE id NOT IN '
+        f'(SELECT MIN(id) FROM {table.name} GROUP BY {column_list})'
+    )).rowcount
+    if removed:
+        logger.info(f"Removed {removed} duplicate {table.name} rows")
+    conn.execute(text(f'CREATE UNIQUE INDEX {name} ON {table.name} ({column_list})'))
+
+def create_new_tables(conn: Connection):
+    """Scrape cache and analysis queue tables"""
+    Base.metadata.create_all(conn, tables=[ScrapeCacheEntry.__table__, AnalysisJob.__table__])
+
+def add_job_posting_tracking(conn: Connection):
+    """Content hash and last-seen time used by incremental ingestion"""
+    _add_columns(conn, JobPosting.__table__, ['content_hash', 'last_seen_at'])
+
+def add_skill_trend_rollup_columns(conn: Connection):
+    """Rollup totals and the one-row-per-bucket key"""
+    table = SkillTrend.__table__
+    _add_columns(conn, table, ['total_postings', 'importance_total'])
+    _add_unique(conn, table, 'uq_skill_trends_title_skill_date', ['job_title', 'skill_id', 'date'])
+
+def key_profile_skills(conn: Connection):
+    """Composite primary key on profile_skills, plus the reverse lookup index"""
+    primary_key = inspect(conn).get_pk_constraint(profile_skills.name)['constrained_columns']
+    if set(primary_key) != {'profile_id', 'skill_id'}:
+        # Neither SQLite nor a table with duplicate links accepts an added primary key,
+        # so the table is rebuilt with its distinct links
+        conn.execute(text('ALTER TABLE profile_skills RENAME TO profile_skills_unkeyed'))
+        profile_skills.create(conn)
+        conn.execute(text(
+            'INSERT INTO profile_skills (profile_id, skill_id) '
+            'SELECT DISTINCT profile_id, skill_id FROM profile_skills_unkeyed '
+            'WHERE profile_id IS NOT NULL AND skill_id IS NOT NULL'
+        ))
+        conn.execute(text('DROP TABLE profile_skills_unkeyed'))
+    _create_indexes(conn, profile_skills, ['ix_profile_skills_skill_profile'])
+
+def key_job_requirements(conn: Connection):
+    """One requirement per (posting, skill), plus the reverse lookup index"""
+    table = JobRequirement.__table__
+    _add_unique(conn, table, 'uq_job_requirements_posting_skill', ['job_posting_id', 'skill_id'])
+    _create_indexes(conn, table, ['ix_job_requirements_skill_posting'])
+
+def index_hot_paths(conn: Connection):
+    """Indexes behind title searches, rollup refreshes and the analysis queue"""
+    _create_indexes(conn, JobPosting.__table__,
+                    ['ix_job_postings_title', 'ix_job_postings_posted_date', 'ix_job_postings_title_day'])
+    _create_indexes(conn, SkillTrend.__table__, ['ix_skill_trends_skill_title_date', 'ix_skill_trends_date'])
+    _create_indexes(conn, AnalysisJob.__table__, ['ix_analysis_jobs_status_run_after'])
+    _create_indexes(conn, ScrapeCacheEntry.__table__, ['ix_scrape_cache_scraped_at'])
+
+def add_profile_source_hash(conn: Connection):
+    """Source document hash that keeps replayed bulk ingestion batches from duplicating profiles"""
+    table = Profile.__table__
+    _add_columns(conn, table, ['source_hash'])
+    # Existing profiles have no hash, so unlike _add_unique there are no duplicates to drop
+    if not _has_unique(conn, table, ['source_hash']):
+        conn.execute(text('CREATE UNIQUE INDEX uq_profiles_source_hash ON profiles (source_hash)'))
+
+# Applied in order; versions are never reused or renumbered
+MIGRATIONS: List[Tuple[int, Callable[[Connection], None]]] = [
+    (1, create_new_tables),
+    (2, add_job_posting_tracking),
+    (3, add_skill_trend_rollup_columns),
+    (4, key_profile_skills),
+    (5, key_job_requirements),
+    (6, index_hot_paths),
+    (7, add_profile_source_hash),
+]
+
+def applied_migrations(bind: Engine = engine) -> Dict[int, datetime]:
+    """
+    Get the migrations applied to a database
+
+    Args:
+        bind (Engine): Database engine
+
+    Returns:
+        Dict[int, datetime]: When each applied migration version was applied
+    """
+    SchemaMigration.__table__.create(bind, checkfirst=True)
+    with bind.connect() as conn:
+        return dict(conn.execute(select(SchemaMigration.version, SchemaMigration.applied_at)).all())
+
+def migrate(bind: Engine = engine) -> List[int]:
+    """
+    Apply pending migrations in order, each in its own transaction
+
+    Args:
+        bind (Engine): Database engine
+
+    Returns:
+        List[int]: Versions applied by this call
+    """
+    applied = applied_migrations(bind)
+    migrated = []
+    for version, upgrade in MIGRATIONS:
+        if version in applied:
+            continue
+        logger.info(f"Applying schema migration {version}: {upgrade.__name__}")
+        try:
+            with bind.begin() as conn:
+                upgrade(conn)
+                conn.execute(insert(SchemaMigration).values(
+                    version=version, name=upgrade.__name__, applied_at=datetime.utcnow()
+                ))
+        except Exception as e:
+            logger.error(f"Error applying schema migration {version}: {str(e)}")
+            raise
+        migrated.append(version)
+    return migrated
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply database schema migrations')
+    parser.add_argument('--status', action='store_true', help='List migrations without applying them')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.status:
+        applied = applied_migrations()
+        for version, upgrade in MIGRATIONS:
+            state = f"applied {applied[version]}" if version in applied else 'pending'
+            print(f"{version:>4}  {upgrade.__name__:<32} {state}")
+        return
+    migrated = migrate()
+    print(f"Applied migrations: {migrated}" if migrated else "Database schema is up to date")
+
+if __name__ == '__main__':
+    main()
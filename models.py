@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Table
+from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey, Index, Table, Text, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -7,13 +7,16 @@ from .database import Base
 profile_skills = Table(
     'profile_skills',
     Base.metadata,
-    Column('profile_id', Integer, ForeignKey('profiles.id')),
-    Column('skill_id', Integer, ForeignKey('skills.id'))
+    Column('profile_id', Integer, ForeignKey('profiles.id'), primary_key=True),
+    Column('skill_id', Integer, ForeignKey('skills.id'), primary_key=True),
+    # The primary key serves lookups by profile; this one serves lookups by skill
+    Index('ix_profile_skills_skill_profile', 'skill_id', 'profile_id')
 )
 
 class Profile(Base):
     """Model for storing LinkedIn profile information"""
     __tablename__ = 'profiles'
+    __table_args__ = (UniqueConstraint('source_hash', name='uq_profiles_source_hash'),)
 
     id = Column(Integer, primary_key=True)
     linkedin_id = Column(String, unique=True)
@@ -21,6 +24,7 @@ class Profile(Base):
     headline = Column(String)
     location = Column(String)
     about = Column(String)
+    source_hash = Column(String)  # SHA-256 of the ingested PDF, when known
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -60,6 +64,10 @@ class Experience(Base):
 class JobPosting(Base):
     """Model for storing job posting information"""
     __tablename__ = 'job_postings'
+    __table_args__ = (
+        Index('ix_job_postings_title', 'title'),
+        Index('ix_job_postings_posted_date', 'posted_date'),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String)
@@ -68,14 +76,23 @@ class JobPosting(Base):
     description = Column(String)
     url = Column(String, unique=True)
     posted_date = Column(DateTime)
+    content_hash = Column(String)  # SHA-256 of the scraped content, for change detection
+    last_seen_at = Column(DateTime)  # Last time a scrape returned this posting
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     requirements = relationship('JobRequirement', back_populates='job_posting')
 
+# Matches the (normalized title, day) buckets skill trend rollups are grouped by
+Index('ix_job_postings_title_day', func.lower(func.trim(JobPosting.title)), func.date(JobPosting.posted_date))
+
 class JobRequirement(Base):
     """Model for storing job requirements"""
     __tablename__ = 'job_requirements'
+    __table_args__ = (
+        UniqueConstraint('job_posting_id', 'skill_id', name='uq_job_requirements_posting_skill'),
+        Index('ix_job_requirements_skill_posting', 'skill_id', 'job_posting_id'),
+    )
 
     id = Column(Integer, primary_key=True)
     job_posting_id = Column(Integer, ForeignKey('job_postings.id'))
@@ -90,13 +107,61 @@ class JobRequirement(Base):
 class SkillTrend(Base):
     """Model for storing skill trends over time"""
     __tablename__ = 'skill_trends'
+    __table_args__ = (
+        UniqueConstraint('job_title', 'skill_id', 'date', name='uq_skill_trends_title_skill_date'),
+        Index('ix_skill_trends_skill_title_date', 'skill_id', 'job_title', 'date'),
+        Index('ix_skill_trends_date', 'date'),
+    )
 
     id = Column(Integer, primary_key=True)
     skill_id = Column(Integer, ForeignKey('skills.id'))
-    job_title = Column(String)
+    job_title = Column(String)  # Normalized job posting title
     frequency = Column(Integer)  # Number of job postings requiring this skill
-    date = Column(DateTime)
+    total_postings = Column(Integer)  # Number of job postings with this title that day
+    importance_total = Column(Float)  # Sum of the requirements' importance scores
+    date = Column(DateTime)  # Day the postings were first seen
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
-    skill = relationship('Skill') 
\ No newline at end of file
+    skill = relationship('Skill')
+
+class ScrapeCacheEntry(Base):
+    """Model for caching scraped job search result pages"""
+    __tablename__ = 'scrape_cache'
+    __table_args__ = (UniqueConstraint('source', 'query', 'location', 'page'),)
+
+    id = Column(Integer, primary_key=True)
+    source = Column(String, nullable=False)
+    query = Column(String, nullable=False)  # Normalized job title
+    location = Column(String, nullable=False, default='')  # Normalized location
+    page = Column(Integer, nullable=False)
+    jobs = Column(Text)  # JSON list of the page's job postings
+    scraped_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class AnalysisJob(Base):
+    """Model for queued long-running analyses and their results"""
+    __tablename__ = 'analysis_jobs'
+    __table_args__ = (Index('ix_analysis_jobs_status_run_after', 'status', 'run_after'),)
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String, nullable=False)  # Registered analysis, e.g. 'trends'
+    params = Column(Text)  # JSON request parameters
+    status = Column(String, nullable=False, default='queued')  # queued, running, succeeded, failed, cancelled
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=1)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    partial_result = Column(Text)  # JSON progress reported while running
+    result = Column(Text)  # JSON final result
+    error = Column(Text)
+    run_after = Column(DateTime, default=datetime.utcnow)  # Earliest start, pushed back on retries
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+class SchemaMigration(Base):
+    """Model recording the schema migrations applied to the database"""
+    __tablename__ = 'schema_migrations'
+
+    version = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
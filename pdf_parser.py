@@ -1,156 +1,331 @@
 import PyPDF2
+import io
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union, BinaryIO, Tuple, Iterable, Iterator, Set
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from ..utils.helpers import clean_text, parse_date
-from .skill_processor import SkillProcessor
+from .skill_processor import SkillProcessor, get_skill_processor
+from .profile_cache import ProfileCache, get_profile_cache
 
 logger = logging.getLogger(__name__)
 
+# Accepted PDF sources: a path, raw bytes or a binary file-like object
+PDFSource = Union[str, Path, bytes, bytearray, memoryview, BinaryIO]
+
+# Section headers of a LinkedIn profile export, matched anywhere in the text
+SECTION_HEADER_PATTERN = re.compile(r'about|experience|education|skills', re.IGNORECASE)
+
+# Headers that end each section
+SECTION_TERMINATORS = {
+    'about': {'experience', 'education', 'skills'},
+    'skills': {'experience', 'education'},
+    'experience': {'education', 'skills'},
+    'education': {'experience', 'skills'},
+}
+
+# (start, end) offsets of a section's content within the document text
+Span = Tuple[int, int]
+
+WHITESPACE_PATTERN = re.compile(r'\s*')
+LOCATION_RUN_PATTERN = re.compile(r'[A-Za-z\s]+')
+ENTRY_SPLIT_PATTERN = re.compile(r'\n(?=[A-Z][a-z]+\s+\d{4}\s*[-–]\s*(?:Present|\d{4}))')
+DURATION_PATTERN = re.compile(r'(\d{4}\s*[-–]\s*(?:Present|\d{4}))')
+
+# Fields that are available once the first page has been read
+HEADER_FIELDS = {'name', 'headline', 'location'}
+
+# Longest section header, used to catch headers split across a page boundary
+MAX_HEADER_LENGTH = len('experience')
+
+# Documents with fewer pages are always extracted in-process
+PARALLEL_PAGE_THRESHOLD = 16
+
+def _extract_page_range(data: bytes, start: int, stop: int) -> List[str]:
+    """Extract the text of a range of pages inside a worker process"""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[index].extract_text() or '' for index in range(start, stop)]
+
 class PDFParser:
-    def __init__(self):
-        """Initialize the PDF parser with skill processor"""
-        self.skill_processor = SkillProcessor()
+    def __init__(self, skill_processor: Optional[SkillProcessor] = None,
+                 cache: Optional[ProfileCache] = None, page_workers: int = 0):
+        """
+        Initialize the PDF parser with the shared skill processor and profile cache
+        
+        Args:
+            skill_processor (Optional[SkillProcessor]): Processor used for skill extraction
+            cache (Optional[ProfileCache]): Cache of parsed profiles
+            page_workers (int): Size of the process pool used to extract pages of large
+                documents; 0 or 1 extracts in-process
+        """
+        self.skill_processor = skill_processor or get_skill_processor()
+        self.cache = cache or get_profile_cache()
+        self.page_workers = page_workers
 
-    def parse_profile_pdf(self, pdf_path: str) -> Dict:
+    def parse_profile_pdf(self, source: PDFSource, sections: Optional[Iterable[str]] = None) -> Dict:
         """
         Parse LinkedIn profile PDF and extract information
         
+        Repeat uploads of the same file are answered from the profile cache.
+        
         Args:
-            pdf_path (str): Path to the PDF file
+            source (PDFSource): Path to the PDF file, its bytes (bytes, bytearray or
+                memoryview) or a binary file-like object
+            sections (Optional[Iterable[str]]): Fields the caller needs. When given, pages
+                stop being read once all of them are complete, and other fields may be
+                missing or truncated.
             
         Returns:
             Dict containing profile information
         """
         try:
-            # Read PDF file
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text()
-            
-            # Extract profile information
-            profile_data = {
-                'name': self._extract_name(text),
-                'headline': self._extract_headline(text),
-                'location': self._extract_location(text),
-                'about': self._extract_about(text),
-                'skills': self._extract_skills(text),
-                'experience': self._extract_experience(text),
-                'education': self._extract_education(text)
-            }
+            data = self._read_source(source)
+            
+            cache_key = ProfileCache.key_for(data)
+            # A partial parse looks up its own key next, so only that lookup counts a miss
+            profile_data = self.cache.get(cache_key, record_miss=sections is None)
+            if profile_data is not None:
+                return profile_data
             
+            reader = PyPDF2.PdfReader(io.BytesIO(data))
+            if sections is not None:
+                sections = set(sections)
+                cache_key = f"{cache_key}:{','.join(sorted(sections))}"
+                profile_data = self.cache.get(cache_key)
+                if profile_data is not None:
+                    return profile_data
+                text = ''.join(self._iter_pages_until(reader, sections))
+            elif self.page_workers > 1 and len(reader.pages) >= PARALLEL_PAGE_THRESHOLD:
+                text = ''.join(self._extract_pages_parallel(data, len(reader.pages)))
+            else:
+                text = ''.join(self._iter_page_text(reader))
+            
+            profile_data = self.parse_profile_text(text)
+            
+            self.cache.put(cache_key, profile_data)
             return profile_data
             
         except Exception as e:
             logger.error(f"Error parsing PDF: {str(e)}")
             raise
 
+    def _iter_page_text(self, reader: PyPDF2.PdfReader) -> Iterator[str]:
+        """Stream the text of each page"""
+        for page in reader.pages:
+            yield page.extract_text() or ''
+
+    def _iter_pages_until(self, reader: PyPDF2.PdfReader, sections: Set[str]) -> Iterator[str]:
+        """
+        Stream page text, stopping once every requested section is complete
+        
+        A section is complete once its header and a header that terminates it have been
+        read; the name, headline and location are complete after the first page.
+        """
+        headers: List[Tuple[str, int]] = []
+        consumed = 0
+        tail = ''
+        
+        for page_text in self._iter_page_text(reader):
+            yield page_text
+            
+            # Scan only the new text, plus enough of the previous page to catch split headers
+            window = tail + page_text
+            offset = consumed - len(tail)
+            for match in SECTION_HEADER_PATTERN.finditer(window):
+                if match.end() > len(tail):
+                    headers.append((match.group(0).lower(), offset + match.start()))
+            consumed += len(page_text)
+            tail = window[-(MAX_HEADER_LENGTH - 1):]
+            
+            if self._sections_complete(headers, sections):
+                return
+
+    @staticmethod
+    def _sections_complete(headers: List[Tuple[str, int]], sections: Set[str]) -> bool:
+        """Check whether the headers seen so far close every requested section"""
+        for name in sections - HEADER_FIELDS:
+            terminators = SECTION_TERMINATORS.get(name)
+            if terminators is None:
+                return False
+            start = next((position for header, position in headers if header == name), None)
+            if start is None:
+                return False
+            if not any(header in terminators and position > start for header, position in headers):
+                return False
+        return True
+
+    def _extract_pages_parallel(self, data: Union[bytes, memoryview], page_count: int) -> List[str]:
+        """Extract page text across a process pool, preserving page order"""
+        data = bytes(data)
+        chunk = -(-page_count // self.page_workers)
+        ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+        
+        with ProcessPoolExecutor(max_workers=self.page_workers) as executor:
+            futures = [executor.submit(_extract_page_range, data, start, stop) for start, stop in ranges]
+            return [text for future in futures for text in future.result()]
+
+    @staticmethod
+    def _read_source(source: PDFSource) -> Union[bytes, memoryview]:
+        """Get the PDF content from any supported source without writing it to disk"""
+        if isinstance(source, (bytes, memoryview)):
+            return source
+        if isinstance(source, bytearray):
+            return memoryview(source)
+        if isinstance(source, (str, Path)):
+            with open(source, 'rb') as file:
+                return file.read()
+        if hasattr(source, 'read'):
+            return source.read()
+        raise TypeError(f"Unsupported PDF source type: {type(source).__name__}")
+
+    def parse_profile_text(self, text: str) -> Dict:
+        """
+        Extract profile information from the text of a profile export
+        
+        Args:
+            text (str): Full document text
+            
+        Returns:
+            Dict containing profile information
+        """
+        sections = self._segment_sections(text)
+        return {
+            'name': self._extract_name(text),
+            'headline': self._extract_headline(text),
+            'location': self._extract_location(text),
+            'about': self._extract_about(text, sections.get('about')),
+            'skills': self._extract_skills(text, sections.get('skills')),
+            'experience': self._extract_experience(text, sections.get('experience')),
+            'education': self._extract_education(text, sections.get('education'))
+        }
+
+    def _segment_sections(self, text: str) -> Dict[str, Span]:
+        """
+        Find every section header in one pass and index the content span of each section
+        
+        A section starts after the first occurrence of its header and runs until the next
+        header that terminates it, or the end of the document.
+        
+        Args:
+            text (str): Full document text
+            
+        Returns:
+            Dict mapping section names to the (start, end) offsets of their content
+        """
+        headers = [(match.group(0).lower(), match.start(), match.end())
+                   for match in SECTION_HEADER_PATTERN.finditer(text)]
+        
+        sections = {}
+        for index, (name, _, header_end) in enumerate(headers):
+            if name in sections:
+                continue
+            
+            start = WHITESPACE_PATTERN.match(text, header_end).end()
+            end = len(text)
+            for next_name, next_start, _ in headers[index + 1:]:
+                if next_start >= start and next_name in SECTION_TERMINATORS[name]:
+                    end = next_start
+                    break
+            
+            sections[name] = (start, end)
+            if len(sections) == len(SECTION_TERMINATORS):
+                break
+        
+        return sections
+
     def _extract_name(self, text: str) -> str:
         """Extract name from profile text"""
         # Usually the first line of the PDF
-        lines = text.split('\n')
-        if lines:
-            return clean_text(lines[0])
-        return ""
+        end = text.find('\n')
+        return clean_text(text if end == -1 else text[:end])
 
     def _extract_headline(self, text: str) -> str:
         """Extract headline from profile text"""
         # Usually follows the name
-        lines = text.split('\n')
-        if len(lines) > 1:
-            return clean_text(lines[1])
-        return ""
+        start = text.find('\n')
+        if start == -1:
+            return ""
+        end = text.find('\n', start + 1)
+        return clean_text(text[start + 1:] if end == -1 else text[start + 1:end])
 
     def _extract_location(self, text: str) -> str:
         """Extract location from profile text"""
-        # Look for location pattern
-        location_pattern = r"([A-Za-z\s]+,\s*[A-Za-z\s]+)"
-        match = re.search(location_pattern, text)
-        if match:
-            return clean_text(match.group(1))
+        # First "Place, Region" pattern: a run of letters and spaces, a comma, then another run.
+        # Scanning maximal runs avoids the quadratic backtracking of a single regex.
+        for run in LOCATION_RUN_PATTERN.finditer(text):
+            comma = run.end()
+            if text.startswith(',', comma):
+                region = LOCATION_RUN_PATTERN.match(text, comma + 1)
+                if region:
+                    return clean_text(text[run.start():region.end()])
         return ""
 
-    def _extract_about(self, text: str) -> str:
+    def _extract_about(self, text: str, span: Optional[Span]) -> str:
         """Extract about section from profile text"""
-        # Look for "About" section
-        about_pattern = r"About\s*(.*?)(?=Experience|Education|Skills|$)"
-        match = re.search(about_pattern, text, re.DOTALL | re.IGNORECASE)
-        if match:
-            return clean_text(match.group(1))
-        return ""
+        if span is None:
+            return ""
+        return clean_text(text[span[0]:span[1]])
 
-    def _extract_skills(self, text: str) -> List[str]:
+    def _extract_skills(self, text: str, span: Optional[Span]) -> List[str]:
         """Extract skills from profile text"""
-        # Look for "Skills" section
-        skills_pattern = r"Skills\s*(.*?)(?=Experience|Education|$)"
-        match = re.search(skills_pattern, text, re.DOTALL | re.IGNORECASE)
-        if match:
-            skills_text = match.group(1)
-            # Extract skills using skill processor
-            return self.skill_processor.extract_skills_from_text(skills_text)
-        return []
+        if span is None:
+            return []
+        # Extract skills using skill processor
+        return self.skill_processor.extract_skills_from_text(text[span[0]:span[1]])
 
-    def _extract_experience(self, text: str) -> List[Dict]:
+    def _extract_experience(self, text: str, span: Optional[Span]) -> List[Dict]:
         """Extract work experience from profile text"""
         experience = []
+        if span is None:
+            return experience
+        
         try:
-            # Look for "Experience" section
-            exp_pattern = r"Experience\s*(.*?)(?=Education|Skills|$)"
-            match = re.search(exp_pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                exp_text = match.group(1)
-                
-                # Split into individual experiences
-                exp_blocks = re.split(r'\n(?=[A-Z][a-z]+\s+\d{4}\s*[-–]\s*(?:Present|\d{4}))', exp_text)
-                
-                for block in exp_blocks:
-                    if not block.strip():
-                        continue
-                        
-                    # Extract experience details
-                    exp_data = {
-                        'title': self._extract_job_title(block),
-                        'company': self._extract_company(block),
-                        'duration': self._extract_duration(block),
-                        'description': self._extract_job_description(block)
-                    }
+            # Split into individual experiences
+            exp_blocks = ENTRY_SPLIT_PATTERN.split(text[span[0]:span[1]])
+            
+            for block in exp_blocks:
+                if not block.strip():
+                    continue
                     
-                    experience.append(exp_data)
+                # Extract experience details
+                exp_data = {
+                    'title': self._extract_job_title(block),
+                    'company': self._extract_company(block),
+                    'duration': self._extract_duration(block),
+                    'description': self._extract_job_description(block)
+                }
+                
+                experience.append(exp_data)
                     
         except Exception as e:
             logger.error(f"Error extracting experience: {str(e)}")
             
         return experience
 
-    def _extract_education(self, text: str) -> List[Dict]:
+    def _extract_education(self, text: str, span: Optional[Span]) -> List[Dict]:
         """Extract education from profile text"""
         education = []
+        if span is None:
+            return education
+        
         try:
-            # Look for "Education" section
-            edu_pattern = r"Education\s*(.*?)(?=Experience|Skills|$)"
-            match = re.search(edu_pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                edu_text = match.group(1)
-                
-                # Split into individual education entries
-                edu_blocks = re.split(r'\n(?=[A-Z][a-z]+\s+\d{4}\s*[-–]\s*(?:Present|\d{4}))', edu_text)
-                
-                for block in edu_blocks:
-                    if not block.strip():
-                        continue
-                        
-                    # Extract education details
-                    edu_data = {
-                        'school': self._extract_school(block),
-                        'degree': self._extract_degree(block),
-                        'duration': self._extract_duration(block),
-                        'description': self._extract_education_description(block)
-                    }
+            # Split into individual education entries
+            edu_blocks = ENTRY_SPLIT_PATTERN.split(text[span[0]:span[1]])
+            
+            for block in edu_blocks:
+                if not block.strip():
+                    continue
                     
-                    education.append(edu_data)
+                # Extract education details
+                edu_data = {
+                    'school': self._extract_school(block),
+                    'degree': self._extract_degree(block),
+                    'duration': self._extract_duration(block),
+                    'description': self._extract_education_description(block)
+                }
+                
+                education.append(edu_data)
                     
         except Exception as e:
             logger.error(f"Error extracting education: {str(e)}")
@@ -176,8 +351,7 @@ class PDFParser:
     def _extract_duration(self, text: str) -> str:
         """Extract duration from text block"""
         # Look for date pattern
-        duration_pattern = r'(\d{4}\s*[-–]\s*(?:Present|\d{4}))'
-        match = re.search(duration_pattern, text)
+        match = DURATION_PATTERN.search(text)
         if match:
             return clean_text(match.group(1))
         return ""
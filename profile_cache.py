@@ -0,0 +1,242 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class ProfileCache:
+    """
+    Two-tier cache of parsed profiles keyed by the SHA-256 of the uploaded PDF bytes.
+
+    The first tier is a bounded in-memory LRU. The optional second tier stores one JSON
+    file per entry on disk, evicting expired entries and the oldest entries once the
+    directory grows past its size budget.
+    """
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Maximum number of profiles kept in memory
+            cache_dir (Optional[str]): Directory for the on-disk tier; disabled if None
+            max_disk_bytes (int): Size budget of the on-disk tier
+            ttl_seconds (Optional[float]): Lifetime of on-disk entries; unlimited if None
+        """
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._memory: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        self._disk_bytes = 0
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._evict_disk()
+
+    @staticmethod
+    def key_for(data: bytes) -> str:
+        """
+        Compute the cache key for uploaded PDF bytes
+
+        Args:
+            data (bytes): Raw PDF content
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, key: str, record_miss: bool = True) -> Optional[Dict]:
+        """
+        Look up a parsed profile
+
+        Args:
+            key (str): Cache key
+            record_miss (bool): Count a miss; False for probes followed by another lookup
+
+        Returns:
+            Optional[Dict]: Copy of the cached profile, or None on a miss
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._counters['memory_hits'] += 1
+                return copy.deepcopy(self._memory[key])
+
+        value = self._read_disk(key)
+
+        with self._lock:
+            if value is None:
+                if record_miss:
+                    self._counters['misses'] += 1
+                return None
+            self._counters['disk_hits'] += 1
+            self._store_memory(key, value)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict):
+        """
+        Store a parsed profile in both tiers
+
+        Args:
+            key (str): Cache key
+            value (Dict): Parsed profile data
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._store_memory(key, value)
+        self._write_disk(key, value)
+
+    def clear(self):
+        """Remove every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir:
+            for path in self.cache_dir.glob('*.json'):
+                path.unlink(missing_ok=True)
+            with self._lock:
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters for monitoring
+
+        Returns:
+            Dict with hit/miss counters and the current number of in-memory entries
+        """
+        with self._lock:
+            hits = self._counters['memory_hits'] + self._counters['disk_hits']
+            lookups = hits + self._counters['misses']
+            return {
+                **self._counters,
+                'hits': hits,
+                'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'disk_bytes': self._disk_bytes,
+            }
+
+    def _store_memory(self, key: str, value: Dict):
+        """Insert into the LRU tier; caller must hold the lock"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        """Read an entry from the disk tier, dropping it if it has expired"""
+        if not self.cache_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            stat = path.stat()
+            if self.ttl_seconds is not None and time.time() - stat.st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                with self._lock:
+                    self._disk_bytes = max(self._disk_bytes - stat.st_size, 0)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading profile cache entry {key}: {str(e)}")
+            return None
+
+    def _write_disk(self, key: str, value: Dict):
+        """Write an entry to the disk tier and enforce the TTL and size budget"""
+        if not self.cache_dir:
+            return
+
+        try:
+            # Write to a temporary file first so readers never see a partial entry
+            tmp_path = self.cache_dir / f".{key}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            size = tmp_path.stat().st_size
+            path = self._disk_path(key)
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+
+            with self._lock:
+                self._disk_bytes = max(self._disk_bytes + size - replaced, 0)
+                over_budget = self._disk_bytes > self.max_disk_bytes
+            if over_budget:
+                self._evict_disk()
+        except Exception as e:
+            logger.error(f"Error writing profile cache entry {key}: {str(e)}")
+
+    def _evict_disk(self):
+        """
+        Remove expired entries, then the oldest entries until under the size budget.
+
+        Runs at startup and whenever the tracked size exceeds the budget; expired entries
+        are otherwise dropped lazily on read.
+        """
+        now = time.time()
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if self.ttl_seconds is not None and now - stat.st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._disk_bytes = total
+            self._counters['evictions'] += evicted
+
+_shared_cache: Optional[ProfileCache] = None
+_shared_lock = threading.Lock()
+
+def get_profile_cache() -> ProfileCache:
+    """
+    Get the process-wide profile cache, configured from environment variables
+
+    Returns:
+        ProfileCache: Shared cache instance
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                ttl = os.getenv('PROFILE_CACHE_TTL_SECONDS')
+                _shared_cache = ProfileCache(
+                    max_entries=int(os.getenv('PROFILE_CACHE_MAX_ENTRIES', '256')),
+                    cache_dir=os.getenv('PROFILE_CACHE_DIR') or None,
+                    max_disk_bytes=int(os.getenv('PROFILE_CACHE_MAX_DISK_BYTES', str(256 * 1024 * 1024))),
+                    ttl_seconds=float(ttl) if ttl else None
+                )
+    return _shared_cache
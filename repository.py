@@ -0,0 +1,442 @@
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Union
+import hashlib
+import logging
+
+from .models import Profile, Skill, JobPosting, JobRequirement, profile_skills
+from .skill_cache import SkillIdCache, get_skill_id_cache, normalize_skill_name
+from .skill_index import get_skill_index
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING
+UPSERT_DIALECTS = {'postgresql', 'sqlite'}
+
+# Attempts at inserting skills before giving up on a conflicting concurrent writer
+SKILL_INSERT_ATTEMPTS = 3
+
+# Scraped fields whose change means a posting must be re-processed
+JOB_CONTENT_FIELDS = ('title', 'company', 'location', 'description')
+
+# Maximum number of values bound into one IN clause
+IN_CLAUSE_CHUNK = 500
+
+# Importance of a skill first mentioned at the very end of a description; one at the
+# start scores 1.0
+POSITION_IMPORTANCE_FLOOR = 0.5
+
+logger = logging.getLogger(__name__)
+
+def insert_ignoring_conflicts(db: Session, table, index_elements: Optional[List[str]] = None):
+    """
+    Build an INSERT that skips rows violating a unique constraint
+
+    Dialects without such an upsert get a plain INSERT.
+
+    Args:
+        db (Session): Database session, used to pick the dialect
+        table: Table or mapped class to insert into
+        index_elements (Optional[List[str]]): Columns of the unique constraint to skip
+            conflicts on; any constraint when omitted
+
+    Returns:
+        Insert statement
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    return insert(table)
+
+def resolve_skill_ids(db: Session, names: Iterable[str],
+                      cache: Optional[SkillIdCache] = None) -> Dict[str, int]:
+    """
+    Resolve skill names to ids, creating missing skills
+
+    Names are answered from the process-local skill id cache first, so the hot path runs
+    no queries once the cache is warm. Uncached names are found with one IN query and
+    missing ones are inserted with a single bulk upsert; their ids reach the cache when
+    the transaction commits.
+
+    Args:
+        db (Session): Database session
+        names (Iterable[str]): Skill names
+        cache (Optional[SkillIdCache]): Cache to use instead of the shared one
+
+    Returns:
+        Dict mapping each name to its skill id
+    """
+    normalized = {name: normalize_skill_name(name) for name in set(names) if name and name.strip()}
+    if not normalized:
+        return {}
+
+    cache = cache or get_skill_id_cache(db)
+    skill_ids, missing = cache.get_many(set(normalized.values()))
+    if missing:
+        resolved = _select_skill_ids(db, missing)
+        if len(resolved) < len(missing):
+            resolved.update(_insert_skills(db, missing - resolved.keys()))
+        cache.add_pending(db, resolved)
+        skill_ids.update(resolved)
+
+    return {name: skill_ids[key] for name, key in normalized.items()}
+
+def _select_skill_ids(db: Session, names: Set[str]) -> Dict[str, int]:
+    """Look up the ids of existing skills with one IN query"""
+    return dict(db.execute(select(Skill.name, Skill.id).where(Skill.name.in_(names))).all())
+
+def _insert_skills(db: Session, names: Set[str]) -> Dict[str, int]:
+    """
+    Insert missing skills and return their ids
+
+    Rows another worker inserted concurrently are skipped by the upsert (or, on dialects
+    without one, by retrying inside a savepoint) and picked up by re-reading the names.
+    """
+    skill_ids: Dict[str, int] = {}
+    remaining = set(names)
+    upsert = db.get_bind().dialect.name in UPSERT_DIALECTS
+    for _ in range(SKILL_INSERT_ATTEMPTS):
+        rows = [{'name': name} for name in sorted(remaining)]
+        if upsert:
+            db.execute(insert_ignoring_conflicts(db, Skill), rows)
+        else:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(Skill), rows)
+            except IntegrityError:
+                logger.info("Concurrent skill insert detected, re-reading skill ids")
+
+        skill_ids.update(_select_skill_ids(db, remaining))
+        remaining -= skill_ids.keys()
+        if not remaining:
+            return skill_ids
+
+    raise RuntimeError(f"Could not insert skills: {sorted(remaining)}")
+
+def save_profiles(db: Session, profiles: List[Dict]) -> List[int]:
+    """
+    Save profiles and their skills in one transaction
+
+    Profiles carrying a 'source_hash' (the SHA-256 of their source document) are stored
+    at most once: one whose document is already stored is skipped and gets the stored id,
+    so replaying a batch does not duplicate profiles or their skill links.
+
+    Args:
+        db (Session): Database session
+        profiles (List[Dict]): Profile data, each with a 'skills' list
+
+    Returns:
+        List of the profile ids, in input order
+    """
+    if not profiles:
+        return []
+
+    try:
+        skill_ids = resolve_skill_ids(db, (skill for profile in profiles for skill in profile['skills']))
+
+        rows = [{
+            'name': profile.get('name'),
+            'headline': profile.get('headline'),
+            'location': profile.get('location'),
+            'about': profile.get('about'),
+            'source_hash': profile.get('source_hash')
+        } for profile in profiles]
+        profile_ids: List[Optional[int]] = [None] * len(rows)
+        new: Dict[int, Dict] = {}
+
+        unhashed = [index for index, row in enumerate(rows) if not row['source_hash']]
+        if unhashed:
+            inserted_ids = db.scalars(
+                insert(Profile).returning(Profile.id, sort_by_parameter_order=True),
+                [rows[index] for index in unhashed]
+            )
+            for index, profile_id in zip(unhashed, inserted_ids):
+                profile_ids[index] = profile_id
+                new[profile_id] = profiles[index]
+
+        hashed = [index for index, row in enumerate(rows) if row['source_hash']]
+        if hashed:
+            inserted = _insert_unique(db, Profile, 'source_hash', [rows[index] for index in hashed])
+            stored = _known_profiles(db, sorted({rows[index]['source_hash'] for index in hashed} - inserted.keys()))
+            for index in hashed:
+                source_hash = rows[index]['source_hash']
+                if source_hash in inserted:
+                    profile_ids[index] = inserted[source_hash]
+                    new.setdefault(profile_ids[index], profiles[index])
+                else:
+                    profile_ids[index] = stored[source_hash]
+            if stored:
+                logger.info(f"Skipped {len(stored)} profiles whose source documents were already stored")
+
+        links = [{'profile_id': profile_id, 'skill_id': skill_ids[skill]}
+                 for profile_id, profile in new.items()
+                 for skill in set(profile['skills'])]
+        if links:
+            db.execute(insert(profile_skills), links)
+
+        db.commit()
+        get_skill_index(db, 'profiles').add(
+            {profile_id: profile['skills'] for profile_id, profile in new.items()}
+        )
+        return profile_ids
+    except Exception:
+        db.rollback()
+        raise
+
+def save_profile(db: Session, profile_data: Dict) -> int:
+    """
+    Save a single profile and its skills in one transaction
+
+    Args:
+        db (Session): Database session
+        profile_data (Dict): Profile data with a 'skills' list
+
+    Returns:
+        int: New profile id
+    """
+    return save_profiles(db, [profile_data])[0]
+
+def job_content_hash(job: Dict) -> str:
+    """
+    Hash the content of a scraped posting
+
+    Args:
+        job (Dict): Scraped job
+
+    Returns:
+        str: Hex SHA-256 of the content fields
+    """
+    content = '\x1f'.join(job.get(field) or '' for field in JOB_CONTENT_FIELDS)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def requirement_importance(position: Optional[float]) -> float:
+    """
+    Score a job requirement by where the skill is first mentioned
+
+    Skills named early in a description, typically in the title or the summary of
+    requirements, score higher than ones mentioned in passing further down.
+
+    Args:
+        position (Optional[float]): Relative offset of the first mention (0 = start,
+            1 = end); None when unknown
+
+    Returns:
+        float: Importance between POSITION_IMPORTANCE_FLOOR and 1.0
+    """
+    if position is None:
+        return 1.0
+    position = min(max(position, 0.0), 1.0)
+    return round(1.0 - (1.0 - POSITION_IMPORTANCE_FLOOR) * position, 4)
+
+def _chunks(values: Sequence, size: int = IN_CLAUSE_CHUNK) -> Iterable[Sequence]:
+    """Split values into chunks small enough for one IN clause"""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def _known_postings(db: Session, urls: List[str]) -> Dict[str, tuple]:
+    """Look up the id and content hash of already stored postings by URL"""
+    known = {}
+    for chunk in _chunks(urls):
+        rows = db.execute(
+            select(JobPosting.url, JobPosting.id, JobPosting.content_hash).where(JobPosting.url.in_(chunk))
+        ).all()
+        known.update({url: (posting_id, content_hash) for url, posting_id, content_hash in rows})
+    return known
+
+def _stored_skills(db: Session, posting_ids: List[int]) -> Dict[int, List[str]]:
+    """Load the skill names of stored postings"""
+    skills: Dict[int, List[str]] = {posting_id: [] for posting_id in posting_ids}
+    for chunk in _chunks(posting_ids):
+        rows = db.execute(
+            select(JobRequirement.job_posting_id, Skill.name)
+            .join(Skill, Skill.id == JobRequirement.skill_id)
+            .where(JobRequirement.job_posting_id.in_(chunk))
+        ).all()
+        for posting_id, name in rows:
+            skills[posting_id].append(name)
+    return skills
+
+def _known_profiles(db: Session, source_hashes: List[str]) -> Dict[str, int]:
+    """Look up the ids of already stored profiles by source document hash"""
+    known = {}
+    for chunk in _chunks(source_hashes):
+        known.update(db.execute(
+            select(Profile.source_hash, Profile.id).where(Profile.source_hash.in_(chunk))
+        ).all())
+    return known
+
+def _insert_unique(db: Session, model, key: str, rows: List[Dict]) -> Dict[str, int]:
+    """
+    Insert rows keyed by a unique column and return the ids of the inserted ones by key
+
+    Keys already stored, including by a concurrent writer after they were looked up, are
+    skipped by the upsert (or, on dialects without one, by inserting each row inside a
+    savepoint) and left out of the result.
+    """
+    column = getattr(model, key)
+    if db.get_bind().dialect.name in UPSERT_DIALECTS:
+        return dict(db.execute(
+            insert_ignoring_conflicts(db, model, index_elements=[key]).returning(column, model.id),
+            rows
+        ).all())
+
+    inserted = {}
+    for row in rows:
+        if row[key] in inserted:
+            continue
+        try:
+            with db.begin_nested():
+                inserted[row[key]] = db.scalar(insert(model).returning(model.id), row)
+        except IntegrityError:
+            pass
+    return inserted
+
+def save_job_postings(db: Session, jobs: List[Dict],
+                      extract_skills: Optional[Callable[[List[str]], List[Union[List[str], Mapping[str, float]]]]] = None
+                      ) -> List[int]:
+    """
+    Save scraped job postings incrementally in one transaction
+
+    Postings are matched to stored ones by URL with bulk lookups. Unchanged postings only
+    get their last_seen_at bumped and keep their stored skills; changed postings are
+    updated and their requirements replaced; new ones are inserted. Skills are extracted
+    only for new and changed descriptions, so the cost of a refresh tracks the number of
+    new postings rather than the total. Each job's 'skills' list is filled in.
+
+    Requirements are scored with requirement_importance from the job's 'skill_positions'
+    (skill -> relative offset of its first mention), when known.
+
+    Args:
+        db (Session): Database session
+        jobs (List[Dict]): Scraped jobs
+        extract_skills (Optional[Callable]): Maps descriptions to skill lists, or to
+            skill -> position mappings that also fill in 'skill_positions'; without it,
+            new and changed jobs must carry a 'skills' list
+
+    Returns:
+        List of the posting ids, in input order
+    """
+    if not jobs:
+        return []
+
+    try:
+        now = datetime.now()
+        hashes = [job_content_hash(job) for job in jobs]
+        known = _known_postings(db, sorted({job['url'] for job in jobs if job.get('url')}))
+
+        posting_ids: List[Optional[int]] = [None] * len(jobs)
+        first_by_url: Dict[str, int] = {}
+        duplicates: Dict[int, int] = {}
+        new, changed, unchanged = [], [], []
+        for index, job in enumerate(jobs):
+            url = job.get('url') or None
+            if url in first_by_url:
+                duplicates[index] = first_by_url[url]
+                continue
+            if url:
+                first_by_url[url] = index
+            if url in known:
+                posting_ids[index], stored_hash = known[url]
+                (unchanged if stored_hash == hashes[index] else changed).append(index)
+            else:
+                new.append(index)
+
+        # Extract skills only where the description is new or changed
+        process = new + changed
+        if extract_skills is not None and process:
+            for index, skills in zip(process, extract_skills([jobs[index]['description'] for index in process])):
+                if isinstance(skills, Mapping):
+                    jobs[index]['skill_positions'] = dict(skills)
+                jobs[index]['skills'] = list(skills)
+
+        stored = _stored_skills(db, [posting_ids[index] for index in unchanged
+                                     if 'skills' not in jobs[index]])
+        for index in unchanged:
+            if 'skills' not in jobs[index]:
+                jobs[index]['skills'] = stored[posting_ids[index]]
+
+        skill_ids = resolve_skill_ids(db, (skill for index in process for skill in jobs[index]['skills']))
+
+        if new:
+            rows = {index: {
+                'title': jobs[index]['title'],
+                'company': jobs[index]['company'],
+                'location': jobs[index]['location'],
+                'description': jobs[index]['description'],
+                'url': jobs[index].get('url') or None,
+                'posted_date': now,  # Use actual posted date if available
+                'content_hash': hashes[index],
+                'last_seen_at': now
+            } for index in new}
+
+            without_url = [index for index in new if rows[index]['url'] is None]
+            if without_url:
+                new_ids = list(db.scalars(
+                    insert(JobPosting).returning(JobPosting.id, sort_by_parameter_order=True),
+                    [rows[index] for index in without_url]
+                ))
+                for index, posting_id in zip(without_url, new_ids):
+                    posting_ids[index] = posting_id
+
+            with_url = [index for index in new if rows[index]['url'] is not None]
+            if with_url:
+                inserted = _insert_unique(db, JobPosting, 'url', [rows[index] for index in with_url])
+                raced = [index for index in with_url if rows[index]['url'] not in inserted]
+                for index in with_url:
+                    posting_ids[index] = inserted.get(rows[index]['url'])
+
+                # Stored by a concurrent save since the lookup: overwrite them like changed postings
+                if raced:
+                    stored_by_url = _known_postings(db, [rows[index]['url'] for index in raced])
+                    for index in raced:
+                        posting_ids[index] = stored_by_url[rows[index]['url']][0]
+                    changed.extend(raced)
+                    raced_indexes = set(raced)
+                    new = [index for index in new if index not in raced_indexes]
+                    logger.info(f"{len(raced)} new job postings were saved concurrently, updating them instead")
+
+        replaced_skills = _stored_skills(db, [posting_ids[index] for index in changed]) if changed else {}
+        if changed:
+            db.execute(update(JobPosting), [{
+                'id': posting_ids[index],
+                'title': jobs[index]['title'],
+                'company': jobs[index]['company'],
+                'location': jobs[index]['location'],
+                'description': jobs[index]['description'],
+                'content_hash': hashes[index],
+                'last_seen_at': now
+            } for index in changed])
+            for chunk in _chunks([posting_ids[index] for index in changed]):
+                db.execute(delete(JobRequirement).where(JobRequirement.job_posting_id.in_(chunk)))
+
+        for chunk in _chunks([posting_ids[index] for index in unchanged]):
+            db.execute(update(JobPosting).where(JobPosting.id.in_(chunk)).values(last_seen_at=now))
+
+        requirements = [{
+            'job_posting_id': posting_ids[index],
+            'skill_id': skill_ids[skill],
+            'importance_score': requirement_importance(jobs[index].get('skill_positions', {}).get(skill))
+        } for index in process for skill in set(jobs[index]['skills'])]
+        if requirements:
+            db.execute(insert(JobRequirement), requirements)
+
+        db.commit()
+
+        skill_index = get_skill_index(db, 'postings')
+        skill_index.remove(replaced_skills)
+        skill_index.add({posting_ids[index]: jobs[index]['skills'] for index in process})
+
+        for index, first in duplicates.items():
+            posting_ids[index] = posting_ids[first]
+            jobs[index]['skills'] = jobs[first]['skills']
+
+        logger.info(f"Saved job postings: {len(new)} new, {len(changed)} changed, "
+                    f"{len(unchanged)} unchanged, {len(duplicates)} duplicates")
+        return posting_ids
+    except Exception:
+        db.rollback()
+        raise
@@ -0,0 +1,242 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from typing import Callable, Dict, List, Optional, Tuple
+import copy
+import json
+import logging
+import os
+import threading
+
+from ..database.database import SessionLocal
+from ..database.models import ScrapeCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# (source, normalized query, normalized location, page)
+CacheKey = Tuple[str, str, str, int]
+
+def normalize_query(text: Optional[str]) -> str:
+    """
+    Normalize a job title or location for cache keys
+
+    Args:
+        text (Optional[str]): Raw text
+
+    Returns:
+        str: Lowercase text with collapsed whitespace
+    """
+    return ' '.join((text or '').lower().split())
+
+class ScrapeCache:
+    """
+    Persistent cache of scraped result pages with stale-while-revalidate.
+
+    Pages younger than ttl_seconds are served as is. Older pages are still served for up
+    to stale_seconds more while one background refresh replaces them. Concurrent
+    requests for a page that has to be scraped share a single scrape, and each gets its
+    own copy of the result.
+
+    Empty pages are often a transient block or timeout rather than a real empty result,
+    so they are only cached for empty_ttl_seconds, are never served stale and never
+    replace a cached non-empty page.
+    """
+
+    def __init__(self, session_factory: Callable = SessionLocal, ttl_seconds: float = 3600,
+                 stale_seconds: float = 86400, refresh_workers: int = 2, empty_ttl_seconds: float = 300):
+        """
+        Initialize the cache
+
+        Args:
+            session_factory (Callable): Creates database sessions
+            ttl_seconds (float): Age below which a page is fresh
+            stale_seconds (float): Extra age during which a stale page is served while
+                it is refreshed
+            refresh_workers (int): Threads running background refreshes
+            empty_ttl_seconds (float): Age below which an empty page is fresh
+        """
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.stale = timedelta(seconds=stale_seconds)
+        self.empty_ttl = timedelta(seconds=empty_ttl_seconds)
+        self._in_flight: Dict[CacheKey, Future] = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='scrape-refresh')
+        self._counters = {'fresh_hits': 0, 'stale_hits': 0, 'misses': 0, 'coalesced': 0,
+                          'refreshes': 0, 'errors': 0}
+
+    @staticmethod
+    def key_for(source: str, query: str, location: Optional[str], page: int) -> CacheKey:
+        """Build the cache key of a result page"""
+        return (source, normalize_query(query), normalize_query(location), page)
+
+    def get_or_scrape(self, key: CacheKey, scrape: Callable[[], List[Dict]],
+                      wait_timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Get a result page from the cache, scraping it if needed
+
+        Args:
+            key (CacheKey): Page key from key_for
+            scrape (Callable[[], List[Dict]]): Scrapes the page
+            wait_timeout (Optional[float]): Seconds to wait for a scrape another request
+                already started
+
+        Returns:
+            List of job posting data
+        """
+        cached = self._load(key)
+        if cached is not None:
+            jobs, scraped_at = cached
+            age = datetime.utcnow() - scraped_at
+            if age < (self.ttl if jobs else self.empty_ttl):
+                self._count('fresh_hits')
+                return jobs
+            if jobs and age < self.ttl + self.stale:
+                self._count('stale_hits')
+                self._refresh_in_background(key, scrape)
+                return jobs
+
+        self._count('misses')
+        # Callers fill in fields such as 'skills', so coalesced callers must not share dicts
+        return copy.deepcopy(self._single_flight(key, scrape).result(wait_timeout))
+
+    def _single_flight(self, key: CacheKey, scrape: Callable[[], List[Dict]],
+                       owner_runs: bool = True) -> Future:
+        """
+        Join the scrape in flight for a key, or start one
+
+        The caller that starts the scrape runs it on its own thread unless owner_runs is
+        False, in which case it is handed to the refresh pool.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._counters['coalesced'] += 1
+                return future
+            future = Future()
+            self._in_flight[key] = future
+
+        if owner_runs:
+            self._run(key, scrape, future)
+        else:
+            self._refresher.submit(self._run, key, scrape, future)
+        return future
+
+    def _run(self, key: CacheKey, scrape: Callable[[], List[Dict]], future: Future):
+        """Scrape a page, store it and resolve everyone waiting on it"""
+        try:
+            jobs = scrape()
+            self._store(key, jobs)
+            future.set_result(jobs)
+        except Exception as e:
+            self._count('errors')
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _refresh_in_background(self, key: CacheKey, scrape: Callable[[], List[Dict]]):
+        """Start one background refresh of a stale page"""
+        with self._lock:
+            if key in self._in_flight:
+                return
+            self._counters['refreshes'] += 1
+        future = self._single_flight(key, scrape, owner_runs=False)
+        future.add_done_callback(self._log_refresh_failure)
+
+    @staticmethod
+    def _log_refresh_failure(future: Future):
+        """Report background refreshes that failed; the stale page stays cached"""
+        if future.exception() is not None:
+            logger.error(f"Error refreshing cached scrape: {str(future.exception())}")
+
+    def _load(self, key: CacheKey) -> Optional[Tuple[List[Dict], datetime]]:
+        """Read a cached page"""
+        db = self.session_factory()
+        try:
+            entry = db.query(ScrapeCacheEntry).filter_by(
+                source=key[0], query=key[1], location=key[2], page=key[3]
+            ).first()
+            return (json.loads(entry.jobs), entry.scraped_at) if entry else None
+        except Exception as e:
+            logger.error(f"Error reading scrape cache: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+    def _store(self, key: CacheKey, jobs: List[Dict]):
+        """Write a scraped page, replacing any older copy"""
+        db = self.session_factory()
+        try:
+            entry = db.query(ScrapeCacheEntry).filter_by(
+                source=key[0], query=key[1], location=key[2], page=key[3]
+            ).first()
+            if not jobs and entry is not None and json.loads(entry.jobs or '[]'):
+                # Keep serving the last good page rather than a likely transient empty one
+                return
+            if entry is None:
+                entry = ScrapeCacheEntry(source=key[0], query=key[1], location=key[2], page=key[3])
+                db.add(entry)
+            entry.jobs = json.dumps(jobs)
+            entry.scraped_at = datetime.utcnow()
+            db.commit()
+        except IntegrityError:
+            # Another process cached the same page first
+            db.rollback()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error writing scrape cache: {str(e)}")
+        finally:
+            db.close()
+
+    def purge_expired(self) -> int:
+        """
+        Delete pages too old to be served even as stale
+
+        Returns:
+            int: Number of pages deleted
+        """
+        db = self.session_factory()
+        try:
+            cutoff = datetime.utcnow() - self.ttl - self.stale
+            deleted = db.query(ScrapeCacheEntry).filter(ScrapeCacheEntry.scraped_at < cutoff).delete()
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters for monitoring
+
+        Returns:
+            Dict with hit, miss, coalesced and refresh counters
+        """
+        with self._lock:
+            return {**self._counters, 'in_flight': len(self._in_flight)}
+
+_cache: Optional[ScrapeCache] = None
+_cache_lock = threading.Lock()
+
+def get_scrape_cache() -> ScrapeCache:
+    """
+    Get the process-wide scrape cache, configured from SCRAPE_CACHE_* environment variables
+
+    Returns:
+        ScrapeCache: Shared cache
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ScrapeCache(
+                    ttl_seconds=float(os.getenv('SCRAPE_CACHE_TTL', '3600')),
+                    stale_seconds=float(os.getenv('SCRAPE_CACHE_STALE_TTL', '86400')),
+                    refresh_workers=int(os.getenv('SCRAPE_CACHE_REFRESH_WORKERS', '2')),
+                    empty_ttl_seconds=float(os.getenv('SCRAPE_CACHE_EMPTY_TTL', '300'))
+                )
+    return _cache
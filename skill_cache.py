@@ -0,0 +1,175 @@
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from collections import OrderedDict
+from typing import Dict, Iterable, Set, Tuple
+import logging
+import os
+import threading
+
+from .models import Skill
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding skill ids inserted by the current transaction
+PENDING_SKILL_IDS_KEY = 'pending_skill_ids'
+
+def normalize_skill_name(name: str) -> str:
+    """
+    Normalize a skill name for lookups
+
+    Args:
+        name (str): Skill name
+
+    Returns:
+        str: Stripped, lowercase name
+    """
+    return name.strip().lower()
+
+class SkillIdCache:
+    """
+    Bounded, process-local LRU cache from normalized skill name to Skill.id.
+
+    Ids of skills inserted by a transaction are only published once that transaction
+    commits, so a rollback can never leave ids in the cache that do not exist.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Maximum number of skill ids kept
+        """
+        self.max_entries = max_entries
+        self._ids: 'OrderedDict[str, int]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get_many(self, names: Iterable[str]) -> Tuple[Dict[str, int], Set[str]]:
+        """
+        Look up several normalized names
+
+        Args:
+            names (Iterable[str]): Normalized skill names
+
+        Returns:
+            Tuple of the cached ids and the set of names that were not cached
+        """
+        found = {}
+        missing = set()
+        with self._lock:
+            for name in names:
+                skill_id = self._ids.get(name)
+                if skill_id is None:
+                    missing.add(name)
+                else:
+                    self._ids.move_to_end(name)
+                    found[name] = skill_id
+            self._counters['hits'] += len(found)
+            self._counters['misses'] += len(missing)
+        return found, missing
+
+    def put_many(self, skill_ids: Dict[str, int]):
+        """
+        Store ids of skills known to be committed
+
+        Args:
+            skill_ids (Dict[str, int]): Maps normalized names to skill ids
+        """
+        with self._lock:
+            for name, skill_id in skill_ids.items():
+                self._ids[name] = skill_id
+                self._ids.move_to_end(name)
+            while len(self._ids) > self.max_entries:
+                self._ids.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def add_pending(self, db: Session, skill_ids: Dict[str, int]):
+        """
+        Stage ids resolved inside an open transaction; they are published on commit
+
+        Args:
+            db (Session): Session whose transaction resolved the ids
+            skill_ids (Dict[str, int]): Maps normalized names to skill ids
+        """
+        db.info.setdefault(PENDING_SKILL_IDS_KEY, []).append((self, dict(skill_ids)))
+
+    def warm(self, db: Session) -> int:
+        """
+        Load the skills table into the cache
+
+        Args:
+            db (Session): Database session
+
+        Returns:
+            int: Number of skills loaded
+        """
+        rows = db.execute(select(Skill.name, Skill.id).limit(self.max_entries)).all()
+        self.put_many({normalize_skill_name(name): skill_id for name, skill_id in rows if name})
+        logger.info(f"Skill id cache warmed with {len(rows)} skills")
+        return len(rows)
+
+    def clear(self):
+        """Remove every cached id"""
+        with self._lock:
+            self._ids.clear()
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters for monitoring
+
+        Returns:
+            Dict with hit/miss counters and the number of cached ids
+        """
+        with self._lock:
+            return {**self._counters, 'entries': len(self._ids)}
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending_skill_ids(session: Session):
+    """Write skill ids inserted by a committed transaction through to their cache"""
+    for cache, skill_ids in session.info.pop(PENDING_SKILL_IDS_KEY, []):
+        cache.put_many(skill_ids)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_skill_ids(session: Session, previous_transaction):
+    """Drop skill ids staged by a transaction that rolled back"""
+    session.info.pop(PENDING_SKILL_IDS_KEY, None)
+
+_caches: Dict[str, SkillIdCache] = {}
+_caches_lock = threading.Lock()
+
+def get_skill_id_cache(db: Session) -> SkillIdCache:
+    """
+    Get the process-wide skill id cache for the database a session is bound to
+
+    Args:
+        db (Session): Database session
+
+    Returns:
+        SkillIdCache: Cache for that database
+    """
+    key = str(db.get_bind().url)
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                cache = SkillIdCache(int(os.getenv('SKILL_CACHE_MAX_ENTRIES', '10000')))
+                _caches[key] = cache
+    return cache
+
+def clear_skill_id_caches():
+    """Empty every skill id cache, e.g. after the tables are dropped"""
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.clear()
+
+def skill_id_cache_stats() -> Dict:
+    """
+    Get the counters of every skill id cache for monitoring
+
+    Returns:
+        Dict mapping database URLs (without passwords) to cache counters
+    """
+    with _caches_lock:
+        return {key.split('@')[-1]: cache.stats() for key, cache in _caches.items()}
@@ -0,0 +1,475 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+import logging
+import threading
+import time
+
+import numpy as np
+
+from .models import JobPosting, JobRequirement, Profile, Skill, profile_skills
+from .skill_cache import normalize_skill_name
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip while loading an index
+LOAD_BATCH_SIZE = 50000
+
+# Indexed document kinds and the (document id, skill id) columns they are built from
+INDEXED_KINDS = {
+    'profiles': (profile_skills.c.profile_id, profile_skills.c.skill_id),
+    'postings': (JobRequirement.job_posting_id, JobRequirement.skill_id),
+}
+
+# Columns returned with each search result
+RESULT_COLUMNS = {
+    'profiles': (Profile, ('name', 'headline', 'location')),
+    'postings': (JobPosting, ('title', 'company', 'location', 'url')),
+}
+
+# Posting lists covering at least this share of the id range also get a bitmap
+DENSE_FRACTION = 1 / 32
+
+_EMPTY = np.empty(0, dtype=np.uint32)
+_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+_BIT_OFFSETS = np.arange(64, dtype=np.int64)
+
+def _member(values: np.ndarray, sorted_ids: np.ndarray) -> np.ndarray:
+    """Boolean mask of the values found in a sorted id array"""
+    if not len(sorted_ids) or not len(values):
+        return np.zeros(len(values), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_ids, values), len(sorted_ids) - 1)
+    return sorted_ids[positions] == values
+
+def _to_bitmap(ids: np.ndarray, words: int) -> np.ndarray:
+    """Bitmap of 64-bit words in which bit (id % 64) of word (id // 64) is set for each id"""
+    bits = np.zeros(words * 64, dtype=bool)
+    bits[ids] = True
+    return np.packbits(bits, bitorder='little').view(np.uint64)
+
+def _fit(bitmap: np.ndarray, words: int) -> np.ndarray:
+    """Bitmap truncated or zero-padded to a number of words"""
+    if len(bitmap) >= words:
+        return bitmap[:words]
+    return np.concatenate([bitmap, np.zeros(words - len(bitmap), dtype=np.uint64)])
+
+def _test(bitmap: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Boolean mask of the ids set in a bitmap"""
+    words = (ids >> 6).astype(np.int64)
+    inside = words < len(bitmap)
+    found = np.zeros(len(ids), dtype=bool)
+    shifts = (ids[inside] & 63).astype(np.uint64)
+    found[inside] = ((bitmap[words[inside]] >> shifts) & np.uint64(1)).astype(bool)
+    return found
+
+def _bitmap_ids(bitmap: np.ndarray, limit: int) -> np.ndarray:
+    """The lowest ids set in a bitmap, at most limit of them"""
+    # Every non-zero word holds at least one id, so limit words are always enough
+    words = np.flatnonzero(bitmap)[:limit]
+    bits = np.unpackbits(bitmap[words].view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    return (words[:, np.newaxis] * 64 + _BIT_OFFSETS)[bits.astype(bool)][:limit]
+
+def _popcount(bitmap: np.ndarray) -> int:
+    """Number of bits set in a bitmap"""
+    return int(_POPCOUNT[bitmap.view(np.uint8)].sum(dtype=np.int64))
+
+class SkillIndex:
+    """
+    In-memory inverted index from normalized skill name to the sorted ids of the
+    documents (profiles or job postings) having that skill.
+
+    Posting lists are immutable sorted uint32 arrays; lists dense enough that a bitmap
+    over the id range is smaller than 32 bits per id also get a cached bitmap, in the
+    spirit of roaring bitmaps. Queries pick per step: sparse candidates are probed
+    against lists or bitmaps, dense ones are combined word by word, and match counts
+    for ranking are kept as bit-sliced counters so nothing proportional to the number
+    of matches is sorted.
+
+    Writes are collected per skill and merged into a new array the next time that skill
+    is read, so readers never see a list change under them. Writes are ignored until a
+    load starts, since the load reads them from the database; from then on they are kept
+    and applied on top of the loaded lists, so nothing committed while loading is lost.
+    """
+
+    def __init__(self, kind: str):
+        """
+        Initialize an empty index
+
+        Args:
+            kind (str): Kind of document indexed, e.g. 'profiles'
+        """
+        self.kind = kind
+        self.tracking = False
+        self.loaded = False
+        self._lists: Dict[str, np.ndarray] = {}
+        self._bitmaps: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._universe = 0
+        self._added: Dict[str, Set[int]] = {}
+        self._removed: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+        self._counters = {'searches': 0, 'added': 0, 'removed': 0, 'merges': 0}
+
+    def track(self):
+        """Start recording writes; called before the database is read for a load"""
+        with self._lock:
+            self.tracking = True
+
+    def load(self, postings: Mapping[str, Iterable[int]]):
+        """
+        Replace the index contents, keeping writes made since the load started
+
+        Args:
+            postings (Mapping[str, Iterable[int]]): Maps skill names to document ids
+        """
+        lists = {
+            normalize_skill_name(skill): np.unique(np.fromiter(ids, dtype=np.uint32))
+            for skill, ids in postings.items()
+        }
+        universe = max((int(ids[-1]) + 1 for ids in lists.values() if len(ids)), default=0)
+        with self._lock:
+            self._lists = lists
+            self._bitmaps = {}
+            self._universe = universe
+            self.tracking = self.loaded = True
+
+    def add(self, documents: Mapping[int, Iterable[str]]):
+        """
+        Index the skills of documents
+
+        Args:
+            documents (Mapping[int, Iterable[str]]): Maps document ids to skill names
+        """
+        with self._lock:
+            if not self.tracking:
+                return
+            for doc_id, skills in documents.items():
+                for skill in skills:
+                    skill = normalize_skill_name(skill)
+                    self._added.setdefault(skill, set()).add(doc_id)
+                    self._removed.get(skill, set()).discard(doc_id)
+                    self._counters['added'] += 1
+
+    def remove(self, documents: Mapping[int, Iterable[str]]):
+        """
+        Remove skills of documents from the index
+
+        Args:
+            documents (Mapping[int, Iterable[str]]): Maps document ids to skill names
+        """
+        with self._lock:
+            if not self.tracking:
+                return
+            for doc_id, skills in documents.items():
+                for skill in skills:
+                    skill = normalize_skill_name(skill)
+                    self._removed.setdefault(skill, set()).add(doc_id)
+                    self._added.get(skill, set()).discard(doc_id)
+                    self._counters['removed'] += 1
+
+    def postings(self, skill: str) -> np.ndarray:
+        """
+        Get the sorted ids of the documents having a skill
+
+        Args:
+            skill (str): Skill name
+
+        Returns:
+            np.ndarray: Sorted document ids
+        """
+        skill = normalize_skill_name(skill)
+        with self._lock:
+            ids = self._lists.get(skill, _EMPTY)
+            added, removed = self._added.get(skill), self._removed.get(skill)
+            if added or removed:
+                if added:
+                    ids = np.union1d(ids, np.fromiter(added, dtype=np.uint32, count=len(added)))
+                if removed:
+                    ids = ids[~_member(ids, np.sort(np.fromiter(removed, dtype=np.uint32, count=len(removed))))]
+                # Until loaded, writes stay pending so the load can be applied under them
+                if self.loaded:
+                    self._lists[skill] = ids
+                    self._added.pop(skill, None)
+                    self._removed.pop(skill, None)
+                    if len(ids):
+                        self._universe = max(self._universe, int(ids[-1]) + 1)
+                    self._counters['merges'] += 1
+            return ids
+
+    def _term(self, skill: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Posting list of a skill and, if the list is dense, its bitmap"""
+        ids = self.postings(skill)
+        if len(ids) < DENSE_FRACTION * self._universe:
+            return ids, None
+        cached = self._bitmaps.get(skill)
+        if cached is not None and cached[0] is ids:
+            return ids, cached[1]
+        bitmap = _to_bitmap(ids, -(-self._universe // 64))
+        with self._lock:
+            if self._lists.get(skill) is ids:
+                self._bitmaps[skill] = (ids, bitmap)
+        return ids, bitmap
+
+    @staticmethod
+    def _contains(term: Tuple[np.ndarray, Optional[np.ndarray]], ids: np.ndarray) -> np.ndarray:
+        """Boolean mask of the ids found in a term"""
+        postings, bitmap = term
+        return _test(bitmap, ids) if bitmap is not None else _member(ids, postings)
+
+    def search(self, all_of: Sequence[str] = (), any_of: Sequence[str] = (),
+               none_of: Sequence[str] = (), limit: int = 20) -> Dict:
+        """
+        Find the documents matching a boolean skill query
+
+        Documents must have every skill in all_of, at least one skill in any_of (when
+        given) and none of the skills in none_of. Results are ranked by the number of
+        query skills they have, then by id.
+
+        Args:
+            all_of (Sequence[str]): Skills combined with AND
+            any_of (Sequence[str]): Skills combined with OR
+            none_of (Sequence[str]): Skills excluded with NOT
+            limit (int): Maximum number of results
+
+        Returns:
+            Dict with the total number of matches and the top results as dicts with the
+            document 'id' and its number of 'matches'
+
+        Raises:
+            ValueError: If neither all_of nor any_of is given
+        """
+        all_of = sorted({normalize_skill_name(skill) for skill in all_of})
+        any_of = sorted({normalize_skill_name(skill) for skill in any_of} - set(all_of))
+        none_of = sorted({normalize_skill_name(skill) for skill in none_of})
+        if not all_of and not any_of:
+            raise ValueError("At least one skill to match is required")
+
+        started = time.perf_counter()
+        terms = {skill: self._term(skill) for skill in {*all_of, *any_of, *none_of}}
+        words = -(-self._universe // 64)
+
+        # AND: probe the shortest list against the others, unless every list is dense
+        candidates = candidate_bits = None
+        if all_of:
+            ordered = sorted(all_of, key=lambda skill: len(terms[skill][0]))
+            if terms[ordered[0]][1] is None:
+                candidates = terms[ordered[0]][0]
+                for skill in ordered[1:]:
+                    candidates = candidates[self._contains(terms[skill], candidates)]
+            else:
+                candidate_bits = _fit(terms[ordered[0]][1], words)
+                for skill in ordered[1:]:
+                    candidate_bits = candidate_bits & _fit(terms[skill][1], words)
+
+        # OR: count matches per candidate, or per id with bit-sliced counters when dense
+        ids = counts = matched_bits = None
+        planes: List[np.ndarray] = []
+        if candidates is not None:
+            counts = np.zeros(len(candidates), dtype=np.int64)
+            for skill in any_of:
+                counts += self._contains(terms[skill], candidates)
+            ids = candidates[counts > 0] if any_of else candidates
+            counts = counts[counts > 0] if any_of else counts
+        elif candidate_bits is None and all(terms[skill][1] is None for skill in any_of):
+            ids, counts = np.unique(np.concatenate([terms[skill][0] for skill in any_of]), return_counts=True)
+        else:
+            matched_bits = candidate_bits
+            if any_of:
+                matched_bits = None
+                for skill in any_of:
+                    postings, bitmap = terms[skill]
+                    bits = _fit(bitmap, words) if bitmap is not None else _to_bitmap(postings, words)
+                    if candidate_bits is not None:
+                        bits = bits & candidate_bits
+                    matched_bits = bits if matched_bits is None else matched_bits | bits
+                    # Add the bitmap into the counters one bit plane at a time
+                    carry = bits
+                    for plane, counter in enumerate(planes):
+                        planes[plane], carry = counter ^ carry, counter & carry
+                    if carry.any():
+                        planes.append(carry)
+
+        # NOT
+        for skill in none_of:
+            postings, bitmap = terms[skill]
+            if matched_bits is not None:
+                excluded = _fit(bitmap, words) if bitmap is not None else _to_bitmap(postings, words)
+                matched_bits = matched_bits & ~excluded
+            else:
+                keep = ~self._contains(terms[skill], ids)
+                ids, counts = ids[keep], counts[keep]
+
+        if matched_bits is not None:
+            total, results = self._top_bits(matched_bits, planes, len(any_of), len(all_of), limit)
+        else:
+            total, results = len(ids), self._top_ids(ids, counts + len(all_of), limit)
+
+        with self._lock:
+            self._counters['searches'] += 1
+        return {
+            'total': int(total),
+            'results': results,
+            'took_ms': round((time.perf_counter() - started) * 1000, 3)
+        }
+
+    @staticmethod
+    def _top_ids(ids: np.ndarray, scores: np.ndarray, limit: int) -> List[Dict]:
+        """Best scoring ids, ties broken by lower id, without sorting every match"""
+        if limit <= 0 or not len(ids):
+            return []
+        if len(ids) <= 4 * limit:
+            rows = np.lexsort((ids, -scores))[:limit]
+        else:
+            # One integer key orders by score, then by ascending id
+            largest = int(ids.max())
+            keys = scores.astype(np.int64) * (largest + 1) + (largest - ids.astype(np.int64))
+            rows = np.argpartition(-keys, limit - 1)[:limit]
+            rows = rows[np.argsort(-keys[rows])]
+        return [{'id': int(ids[row]), 'matches': int(scores[row])} for row in rows]
+
+    @staticmethod
+    def _top_bits(matched: np.ndarray, planes: List[np.ndarray], most: int, base: int,
+                  limit: int) -> Tuple[int, List[Dict]]:
+        """Count the matches of a bitmap and take the best from its bit-sliced counters"""
+        results: List[Dict] = []
+        # Counts above what the planes can represent never occur
+        for count in range(min(most, 2 ** len(planes) - 1), -1, -1) if planes else [0]:
+            if len(results) >= limit:
+                break
+            level = matched
+            for plane, counter in enumerate(planes):
+                level = level & (counter if count >> plane & 1 else ~counter)
+            results.extend({'id': int(doc_id), 'matches': count + base}
+                           for doc_id in _bitmap_ids(level, limit - len(results)))
+        return _popcount(matched), results
+
+    def stats(self) -> Dict:
+        """
+        Get index counters for monitoring
+
+        Returns:
+            Dict with search and write counters, the number of skills, postings and
+            cached bitmaps
+        """
+        with self._lock:
+            return {
+                **self._counters,
+                'loaded': self.loaded,
+                'skills': len(self._lists),
+                'postings': int(sum(len(ids) for ids in self._lists.values())),
+                'bitmaps': len(self._bitmaps),
+                'pending_skills': len(set(self._added) | set(self._removed))
+            }
+
+def load_skill_index(db: Session, index: SkillIndex) -> int:
+    """
+    Load an index from the database
+
+    Args:
+        db (Session): Database session
+        index (SkillIndex): Index to fill
+
+    Returns:
+        int: Number of (document, skill) pairs loaded
+    """
+    doc_column, skill_column = INDEXED_KINDS[index.kind]
+    index.track()
+    postings: Dict[str, List[int]] = {}
+    loaded = 0
+    rows = db.execute(
+        select(doc_column, Skill.name).join(Skill, Skill.id == skill_column)
+        .execution_options(yield_per=LOAD_BATCH_SIZE)
+    )
+    for doc_id, name in rows:
+        if doc_id is not None and name:
+            postings.setdefault(name, []).append(doc_id)
+            loaded += 1
+    index.load(postings)
+    logger.info(f"Skill index for {index.kind} loaded with {loaded} postings")
+    return loaded
+
+def search_skill_index(db: Session, kind: str, all_of: Sequence[str] = (), any_of: Sequence[str] = (),
+                       none_of: Sequence[str] = (), limit: int = 20) -> Dict:
+    """
+    Search the documents of a kind by skills and load the matching rows
+
+    Args:
+        db (Session): Database session
+        kind (str): 'profiles' or 'postings'
+        all_of (Sequence[str]): Skills combined with AND
+        any_of (Sequence[str]): Skills combined with OR
+        none_of (Sequence[str]): Skills excluded with NOT
+        limit (int): Maximum number of results
+
+    Returns:
+        Dict as returned by SkillIndex.search, with each result's columns filled in
+    """
+    found = ensure_skill_index(db, kind).search(all_of, any_of, none_of, limit)
+    model, columns = RESULT_COLUMNS[kind]
+    ids = [result['id'] for result in found['results']]
+    rows = {
+        row.id: row for row in db.execute(
+            select(model.id, *(getattr(model, column) for column in columns)).where(model.id.in_(ids))
+        ).all()
+    } if ids else {}
+    for result in found['results']:
+        row = rows.get(result['id'])
+        result.update({column: getattr(row, column) if row else None for column in columns})
+    return found
+
+_indexes: Dict[tuple, SkillIndex] = {}
+_indexes_lock = threading.Lock()
+_load_lock = threading.Lock()
+
+def get_skill_index(db: Session, kind: str) -> SkillIndex:
+    """
+    Get the process-wide skill index of a document kind for the database a session is bound to
+
+    Args:
+        db (Session): Database session
+        kind (str): 'profiles' or 'postings'
+
+    Returns:
+        SkillIndex: Index, possibly not loaded yet
+    """
+    key = (str(db.get_bind().url), kind)
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = SkillIndex(kind)
+                _indexes[key] = index
+    return index
+
+def ensure_skill_index(db: Session, kind: str) -> SkillIndex:
+    """
+    Get a skill index, loading it from the database on first use
+
+    Args:
+        db (Session): Database session
+        kind (str): 'profiles' or 'postings'
+
+    Returns:
+        SkillIndex: Loaded index
+    """
+    index = get_skill_index(db, kind)
+    if not index.loaded:
+        with _load_lock:
+            if not index.loaded:
+                load_skill_index(db, index)
+    return index
+
+def clear_skill_indexes():
+    """Forget every skill index, e.g. after the tables are dropped"""
+    with _indexes_lock:
+        _indexes.clear()
+
+def skill_index_stats() -> Dict:
+    """
+    Get the counters of every skill index for monitoring
+
+    Returns:
+        Dict mapping '<database URL without password> <kind>' to index counters
+    """
+    with _indexes_lock:
+        return {f"{url.split('@')[-1]} {kind}": index.stats() for (url, kind), index in _indexes.items()}
@@ -0,0 +1,179 @@
+import re
+import logging
+from typing import Dict, Iterable, List, Mapping, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sentinel key marking the end of a phrase inside the trie
+_END = ''
+
+class SkillMatcher:
+    """
+    Multi-pattern matcher that finds every vocabulary phrase in a text in a single pass.
+
+    The vocabulary is compiled once into a trie-shaped regular expression, so matching
+    cost grows with the length of the text rather than with (vocabulary size x text length).
+    Phrases only match on word boundaries, and overlapping phrases (e.g. "machine" and
+    "machine learning") are all reported.
+    """
+
+    def __init__(self, vocabulary: Mapping[str, Iterable[str]]):
+        """
+        Compile the matcher for a vocabulary
+
+        Args:
+            vocabulary (Mapping[str, Iterable[str]]): Maps each lowercase phrase to the
+                canonical skill(s) it stands for
+        """
+        self.phrases: Dict[str, Tuple[str, ...]] = {
+            phrase: tuple(sorted(set(canonicals)))
+            for phrase, canonicals in vocabulary.items()
+            if phrase
+        }
+        self._nested = self._build_nested_prefixes(self.phrases)
+        self.pattern = self._compile(self.phrases)
+
+    @classmethod
+    def from_skills(cls, known_skills: Iterable[str], skill_synonyms: Mapping[str, Iterable[str]]) -> 'SkillMatcher':
+        """
+        Build a matcher from a set of canonical skills and a synonym mapping
+
+        Args:
+            known_skills (Iterable[str]): Canonical skills matched by their own name
+            skill_synonyms (Mapping[str, Iterable[str]]): Maps canonical skills to variants
+
+        Returns:
+            SkillMatcher: Compiled matcher
+        """
+        vocabulary: Dict[str, Set[str]] = {}
+        for skill in known_skills:
+            vocabulary.setdefault(skill.lower(), set()).add(skill)
+        for standard, variants in skill_synonyms.items():
+            for variant in variants:
+                vocabulary.setdefault(variant.lower(), set()).add(standard)
+        return cls(vocabulary)
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Find all canonical skills mentioned in a text
+
+        Args:
+            text (str): Lowercase text to search
+
+        Returns:
+            Set of canonical skills
+        """
+        found: Set[str] = set()
+        if not text or self.pattern is None:
+            return found
+
+        seen = set()
+        for match in self.pattern.finditer(text):
+            phrase = match.group(1)
+            if phrase in seen:
+                continue
+            seen.add(phrase)
+            found.update(self.phrases[phrase])
+            found.update(self._nested.get(phrase, ()))
+        return found
+
+    def find_positions(self, text: str) -> Dict[str, int]:
+        """
+        Find where each canonical skill is first mentioned in a text
+
+        Args:
+            text (str): Lowercase text to search
+
+        Returns:
+            Dict mapping canonical skills to the offset of their first mention
+        """
+        positions: Dict[str, int] = {}
+        if not text or self.pattern is None:
+            return positions
+
+        for match in self.pattern.finditer(text):
+            phrase = match.group(1)
+            for canonical in (*self.phrases[phrase], *self._nested.get(phrase, ())):
+                positions.setdefault(canonical, match.start(1))
+        return positions
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    @staticmethod
+    def _build_nested_prefixes(phrases: Mapping[str, Tuple[str, ...]]) -> Dict[str, Set[str]]:
+        """
+        For every phrase, collect the canonicals of shorter phrases that are word-bounded
+        prefixes of it. The regex only reports the longest phrase starting at a position,
+        so these are added back when the longer phrase matches.
+        """
+        nested: Dict[str, Set[str]] = {}
+        for phrase in phrases:
+            for end in range(1, len(phrase)):
+                if phrase[end].isalnum() or phrase[end] == '_':
+                    continue
+                prefix = phrase[:end]
+                if prefix in phrases:
+                    nested.setdefault(phrase, set()).update(phrases[prefix])
+        return nested
+
+    @classmethod
+    def _compile(cls, phrases: Iterable[str]):
+        """Compile the phrases into a single trie-shaped regex"""
+        trie: Dict = {}
+        for phrase in phrases:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[_END] = True
+
+        if not trie:
+            return None
+
+        # Zero-width lookahead so that matches starting inside a longer match are also found
+        body = cls._trie_to_regex(trie)
+        return re.compile(r'(?<!\w)(?=(' + body + r')(?!\w))')
+
+    @classmethod
+    def _trie_to_regex(cls, node: Dict) -> str:
+        """Render a trie node as a regex fragment; longer alternatives are preferred"""
+        optional = _END in node
+        branches: List[str] = []
+        single_chars: List[str] = []
+
+        for char in sorted(key for key in node if key != _END):
+            child = node[char]
+            if len(child) == 1 and _END in child:
+                single_chars.append(char)
+                continue
+
+            # Collapse chains of single-child nodes into one literal run
+            run = [char]
+            while len(child) == 1 and _END not in child:
+                (next_char, child), = child.items()
+                run.append(next_char)
+            literal = re.escape(''.join(run))
+            if len(child) == 1:
+                branches.append(literal)
+            else:
+                branches.append(literal + cls._trie_to_regex(child))
+
+        if single_chars:
+            if len(single_chars) == 1:
+                branches.append(re.escape(single_chars[0]))
+            else:
+                branches.append('[' + ''.join(cls._escape_class_char(c) for c in single_chars) + ']')
+
+        if not branches:
+            return ''
+
+        if len(branches) == 1 and not optional:
+            return branches[0]
+
+        fragment = '(?:' + '|'.join(branches) + ')'
+        return fragment + '?' if optional else fragment
+
+    @staticmethod
+    def _escape_class_char(char: str) -> str:
+        """Escape a character for use inside a regex character class"""
+        return '\\' + char if char in '\\]^-[' else char
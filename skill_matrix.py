@@ -0,0 +1,159 @@
+import logging
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+# Profiles scored per matrix product; bounds the dense (block x roles) score arrays
+DEFAULT_BLOCK_SIZE = 1024
+
+class SkillGapScorer:
+    """
+    Scores many profiles against many roles at once with sparse matrix products.
+
+    Role skills are encoded once into a (roles x skills) matrix of skill weights. A block
+    of profiles is encoded into a binary (profiles x skills) matrix, and one product per
+    block gives the matching count and matched weight of every (profile, role) pair. The
+    missing and extra counts follow from the row sizes. With unit weights the match
+    percentage equals SkillProcessor.compare_skills.
+    """
+
+    def __init__(self, roles: Mapping[str, Iterable[str]],
+                 weights: Optional[Mapping[str, Mapping[str, float]]] = None):
+        """
+        Encode the roles
+
+        Args:
+            roles (Mapping[str, Iterable[str]]): Maps each role (e.g. a job title) to its
+                required skills
+            weights (Optional[Mapping[str, Mapping[str, float]]]): Per-role skill weights;
+                skills without one weigh 1
+        """
+        self.roles: List[str] = list(roles)
+        self.skill_index: Dict[str, int] = {}
+        weights = weights or {}
+
+        rows, columns, values = [], [], []
+        for row, role in enumerate(self.roles):
+            role_weights = weights.get(role, {})
+            for skill in set(roles[role]):
+                column = self.skill_index.setdefault(skill, len(self.skill_index))
+                rows.append(row)
+                columns.append(column)
+                values.append(float(role_weights.get(skill, 1.0)))
+
+        shape = (len(self.roles), len(self.skill_index))
+        weight_matrix = sparse.csr_matrix((values, (rows, columns)), shape=shape, dtype=np.float64)
+        # Transposed once so every block is a plain (profiles x skills) @ (skills x roles)
+        self._weights_t = weight_matrix.T.tocsr()
+        self._required_t = (weight_matrix != 0).astype(np.float32).T.tocsr()
+        self.role_sizes = np.diff(weight_matrix.indptr).astype(np.int32)
+        self.role_weight_totals = np.asarray(weight_matrix.sum(axis=1)).ravel()
+
+    def encode_profiles(self, profiles: Sequence[Iterable[str]]) -> Tuple[sparse.csr_matrix, np.ndarray]:
+        """
+        Encode profiles into a binary sparse matrix over the role skills
+
+        Args:
+            profiles (Sequence[Iterable[str]]): Skills of each profile
+
+        Returns:
+            The (profiles x skills) matrix and each profile's number of distinct skills,
+            including skills no role requires
+        """
+        indptr, columns = [0], []
+        sizes = np.empty(len(profiles), dtype=np.int32)
+        for row, skills in enumerate(profiles):
+            unique = set(skills)
+            sizes[row] = len(unique)
+            columns.extend(self.skill_index[skill] for skill in unique if skill in self.skill_index)
+            indptr.append(len(columns))
+
+        data = np.ones(len(columns), dtype=np.float32)
+        matrix = sparse.csr_matrix((data, columns, indptr), shape=(len(profiles), len(self.skill_index)))
+        return matrix, sizes
+
+    def score(self, profiles: Sequence[Iterable[str]]) -> Dict[str, np.ndarray]:
+        """
+        Score every profile against every role
+
+        Args:
+            profiles (Sequence[Iterable[str]]): Skills of each profile
+
+        Returns:
+            Dict of (profiles x roles) arrays: 'matching', 'missing' and 'extra' skill
+            counts and the weighted 'match_percentage'
+        """
+        matrix, sizes = self.encode_profiles(profiles)
+        matching = (matrix @ self._required_t).toarray().astype(np.int32)
+        matched_weight = (matrix @ self._weights_t).toarray()
+
+        totals = self.role_weight_totals
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentage = np.where(totals > 0, matched_weight * 100.0 / totals, 0.0)
+
+        return {
+            'matching': matching,
+            'missing': self.role_sizes[np.newaxis, :] - matching,
+            'extra': sizes[:, np.newaxis] - matching,
+            'match_percentage': np.round(percentage, 2)
+        }
+
+    def top_k(self, profiles: Iterable[Iterable[str]], k: int = 10,
+              block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[List[Dict]]:
+        """
+        Stream each profile's best matching roles
+
+        Profiles are consumed and scored a block at a time, so memory stays bounded by
+        block_size x roles however many profiles there are.
+
+        Args:
+            profiles (Iterable[Iterable[str]]): Skills of each profile
+            k (int): Number of roles kept per profile
+            block_size (int): Profiles scored per matrix product
+
+        Yields:
+            For each profile in input order, up to k roles with their scores, best first;
+            ties are broken by the number of matching skills
+        """
+        k = min(k, len(self.roles))
+        block: List[Iterable[str]] = []
+        for skills in profiles:
+            block.append(skills)
+            if len(block) == block_size:
+                yield from self._top_k_block(block, k)
+                block = []
+        if block:
+            yield from self._top_k_block(block, k)
+
+    def _top_k_block(self, block: List[Iterable[str]], k: int) -> Iterator[List[Dict]]:
+        """Score one block and yield the top roles of each of its profiles"""
+        if k <= 0:
+            for _ in block:
+                yield []
+            return
+
+        scores = self.score(block)
+        percentage, matching = scores['match_percentage'], scores['matching']
+        # One integer key ranks by percentage, then matching count, then role order
+        role_count = len(self.roles)
+        rank_key = (np.rint(percentage * 100).astype(np.int64) * (int(self.role_sizes.max(initial=0)) + 1)
+                    + matching) * role_count + np.arange(role_count - 1, -1, -1)
+        candidates = np.argpartition(-rank_key, k - 1, axis=1)[:, :k] if k < role_count \
+            else np.tile(np.arange(role_count), (len(block), 1))
+        candidate_keys = np.take_along_axis(rank_key, candidates, axis=1)
+        order = np.take_along_axis(candidates, np.argsort(-candidate_keys, axis=1), axis=1)
+
+        for row, columns in enumerate(order):
+            yield [
+                {
+                    'role': self.roles[column],
+                    'match_percentage': float(percentage[row, column]),
+                    'matching': int(matching[row, column]),
+                    'missing': int(scores['missing'][row, column]),
+                    'extra': int(scores['extra'][row, column])
+                }
+                for column in columns
+            ]
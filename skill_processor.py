@@ -1,24 +1,53 @@
-import spacy
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional, Iterable, Tuple
 import logging
 import re
+import threading
 from collections import Counter
-
-# Download required NLTK data
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('wordnet')
+from concurrent.futures import ProcessPoolExecutor
+from .skill_matcher import SkillMatcher
 
 logger = logging.getLogger(__name__)
 
+# NLTK resources required by the NLP code paths, as (resource path, package name)
+NLTK_RESOURCES = [
+    ('tokenizers/punkt', 'punkt'),
+    ('corpora/stopwords', 'stopwords'),
+    ('corpora/wordnet', 'wordnet'),
+]
+
+# Batches smaller than this are always extracted in-process
+PARALLEL_BATCH_THRESHOLD = 256
+
+_nltk_lock = threading.Lock()
+_nltk_ready = False
+
+def ensure_nltk_data():
+    """
+    Download the required NLTK data the first time it is needed
+    """
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    
+    with _nltk_lock:
+        if _nltk_ready:
+            return
+        
+        import nltk
+        for resource, package in NLTK_RESOURCES:
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                logger.info(f"Downloading NLTK resource {package}")
+                nltk.download(package, quiet=True)
+        _nltk_ready = True
+
 class SkillProcessor:
     def __init__(self):
-        """Initialize the skill processor with NLP models"""
-        self.nlp = spacy.load('en_core_web_sm')
-        self.stop_words = set(stopwords.words('english'))
+        """Initialize the skill processor; NLP models are loaded on first use"""
+        self._nlp = None
+        self._stop_words = None
+        self._model_lock = threading.Lock()
         
         # Predefined list of known skills
         self.known_skills = {
@@ -48,9 +77,41 @@ class SkillProcessor:
             'ci/cd': ['continuous integration', 'continuous deployment', 'ci/cd experience'],
         }
 
+        self.rebuild_matcher()
+
+    def rebuild_matcher(self):
+        """
+        Compile the skill matcher for the current vocabulary.
+
+        Must be called after modifying known_skills or skill_synonyms.
+        """
+        self.matcher = SkillMatcher.from_skills(self.known_skills, self.skill_synonyms)
+
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded the first time it is accessed"""
+        if self._nlp is None:
+            with self._model_lock:
+                if self._nlp is None:
+                    import spacy
+                    logger.info("Loading spaCy model en_core_web_sm")
+                    self._nlp = spacy.load('en_core_web_sm')
+        return self._nlp
+
+    @property
+    def stop_words(self) -> Set[str]:
+        """English stop words, loaded the first time they are accessed"""
+        if self._stop_words is None:
+            with self._model_lock:
+                if self._stop_words is None:
+                    ensure_nltk_data()
+                    from nltk.corpus import stopwords
+                    self._stop_words = set(stopwords.words('english'))
+        return self._stop_words
+
     def extract_skills_from_text(self, text: str) -> List[str]:
         """
-        Extract skills from text using direct matching and regex patterns
+        Extract skills from text using the compiled skill matcher
         
         Args:
             text (str): Text to extract skills from
@@ -64,35 +125,70 @@ class SkillProcessor:
         # Convert text to lowercase for case-insensitive matching
         text = text.lower()
         
-        # Directly match against known skills
-        skills = set()
-        for skill in self.known_skills:
-            if skill in text:
-                skills.add(skill)
-        
-        # Match against skill synonyms
-        for standard, variants in self.skill_synonyms.items():
-            for variant in variants:
-                if variant in text:
-                    skills.add(standard)
-        
-        # Use regex to capture skills in specific contexts
-        patterns = [
-            r'proficient in (\w+)',
-            r'experience with (\w+)',
-            r'knowledge of (\w+)',
-            r'skilled in (\w+)',
-            r'expertise in (\w+)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                skill = match.group(1)
-                if skill in self.known_skills:
-                    skills.add(skill)
-        
-        return list(skills)
+        # Match known skills and synonyms on word boundaries in a single pass
+        return list(self.matcher.find(text))
+
+    def extract_skill_positions(self, text: str) -> Dict[str, float]:
+        """
+        Extract skills along with where they are first mentioned
+        
+        Args:
+            text (str): Text to extract skills from
+            
+        Returns:
+            Dict mapping each extracted skill to the relative offset (0 = start, 1 = end)
+            of its first mention
+        """
+        if not text:
+            return {}
+        
+        text = text.lower()
+        return {skill: offset / len(text) for skill, offset in self.matcher.find_positions(text).items()}
+
+    def extract_profile_skills(self, profile_data: Dict) -> List[str]:
+        """
+        Extract skills from a profile's about section and experience descriptions
+        
+        Args:
+            profile_data (Dict): Parsed or scraped profile
+            
+        Returns:
+            List of extracted skills
+        """
+        return self.extract_skills_from_text(
+            (profile_data.get('about') or '') + ' ' +
+            ' '.join([exp.get('description') or '' for exp in profile_data.get('experience', [])])
+        )
+
+    def extract_skills_batch(self, texts: Iterable[str], workers: int = 0,
+                             chunksize: int = 64) -> Tuple[List[List[str]], Dict[str, int]]:
+        """
+        Extract skills from many documents in one pass
+        
+        Args:
+            texts (Iterable[str]): Documents to extract skills from
+            workers (int): Size of the process pool to fan out across; 0 or 1 extracts in-process
+            chunksize (int): Number of documents sent to a worker at a time
+            
+        Returns:
+            Tuple of the per-document skill lists (in input order) and the aggregated
+            frequency of each skill across the documents
+        """
+        texts = list(texts)
+        
+        if workers > 1 and len(texts) >= PARALLEL_BATCH_THRESHOLD:
+            chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_batch_worker,
+                initargs=(self.known_skills, self.skill_synonyms)
+            ) as executor:
+                document_skills = [skills for chunk in executor.map(_extract_batch_chunk, chunks)
+                                   for skills in chunk]
+        else:
+            document_skills = [self.extract_skills_from_text(text) for text in texts]
+        
+        return document_skills, _skill_frequency(document_skills)
 
     def _normalize_skills(self, skills: List[str]) -> List[str]:
         """
@@ -123,16 +219,20 @@ class SkillProcessor:
         
         return list(normalized)
 
-    def compare_skills(self, user_skills: List[str], job_skills: List[str]) -> Dict:
+    def compare_skills(self, user_skills: List[str], job_skills: List[str],
+                       weights: Optional[Dict[str, float]] = None) -> Dict:
         """
         Compare user skills against job requirements
         
         Args:
             user_skills (List[str]): List of user's skills
             job_skills (List[str]): List of required job skills
+            weights (Optional[Dict[str, float]]): Importance of each job skill, e.g. from
+                skill_importance; skills without a weight count 0
             
         Returns:
-            Dict containing skill match analysis
+            Dict containing skill match analysis, with a weighted_match_percentage when
+            weights are given
         """
         user_skills_set = set(user_skills)
         job_skills_set = set(job_skills)
@@ -145,12 +245,19 @@ class SkillProcessor:
         # Calculate match percentage
         match_percentage = (len(matching_skills) / len(job_skills_set)) * 100 if job_skills_set else 0
         
-        return {
+        comparison = {
             'matching_skills': list(matching_skills),
             'missing_skills': list(missing_skills),
             'unique_skills': list(unique_skills),
             'match_percentage': round(match_percentage, 2)
         }
+        
+        if weights is not None:
+            total_weight = sum(weights.get(skill, 0.0) for skill in job_skills_set)
+            matched_weight = sum(weights.get(skill, 0.0) for skill in matching_skills)
+            comparison['weighted_match_percentage'] = round((matched_weight / total_weight) * 100, 2) if total_weight else 0
+        
+        return comparison
 
     def get_skill_frequency(self, skills_list: List[List[str]]) -> Dict[str, int]:
         """
@@ -160,7 +267,43 @@ class SkillProcessor:
             skills_list (List[List[str]]): List of skills from multiple job postings
             
         Returns:
-            Dict mapping skills to their frequency
+            Dict mapping skills to their frequency, aggregated like extract_skills_batch
         """
-        all_skills = [skill for skills in skills_list for skill in skills]
-        return dict(Counter(all_skills)) 
\ No newline at end of file
+        return _skill_frequency(skills_list)
+
+def _skill_frequency(document_skills: Iterable[List[str]]) -> Dict[str, int]:
+    """Aggregate per-document skill lists into a frequency table"""
+    return dict(Counter(skill for skills in document_skills for skill in skills))
+
+_batch_worker_processor: Optional[SkillProcessor] = None
+
+def _init_batch_worker(known_skills: Set[str], skill_synonyms: Dict[str, List[str]]):
+    """Compile the skill matcher once per batch worker process"""
+    global _batch_worker_processor
+    _batch_worker_processor = SkillProcessor()
+    _batch_worker_processor.known_skills = known_skills
+    _batch_worker_processor.skill_synonyms = skill_synonyms
+    _batch_worker_processor.rebuild_matcher()
+
+def _extract_batch_chunk(texts: List[str]) -> List[List[str]]:
+    """Extract skills from a chunk of documents inside a batch worker"""
+    return [_batch_worker_processor.extract_skills_from_text(text) for text in texts]
+
+_shared_processor: Optional[SkillProcessor] = None
+_shared_lock = threading.Lock()
+
+def get_skill_processor() -> SkillProcessor:
+    """
+    Get the process-wide shared skill processor
+    
+    Also usable as a FastAPI dependency.
+    
+    Returns:
+        SkillProcessor: Shared processor instance
+    """
+    global _shared_processor
+    if _shared_processor is None:
+        with _shared_lock:
+            if _shared_processor is None:
+                _shared_processor = SkillProcessor()
+    return _shared_processor
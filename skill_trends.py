@@ -0,0 +1,279 @@
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import math
+import logging
+
+from .models import JobPosting, JobRequirement, Skill, SkillTrend
+
+logger = logging.getLogger(__name__)
+
+# (normalized job title, day) a rollup row belongs to
+Bucket = Tuple[str, datetime]
+
+# Maximum number of buckets bound into one IN clause
+BUCKET_CHUNK = 200
+
+GRANULARITIES = ('day', 'week')
+
+def normalize_title(title: Optional[str]) -> str:
+    """
+    Normalize a job title the way rollups store it
+
+    Args:
+        title (Optional[str]): Job title
+
+    Returns:
+        str: Stripped, lowercase title
+    """
+    return (title or '').strip().lower()
+
+def _title_column():
+    """SQL expression for the normalized title of a posting"""
+    return func.lower(func.trim(JobPosting.title))
+
+def _day_column():
+    """SQL expression for the day a posting was first seen"""
+    return func.date(JobPosting.posted_date)
+
+def _as_day(value) -> datetime:
+    """Convert a SQL date (a string on SQLite, a date elsewhere) to midnight of that day"""
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d')
+
+def _aggregate(db: Session, condition) -> List[Dict]:
+    """Compute rollup rows for the postings matching a condition"""
+    title, day = _title_column(), _day_column()
+
+    totals = {
+        (row_title, _as_day(row_day)): count
+        for row_title, row_day, count in db.execute(
+            select(title, day, func.count(JobPosting.id))
+            .where(condition)
+            .group_by(title, day)
+        ).all()
+    }
+
+    frequencies = db.execute(
+        select(title, day, JobRequirement.skill_id, func.count(func.distinct(JobPosting.id)),
+               func.sum(func.coalesce(JobRequirement.importance_score, 1.0)))
+        .join(JobRequirement, JobRequirement.job_posting_id == JobPosting.id)
+        .where(condition)
+        .group_by(title, day, JobRequirement.skill_id)
+    ).all()
+
+    rows = []
+    for row_title, row_day, skill_id, frequency, importance_total in frequencies:
+        bucket_day = _as_day(row_day)
+        rows.append({
+            'job_title': row_title,
+            'date': bucket_day,
+            'skill_id': skill_id,
+            'frequency': frequency,
+            'total_postings': totals[(row_title, bucket_day)],
+            'importance_total': importance_total
+        })
+    return rows
+
+def rebuild_skill_trends(db: Session, since: Optional[datetime] = None) -> int:
+    """
+    Recompute the rollups of every day from a start date on
+
+    Args:
+        db (Session): Database session
+        since (Optional[datetime]): First day to recompute; None rebuilds everything
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    try:
+        if since is None:
+            condition = JobPosting.posted_date.isnot(None)
+            db.execute(delete(SkillTrend))
+        else:
+            since = datetime(since.year, since.month, since.day)
+            condition = JobPosting.posted_date >= since
+            db.execute(delete(SkillTrend).where(SkillTrend.date >= since))
+
+        rows = _aggregate(db, condition)
+        if rows:
+            db.execute(insert(SkillTrend), rows)
+        db.commit()
+        logger.info(f"Rebuilt {len(rows)} skill trend rollups" + (f" since {since.date()}" if since else ""))
+        return len(rows)
+    except Exception:
+        db.rollback()
+        raise
+
+def update_skill_trends(db: Session, posting_ids: Iterable[int]) -> int:
+    """
+    Incrementally refresh the rollups touched by newly ingested postings
+
+    Only the (title, day) buckets of the given postings are recomputed, so the cost
+    tracks the size of an ingestion rather than the size of the table.
+
+    Args:
+        db (Session): Database session
+        posting_ids (Iterable[int]): Ids of saved postings
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    posting_ids = sorted(set(posting_ids))
+    if not posting_ids:
+        return 0
+
+    try:
+        title, day = _title_column(), _day_column()
+        buckets: Set[Tuple[str, str]] = set()
+        for start in range(0, len(posting_ids), BUCKET_CHUNK):
+            buckets.update(db.execute(
+                select(title, day)
+                .where(JobPosting.id.in_(posting_ids[start:start + BUCKET_CHUNK]))
+                .where(JobPosting.posted_date.isnot(None))
+                .distinct()
+            ).all())
+
+        written = 0
+        buckets = sorted(buckets)
+        for start in range(0, len(buckets), BUCKET_CHUNK):
+            chunk = buckets[start:start + BUCKET_CHUNK]
+            db.execute(delete(SkillTrend).where(
+                tuple_(SkillTrend.job_title, SkillTrend.date).in_(
+                    [(bucket_title, _as_day(bucket_day)) for bucket_title, bucket_day in chunk]
+                )
+            ))
+            # Separate IN lists seek the (title, day) expression index where a row-value IN
+            # would walk all of it; buckets of the cross product outside the chunk are dropped
+            wanted = {(bucket_title, _as_day(bucket_day)) for bucket_title, bucket_day in chunk}
+            condition = title.in_({bucket_title for bucket_title, _ in chunk}) \
+                & day.in_({bucket_day for _, bucket_day in chunk})
+            rows = [row for row in _aggregate(db, condition) if (row['job_title'], row['date']) in wanted]
+            if rows:
+                db.execute(insert(SkillTrend), rows)
+            written += len(rows)
+        db.commit()
+        return written
+    except Exception:
+        db.rollback()
+        raise
+
+def query_skill_trends(db: Session, job_title: str, start_date: Optional[date] = None,
+                       end_date: Optional[date] = None, granularity: Optional[str] = None) -> Dict:
+    """
+    Answer a trends query from the rollups
+
+    Titles match when they contain the normalized query, e.g. 'python developer' also
+    covers 'senior python developer'.
+
+    Args:
+        db (Session): Database session
+        job_title (str): Job title to report on
+        start_date (Optional[date]): First day included
+        end_date (Optional[date]): Last day included
+        granularity (Optional[str]): 'day' or 'week' to add a per-period series
+
+    Returns:
+        Dict with the number of postings, per-skill frequencies and percentages, and the
+        series when a granularity was given
+    """
+    if granularity is not None and granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {GRANULARITIES}")
+
+    query = select(SkillTrend.job_title, SkillTrend.date, Skill.name, SkillTrend.frequency,
+                   SkillTrend.total_postings) \
+        .join(Skill, Skill.id == SkillTrend.skill_id) \
+        .where(SkillTrend.job_title.contains(normalize_title(job_title), autoescape=True))
+    if start_date is not None:
+        query = query.where(SkillTrend.date >= datetime(start_date.year, start_date.month, start_date.day))
+    if end_date is not None:
+        query = query.where(SkillTrend.date < datetime(end_date.year, end_date.month, end_date.day) + timedelta(days=1))
+
+    frequencies: Dict[str, int] = {}
+    bucket_totals: Dict[Bucket, int] = {}
+    series: Dict[Tuple[datetime, str], int] = {}
+    period_totals: Dict[datetime, Dict[Bucket, int]] = {}
+    for row_title, row_day, skill, frequency, total in db.execute(query).all():
+        frequencies[skill] = frequencies.get(skill, 0) + frequency
+        bucket_totals[(row_title, row_day)] = total
+        if granularity is not None:
+            period = row_day if granularity == 'day' else row_day - timedelta(days=row_day.weekday())
+            series[(period, skill)] = series.get((period, skill), 0) + frequency
+            period_totals.setdefault(period, {})[(row_title, row_day)] = total
+
+    total_postings = sum(bucket_totals.values())
+    result = {
+        'total_jobs': total_postings,
+        'skill_trends': [
+            {
+                'skill': skill,
+                'frequency': count,
+                'percentage': round((count / total_postings) * 100, 2)
+            }
+            for skill, count in sorted(frequencies.items(), key=lambda item: (-item[1], item[0]))
+        ]
+    }
+    if granularity is not None:
+        result['series'] = [
+            {
+                'period': period.date().isoformat(),
+                'skill': skill,
+                'frequency': count,
+                'percentage': round((count / sum(period_totals[period].values())) * 100, 2)
+            }
+            for (period, skill), count in sorted(series.items())
+        ]
+    return result
+
+def skill_importance(db: Session, job_title: str) -> Dict[str, float]:
+    """
+    Weigh the skills of a job title by how much its postings rely on them
+
+    Each skill's weight is a TF-IDF-style score computed from the rollups, so it follows
+    new postings as soon as their rollups are updated:
+
+    - document frequency: share of the title's postings requiring the skill
+    - position: average importance_score of those requirements, higher for skills
+      mentioned early in descriptions
+    - inverse document frequency: log((1 + all postings) / (1 + postings requiring the
+      skill)) + 1, so skills every posting asks for weigh less
+
+    Args:
+        db (Session): Database session
+        job_title (str): Job title, matched like query_skill_trends
+
+    Returns:
+        Dict mapping skills to weights scaled so the most important skill weighs 1.0
+    """
+    title_match = SkillTrend.job_title.contains(normalize_title(job_title), autoescape=True)
+
+    title_postings = sum(total for (total,) in db.execute(
+        select(func.max(SkillTrend.total_postings))
+        .where(title_match)
+        .group_by(SkillTrend.job_title, SkillTrend.date)
+    ).all())
+    if not title_postings:
+        return {}
+
+    corpus_postings = sum(total for (total,) in db.execute(
+        select(func.max(SkillTrend.total_postings)).group_by(SkillTrend.job_title, SkillTrend.date)
+    ).all())
+    corpus_frequency = dict(db.execute(
+        select(SkillTrend.skill_id, func.sum(SkillTrend.frequency)).group_by(SkillTrend.skill_id)
+    ).all())
+
+    scores = {}
+    for skill_id, skill, frequency, importance_total in db.execute(
+        select(SkillTrend.skill_id, Skill.name, func.sum(SkillTrend.frequency),
+               func.sum(func.coalesce(SkillTrend.importance_total, SkillTrend.frequency)))
+        .join(Skill, Skill.id == SkillTrend.skill_id)
+        .where(title_match)
+        .group_by(SkillTrend.skill_id, Skill.name)
+    ).all():
+        document_frequency = frequency / title_postings
+        position = importance_total / frequency
+        inverse_frequency = math.log((1 + corpus_postings) / (1 + corpus_frequency[skill_id])) + 1
+        scores[skill] = document_frequency * position * inverse_frequency
+
+    top = max(scores.values())
+    return {skill: round(score / top, 4) for skill, score in scores.items()}
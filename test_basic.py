@@ -1,15 +1,162 @@
 import os
 os.environ['DATABASE_URL'] = 'sqlite:///data/test/test.db'
 import unittest
+import asyncio
+import io
 import os
+import tempfile
+from datetime import datetime, timedelta
 from pathlib import Path
+import PyPDF2
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
 from src.scrapers.linkedin_scraper import LinkedInScraper
 from src.scrapers.job_scraper import JobScraper
+from src.scrapers.driver_pool import DriverCheckoutTimeout, DriverPool, driver_pool_size
+from src.scrapers.linkedin_session import LinkedInSessionStore
+from src.scrapers.waits import AdaptiveWaiter, WaitRecorder, text_changed
+from src.scrapers.job_sources import IndeedSource, JobSource, get_http_session
+from src.scrapers.scrape_cache import ScrapeCache
 from src.processors.pdf_parser import PDFParser
-from src.processors.skill_processor import SkillProcessor
-from src.database.database import init_db, drop_db, get_db
-from src.database.models import Profile, Skill, JobPosting
+from src.processors.skill_processor import SkillProcessor, get_skill_processor
+from src.processors.profile_cache import ProfileCache
+from src.processors.bulk_ingest import IngestionCheckpoint, _parse_source, ingest
+from src.processors.skill_matrix import SkillGapScorer
+from src.database.database import Base, PoolMetrics, create_db_engine, init_db, drop_db, get_db
+from src.database.models import Profile, Skill, JobPosting, JobRequirement, SkillTrend
+from src.database.repository import resolve_skill_ids, save_job_postings, save_profiles
+from src.database.skill_cache import SkillIdCache
+from src.database.skill_index import SkillIndex, ensure_skill_index, search_skill_index
+from src.database.skill_trends import query_skill_trends, rebuild_skill_trends, skill_importance, update_skill_trends
+from src.database.migrations import MIGRATIONS, migrate
+from src.utils.executors import BoundedExecutor, ExecutorBusyError
+from src.utils.analysis_queue import AnalysisQueue
 from unittest.mock import patch
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import sessionmaker
+
+def make_pdf(pages):
+    """Build PDF bytes with one page per text, one line per text line"""
+    writer = PyPDF2.PdfWriter()
+    font = DictionaryObject({
+        NameObject('/Type'): NameObject('/Font'),
+        NameObject('/Subtype'): NameObject('/Type1'),
+        NameObject('/BaseFont'): NameObject('/Helvetica')
+    })
+    for text in pages:
+        page = PyPDF2.PageObject.create_blank_page(width=612, height=792)
+        lines = ' '.join(f'({line}) Tj 0 -14 Td' for line in text.split('\n'))
+        contents = DecodedStreamObject()
+        contents.set_data(f'BT /F1 12 Tf 72 720 Td {lines} ET'.encode())
+        page[NameObject('/Contents')] = contents
+        page[NameObject('/Resources')] = DictionaryObject({
+            NameObject('/Font'): DictionaryObject({NameObject('/F1'): font})
+        })
+        writer.add_page(page)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+def crash_on_marked_pdf(ref):
+    """Ingestion worker that dies on PDFs named crash.pdf"""
+    if os.path.basename(ref[-1]) == 'crash.pdf':
+        os._exit(1)
+    return _parse_source(ref)
+
+class StubDriver:
+    """WebDriver stand-in for pool tests"""
+    
+    def __init__(self):
+        self.alive = True
+        self.heap_mb = 10
+        self.quit_called = False
+        self.url = 'about:blank'
+        self.cookies = []
+        self.local_storage = {}
+        self.elements = {}
+    
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("browser is gone")
+        return self.url
+    
+    def get(self, url):
+        self.url = url
+    
+    def find_elements(self, by, selector):
+        elements = self.elements.get(selector, [])
+        return elements() if callable(elements) else elements
+    
+    def get_cookies(self):
+        return list(self.cookies)
+    
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+    
+    def delete_all_cookies(self):
+        self.cookies = []
+    
+    def execute_script(self, script, *args):
+        if 'localStorage' in script:
+            if args:
+                self.local_storage = dict(args[0])
+            return dict(self.local_storage)
+        return self.heap_mb * 1024 * 1024
+    
+    def quit(self):
+        self.quit_called = True
+
+class StubSource(JobSource):
+    """Job source returning canned pages after a delay"""
+    
+    def __init__(self, name, delay, pages=2):
+        self.name = name
+        self.delay = delay
+        self.pages = pages
+    
+    def scrape_page(self, driver, job_title, location, page):
+        import time
+        time.sleep(self.delay)
+        if page >= self.pages:
+            return []
+        return [{'title': job_title, 'company': self.name, 'location': location,
+                 'description': 'Python and Docker', 'url': f'https://jobs.example/{page}/{index}'}
+                for index in range(2)]
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+def serve_fixtures():
+    """
+    Serve saved job board pages on localhost; paths under /blocked answer 403, under
+    /empty a results page without results and under /captcha a bot challenge
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith('/blocked'):
+                self.send_response(403)
+                self.end_headers()
+                return
+            fixture = 'indeed_results.html'
+            if self.path.startswith('/empty'):
+                fixture = 'indeed_no_results.html'
+            elif self.path.startswith('/captcha'):
+                fixture = 'indeed_captcha.html'
+            body = (FIXTURES / fixture).read_bytes()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
 
 class TestLinkedInSkillAnalysis(unittest.TestCase):
     @classmethod
@@ -51,6 +198,39 @@ class TestLinkedInSkillAnalysis(unittest.TestCase):
         
         self.assertTrue(all(skill in skills for skill in expected_skills))
 
+    def test_skill_matcher_word_boundaries(self):
+        """Test that skills only match on word boundaries and synonyms map to canonical names"""
+        text = "Built HTML pages in JavaScript, deployed with k8s and Amazon Web Services. Machine learning (ML)."
+        
+        skills = set(self.skill_processor.extract_skills_from_text(text))
+        
+        self.assertEqual(skills, {'javascript', 'kubernetes', 'aws', 'machine learning'})
+        self.assertNotIn('java', skills)
+
+    def test_shared_skill_processor(self):
+        """Test that the shared processor is reused and loads NLP models lazily"""
+        processor = get_skill_processor()
+        
+        self.assertIs(processor, get_skill_processor())
+        self.assertIs(PDFParser().skill_processor, processor)
+        self.assertIsNone(processor._nlp)
+        self.assertIn('python', processor.extract_skills_from_text('Python developer'))
+        self.assertIsNone(processor._nlp)
+
+    def test_skill_batch_extraction(self):
+        """Test batch extraction returns per-document skills and aggregated frequencies"""
+        texts = ["Python and Docker", "", "Docker, k8s and AWS"] * 100
+        
+        document_skills, frequency = self.skill_processor.extract_skills_batch(texts)
+        parallel_skills, parallel_frequency = self.skill_processor.extract_skills_batch(texts, workers=2)
+        
+        self.assertEqual(len(document_skills), len(texts))
+        self.assertEqual(set(document_skills[2]), {'docker', 'kubernetes', 'aws'})
+        self.assertEqual(document_skills[1], [])
+        self.assertEqual(frequency, {'python': 100, 'docker': 200, 'kubernetes': 100, 'aws': 100})
+        self.assertEqual([set(skills) for skills in parallel_skills], [set(skills) for skills in document_skills])
+        self.assertEqual(parallel_frequency, frequency)
+
     def test_skill_comparison(self):
         """Test skill comparison functionality"""
         user_skills = ['python', 'javascript', 'sql', 'aws']
@@ -109,6 +289,152 @@ class TestLinkedInSkillAnalysis(unittest.TestCase):
             self.assertIn('experience', profile_data)
             self.assertIn('education', profile_data)
 
+    def test_profile_cache(self):
+        """Test the LRU and on-disk tiers of the profile cache"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ProfileCache(max_entries=1, cache_dir=cache_dir)
+            cache.put('a', {'name': 'A'})
+            cache.put('b', {'name': 'B'})
+            
+            # 'a' was evicted from memory but is still on disk
+            self.assertEqual(cache.get('a'), {'name': 'A'})
+            self.assertEqual(cache.get('a'), {'name': 'A'})
+            self.assertIsNone(cache.get('missing'))
+            
+            stats = cache.stats()
+            self.assertEqual(stats['disk_hits'], 1)
+            self.assertEqual(stats['memory_hits'], 1)
+            self.assertEqual(stats['misses'], 1)
+            
+            # Cached values are copies
+            cache.get('a')['name'] = 'changed'
+            self.assertEqual(cache.get('a'), {'name': 'A'})
+
+        # Overwrites and expired reads keep the tracked disk size accurate
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ProfileCache(max_entries=1, cache_dir=cache_dir, ttl_seconds=60)
+            for _ in range(3):
+                cache.put('a', {'name': 'A'})
+            cache.put('b', {'name': 'B'})
+            self.assertEqual(cache.stats()['disk_bytes'],
+                             sum(path.stat().st_size for path in Path(cache_dir).glob('*.json')))
+
+            # 'a' is only on disk now; expire it there
+            expired = datetime.now().timestamp() - 120
+            os.utime(Path(cache_dir) / 'a.json', (expired, expired))
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.stats()['disk_bytes'], (Path(cache_dir) / 'b.json').stat().st_size)
+
+    def test_pdf_parser_cache(self):
+        """Test that re-parsing the same PDF is answered from the cache"""
+        writer = PyPDF2.PdfWriter()
+        writer.add_blank_page(width=612, height=792)
+        pdf_path = "data/test/blank_profile.pdf"
+        with open(pdf_path, "wb") as f:
+            writer.write(f)
+        
+        parser = PDFParser(cache=ProfileCache())
+        try:
+            first = parser.parse_profile_pdf(pdf_path)
+            second = parser.parse_profile_pdf(pdf_path)
+        finally:
+            os.remove(pdf_path)
+        
+        self.assertEqual(first, second)
+        self.assertEqual(parser.cache.stats()['misses'], 1)
+        self.assertEqual(parser.cache.stats()['hits'], 1)
+
+    def test_pdf_section_segmenter(self):
+        """Test that profile sections are segmented from the document text"""
+        text = "\n".join([
+            "Jane Doe",
+            "Backend Engineer",
+            "Austin, Texas",
+            "About",
+            "I build APIs in Python.",
+            "Experience",
+            "Engineer",
+            "Acme Corp",
+            "January 2020 - Present",
+            "Built services with Docker and AWS.",
+            "Education",
+            "State University",
+            "BSc Computer Science",
+            "Skills",
+            "Python, Kubernetes"
+        ])
+        
+        profile = self.pdf_parser.parse_profile_text(text)
+        
+        self.assertEqual(profile['name'], "Jane Doe")
+        self.assertEqual(profile['headline'], "Backend Engineer")
+        self.assertEqual(profile['about'], "I build APIs in Python")
+        self.assertEqual(set(profile['skills']), {'python', 'kubernetes'})
+        self.assertEqual(profile['experience'][0]['title'], "Engineer")
+        self.assertEqual(profile['experience'][0]['company'], "Acme Corp")
+        self.assertEqual(profile['education'][0]['school'], "State University")
+
+    def test_pdf_parser_in_memory_sources(self):
+        """Test parsing PDFs from bytes, memoryviews and file-like objects"""
+        writer = PyPDF2.PdfWriter()
+        writer.add_blank_page(width=612, height=792)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        data = buffer.getvalue()
+        
+        parser = PDFParser(cache=ProfileCache())
+        results = [
+            parser.parse_profile_pdf(data),
+            parser.parse_profile_pdf(memoryview(bytearray(data))),
+            parser.parse_profile_pdf(io.BytesIO(data))
+        ]
+        
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(parser.cache.stats()['hits'], 2)
+
+    def test_pdf_page_streaming(self):
+        """Test early exit once requested sections are complete, and parallel page extraction"""
+        data = make_pdf([
+            "Jane Doe\nEngineer\nAbout\nI build APIs in Python",
+            "Experience\nAcme Corp",
+            "Education\nState University"
+        ])
+        
+        parser = PDFParser(cache=ProfileCache())
+        pages_read = []
+        iter_page_text = parser._iter_page_text
+        def counting_iter(reader):
+            for text in iter_page_text(reader):
+                pages_read.append(text)
+                yield text
+        parser._iter_page_text = counting_iter
+        
+        profile = parser.parse_profile_pdf(data, sections=['name', 'about'])
+        self.assertEqual(profile['about'], "I build APIs in Python")
+        self.assertEqual(len(pages_read), 2)
+        # One cold partial parse is one miss; a repeat is one hit
+        self.assertEqual(parser.parse_profile_pdf(data, sections=['name', 'about']), profile)
+        self.assertEqual(parser.cache.stats()['misses'], 1)
+        self.assertEqual(parser.cache.stats()['hits'], 1)
+        
+        serial = PDFParser(cache=ProfileCache()).parse_profile_pdf(data)
+        with patch('src.processors.pdf_parser.PARALLEL_PAGE_THRESHOLD', 2):
+            parallel = PDFParser(cache=ProfileCache(), page_workers=2).parse_profile_pdf(data)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(serial['education'][0]['school'], "State University")
+
+    def test_upload_size_limit(self):
+        """Test that uploads are read in memory and the size limit is enforced while streaming"""
+        from fastapi import HTTPException, UploadFile
+        from src.main import read_upload
+        
+        content = asyncio.run(read_upload(UploadFile(io.BytesIO(b'%PDF' * 10)), max_bytes=100))
+        self.assertEqual(bytes(content), b'%PDF' * 10)
+        
+        with self.assertRaises(HTTPException) as context:
+            asyncio.run(read_upload(UploadFile(io.BytesIO(b'x' * 1000)), max_bytes=100))
+        self.assertEqual(context.exception.status_code, 413)
+
     def test_database_operations(self):
         """Test database operations"""
         # Ensure tables exist
@@ -139,5 +465,971 @@ class TestLinkedInSkillAnalysis(unittest.TestCase):
         finally:
             db.close()
 
+    def test_bulk_job_persistence(self):
+        """Test saving job postings and requirements in bulk"""
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{directory}/jobs.db")
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            try:
+                existing = resolve_skill_ids(db, ['python'])
+                jobs = [{
+                    'title': 'Python Developer',
+                    'company': f'Company {index}',
+                    'location': 'Remote',
+                    'description': 'Python and Docker',
+                    'url': f'https://example.com/jobs/{index}',
+                    'skills': ['python', 'docker']
+                } for index in range(3)]
+                
+                posting_ids = save_job_postings(db, jobs)
+                
+                self.assertEqual(len(posting_ids), 3)
+                self.assertEqual(db.query(JobPosting).count(), 3)
+                self.assertEqual(db.query(JobRequirement).count(), 6)
+                self.assertEqual(db.query(Skill).count(), 2)
+                self.assertEqual(resolve_skill_ids(db, ['python'])['python'], existing['python'])
+            finally:
+                db.close()
+                engine.dispose()
+
+    def test_skill_id_cache(self):
+        """Test that skill ids are written through on commit and served without queries"""
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{directory}/skills.db")
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            cache = SkillIdCache()
+            try:
+                resolve_skill_ids(db, ['Docker'], cache=cache)
+                db.rollback()
+                self.assertEqual(cache.stats()['entries'], 0)
+                
+                skill_ids = resolve_skill_ids(db, ['python', 'Docker '], cache=cache)
+                db.commit()
+                self.assertEqual(cache.stats()['entries'], 2)
+                
+                statements = []
+                event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+                self.assertEqual(resolve_skill_ids(db, ['Python', 'docker'], cache=cache),
+                                 {'Python': skill_ids['python'], 'docker': skill_ids['Docker ']})
+                self.assertEqual(statements, [])
+                
+                warm_cache = SkillIdCache()
+                self.assertEqual(warm_cache.warm(db), 2)
+                self.assertEqual(warm_cache.get_many(['python'])[0], {'python': skill_ids['python']})
+            finally:
+                db.close()
+                engine.dispose()
+
+    def test_bulk_ingest(self):
+        """Test bulk ingestion of a directory of PDFs with a resumable checkpoint"""
+        with tempfile.TemporaryDirectory() as corpus:
+            engine = create_engine(f"sqlite:///{corpus}/ingest.db")
+            Base.metadata.create_all(bind=engine)
+            session_factory = sessionmaker(bind=engine)
+            
+            for index in range(3):
+                with open(os.path.join(corpus, f"profile_{index}.pdf"), "wb") as f:
+                    f.write(make_pdf([f"Bulk User {index}\nEngineer\nAbout\nPython and AWS"]))
+            with open(os.path.join(corpus, "broken.pdf"), "wb") as f:
+                f.write(b"not a pdf")
+            checkpoint = os.path.join(corpus, "ingest.ckpt")
+            
+            # A run killed after committing a batch but before checkpointing it...
+            with patch.object(IngestionCheckpoint, 'mark_done', side_effect=RuntimeError('killed')):
+                with self.assertRaises(RuntimeError):
+                    ingest(corpus, workers=2, batch_size=2, checkpoint_path=checkpoint,
+                           session_factory=session_factory)
+            
+            # ...parses that batch again on resume without storing it twice
+            report = ingest(corpus, workers=2, batch_size=2, checkpoint_path=checkpoint,
+                            session_factory=session_factory)
+            self.assertEqual(report['documents'], 3)
+            self.assertEqual(report['failed'], 1)
+            
+            # Failed documents are retried on resume and settled once they succeed
+            resumed = ingest(corpus, workers=2, checkpoint_path=checkpoint, session_factory=session_factory)
+            self.assertEqual((resumed['skipped'], resumed['failed']), (3, 1))
+            self.assertEqual(resumed['documents'], 0)
+            
+            with open(os.path.join(corpus, "broken.pdf"), "wb") as f:
+                f.write(make_pdf(["Fixed User\nEngineer\nAbout\nPython"]))
+            resumed = ingest(corpus, workers=2, checkpoint_path=checkpoint, session_factory=session_factory)
+            self.assertEqual((resumed['skipped'], resumed['documents']), (3, 1))
+            resumed = ingest(corpus, workers=2, checkpoint_path=checkpoint, session_factory=session_factory)
+            self.assertEqual((resumed['skipped'], resumed['documents']), (4, 0))
+            
+            db = session_factory()
+            try:
+                self.assertEqual(db.query(Profile).count(), 4)
+                profile = db.query(Profile).filter_by(name="Bulk User 1").one()
+                self.assertEqual({skill.name for skill in profile.skills}, {'python', 'aws'})
+            finally:
+                db.close()
+                engine.dispose()
+        
+        # A crashed worker fails the documents it held instead of aborting the run
+        with tempfile.TemporaryDirectory() as corpus:
+            engine = create_engine(f"sqlite:///{corpus}/ingest.db")
+            Base.metadata.create_all(bind=engine)
+            session_factory = sessionmaker(bind=engine)
+            
+            for name in ("a.pdf", "b.pdf", "crash.pdf", "d.pdf", "e.pdf"):
+                with open(os.path.join(corpus, name), "wb") as f:
+                    f.write(make_pdf([f"User {name}\nEngineer\nAbout\nPython"]))
+            checkpoint = os.path.join(corpus, "ingest.ckpt")
+            
+            with patch('src.processors.bulk_ingest._parse_source', crash_on_marked_pdf):
+                report = ingest(corpus, workers=1, max_in_flight=1, checkpoint_path=checkpoint,
+                                session_factory=session_factory)
+            self.assertEqual((report['documents'], report['failed']), (4, 1))
+            
+            resumed = ingest(corpus, workers=1, checkpoint_path=checkpoint, session_factory=session_factory)
+            self.assertEqual((resumed['skipped'], resumed['documents']), (4, 1))
+            
+            db = session_factory()
+            try:
+                self.assertEqual(db.query(Profile).count(), 5)
+            finally:
+                db.close()
+                engine.dispose()
+
+    def test_bounded_executor(self):
+        """Test blocking calls run off the event loop with bounded concurrency and queueing"""
+        import time
+        executor = BoundedExecutor('test', max_workers=2, max_queue=1)
+        
+        async def run():
+            ticks = 0
+            
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+            
+            ticker = asyncio.ensure_future(tick())
+            calls = [asyncio.ensure_future(executor.run(time.sleep, 0.2)) for _ in range(3)]
+            await asyncio.sleep(0)
+            with self.assertRaises(ExecutorBusyError):
+                await executor.run(time.sleep, 0)
+            start = time.perf_counter()
+            await asyncio.gather(*calls)
+            elapsed = time.perf_counter() - start
+            ticker.cancel()
+            return ticks, elapsed
+        
+        try:
+            ticks, elapsed = asyncio.run(run())
+            # Two workers run the three calls in two rounds while the loop keeps ticking
+            self.assertGreater(ticks, 10)
+            self.assertLess(elapsed, 0.6)
+            stats = executor.stats()
+            self.assertEqual(stats['completed'], 3)
+            self.assertEqual(stats['rejected'], 1)
+            self.assertEqual(stats['active'] + stats['waiting'], 0)
+        finally:
+            executor.shutdown()
+        
+        # A call cancelled while queued gives its slot back
+        import threading
+        executor = BoundedExecutor('test', max_workers=1, max_queue=1)
+        release = threading.Event()
+        
+        async def cancel_queued():
+            running = asyncio.ensure_future(executor.run(release.wait))
+            queued = asyncio.ensure_future(executor.run(time.sleep, 0))
+            await asyncio.sleep(0.05)
+            queued.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await queued
+            self.assertEqual(executor.stats()['waiting'], 0)
+            release.set()
+            await running
+            # Both slots are free again
+            await asyncio.gather(executor.run(time.sleep, 0), executor.run(time.sleep, 0))
+        
+        try:
+            asyncio.run(cancel_queued())
+            stats = executor.stats()
+            self.assertEqual(stats['active'] + stats['waiting'], 0)
+            self.assertEqual(stats['completed'], 3)
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_driver_pool(self):
+        """Test pooled drivers are reused, health checked, recycled and time out"""
+        created = []
+        
+        def factory():
+            created.append(StubDriver())
+            return created[-1]
+        
+        pool = DriverPool(factory, size=1, max_uses=3, max_memory_mb=100, checkout_timeout=0.1)
+        
+        # Scrapers borrow lazily and give the driver back on close
+        scraper = LinkedInScraper(driver_pool=pool)
+        self.assertEqual(created, [])
+        scraper.setup_driver()
+        self.assertEqual(pool.stats()['borrowed'], 1)
+        with self.assertRaises(DriverCheckoutTimeout):
+            pool.checkout()
+        scraper.close()
+        
+        # Reused until max_uses, then recycled
+        for _ in range(2):
+            with pool.driver() as driver:
+                self.assertIs(driver, created[0])
+        self.assertTrue(created[0].quit_called)
+        
+        # Unresponsive idle drivers are replaced on checkout
+        with pool.driver() as driver:
+            self.assertIs(driver, created[1])
+        created[1].alive = False
+        with pool.driver() as driver:
+            self.assertIs(driver, created[2])
+            # Over the memory threshold: recycled on checkin
+            driver.heap_mb = 200
+        self.assertTrue(created[2].quit_called)
+        
+        stats = pool.stats()
+        self.assertEqual(stats['created'], 3)
+        self.assertEqual(stats['recycled'], 2)
+        self.assertEqual(stats['unhealthy'], 1)
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertEqual(stats['live'], 0)
+        pool.close()
+        
+        # Page fan-out defaults to one worker per pooled driver
+        from src.scrapers.job_sources import _fanout_workers
+        for env, workers in (({}, 2), ({'BROWSER_POOL_SIZE': '3'}, 3), ({'DRIVER_POOL_SIZE': '5'}, 5),
+                             ({'DRIVER_POOL_SIZE': '5', 'JOB_FANOUT_WORKERS': '8'}, 8)):
+            with patch.dict(os.environ, env):
+                for name in {'BROWSER_POOL_SIZE', 'DRIVER_POOL_SIZE', 'JOB_FANOUT_WORKERS'} - env.keys():
+                    os.environ.pop(name, None)
+                self.assertEqual(_fanout_workers(), workers)
+                if 'JOB_FANOUT_WORKERS' not in env:
+                    self.assertEqual(driver_pool_size(), workers)
+
+    def test_linkedin_session_reuse(self):
+        """Test a captured LinkedIn session is replayed into other drivers and re-logins are single-flighted"""
+        import threading
+        import time
+        logins = []
+        
+        def login_into(driver):
+            def login():
+                time.sleep(0.05)
+                logins.append(driver)
+                driver.cookies = [{'name': 'li_at', 'value': f'token{len(logins)}', 'expiry': 1.9e9}]
+                driver.local_storage = {'voyager': 'state'}
+                return True
+            return login
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'session.json')
+            store = LinkedInSessionStore(path)
+            first, second = StubDriver(), StubDriver()
+            
+            self.assertTrue(store.ensure(first, login_into(first)))
+            self.assertTrue(store.ensure(second, login_into(second)))
+            self.assertEqual(logins, [first])
+            self.assertEqual(second.cookies[0]['value'], 'token1')
+            self.assertEqual(second.local_storage, {'voyager': 'state'})
+            
+            # Expiry is detected from the redirect; concurrent refreshes log in once
+            second.url = 'https://www.linkedin.com/authwall?trk=profile'
+            self.assertTrue(store.is_expired(second))
+            drivers = [StubDriver() for _ in range(4)]
+            threads = [threading.Thread(target=store.refresh, args=(driver, login_into(driver), 1))
+                       for driver in drivers]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len(logins), 2)
+            self.assertEqual(store.generation, 2)
+            self.assertTrue(all(driver.cookies[0]['value'] == 'token2' for driver in drivers))
+            
+            # The session survives a restart
+            restored = LinkedInSessionStore(path)
+            third = StubDriver()
+            self.assertTrue(restored.ensure(third, login_into(third)))
+            self.assertEqual(len(logins), 2)
+            self.assertEqual(third.cookies[0], {'name': 'li_at', 'value': 'token2', 'expiry': 1900000000})
+
+    def test_adaptive_waits(self):
+        """Test waits return as soon as the DOM is ready and record their durations"""
+        import time
+        from types import SimpleNamespace
+        driver = StubDriver()
+        recorder = WaitRecorder()
+        waiter = AdaptiveWaiter(driver, 'indeed', timeout=2, poll_frequency=0.02, recorder=recorder)
+        
+        # Cards render in three batches, then the count settles
+        started = time.monotonic()
+        driver.elements['.card'] = lambda: [object()] * min(3, int((time.monotonic() - started) / 0.05) + 1)
+        self.assertEqual(waiter.results_loaded('.card', settle=0.1), 3)
+        self.assertLess(time.monotonic() - started, 1)
+        
+        # A clicked card replaces the description text
+        driver.elements['.description'] = [SimpleNamespace(text='Second job')]
+        self.assertEqual(waiter.until(text_changed('.description', 'First job'), 'description'), 'Second job')
+        
+        # Missing results give up after the timeout instead of failing the scrape
+        impatient = AdaptiveWaiter(driver, 'indeed', timeout=0.1, poll_frequency=0.02, recorder=recorder)
+        self.assertEqual(impatient.results_loaded('.missing', 'empty'), 0)
+        
+        stats = recorder.stats()
+        self.assertEqual(stats['indeed.results']['count'], 1)
+        self.assertEqual(stats['indeed.results']['timeouts'], 0)
+        self.assertEqual(stats['indeed.empty']['timeouts'], 1)
+        self.assertGreaterEqual(stats['indeed.empty']['max_seconds'], 0.1)
+
+    def test_job_source_fanout(self):
+        """Test sources and pages scrape in parallel, merge without duplicates and honour the deadline"""
+        import time
+        pool = DriverPool(StubDriver, size=4)
+        scraper = JobScraper(driver_pool=pool, sources=[StubSource('fast', 0.1), StubSource('also-fast', 0.1)])
+        
+        started = time.monotonic()
+        jobs = scraper.scrape_jobs('Engineer', 'Remote', max_pages=2)
+        self.assertLess(time.monotonic() - started, 0.35)
+        # Both sources post the same URLs; duplicates are merged away
+        self.assertEqual(len(jobs), 4)
+        self.assertEqual(set(jobs[0]['skills']), {'python', 'docker'})
+        
+        started = time.monotonic()
+        jobs = scraper.scrape_jobs('Engineer', max_pages=2, deadline_seconds=0.5,
+                                   sources=[StubSource('fast', 0.05), StubSource('slow', 2)])
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual({job['company'] for job in jobs}, {'fast'})
+        pool.close()
+
+    def test_static_job_pages(self):
+        """Test server-rendered job pages are parsed without a browser, with a browser fallback"""
+        server = serve_fixtures()
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        
+        class BrowserFallbackSource(IndeedSource):
+            def scrape_page(self, driver, job_title, location, page):
+                return [{'title': 'From browser', 'company': '', 'location': '', 'description': '',
+                         'url': 'https://jobs.example/browser'}]
+        
+        try:
+            jobs = IndeedSource(base_url).scrape_page_static(get_http_session(), 'Python Developer', 'San Francisco', 0)
+            self.assertEqual(len(jobs), 3)
+            self.assertEqual(jobs[0]['title'], 'Senior Python Developer')
+            self.assertEqual(jobs[0]['company'], 'Acme Analytics')
+            self.assertEqual(jobs[0]['location'], 'San Francisco CA 94105')
+            self.assertIn('Kubernetes on AWS', jobs[0]['description'])
+            self.assertEqual(jobs[0]['url'], f'{base_url}/rc/clk?jk=1a2b3c4d5e6f7a8b&from=serp')
+            self.assertEqual(jobs[1]['url'], 'https://www.indeed.com/viewjob?jk=9f8e7d6c5b4a3f2e')
+            
+            # No browser is launched for static pages; blocked pages fall back to one
+            pool = DriverPool(StubDriver, size=1)
+            scraper = JobScraper(driver_pool=pool)
+            jobs = scraper.scrape_jobs('Python Developer', max_pages=1, sources=[IndeedSource(base_url)])
+            self.assertEqual(set(jobs[0]['skills']), {'python', 'django', 'docker', 'kubernetes', 'aws'})
+            self.assertEqual(pool.stats()['created'], 0)
+            
+            jobs = scraper.scrape_jobs('Python Developer', max_pages=1,
+                                       sources=[BrowserFallbackSource(f'{base_url}/blocked')])
+            self.assertEqual([job['title'] for job in jobs], ['From browser'])
+            self.assertEqual(pool.stats()['created'], 1)
+            
+            # A results page without results is empty, not blocked; an unknown page is blocked
+            session = get_http_session()
+            self.assertEqual(IndeedSource(f'{base_url}/empty').scrape_page_static(session, 'Cobol Astronaut', '', 0), [])
+            self.assertIsNone(IndeedSource(f'{base_url}/captcha').scrape_page_static(session, 'Python Developer', '', 0))
+            jobs = scraper.scrape_jobs('Cobol Astronaut', max_pages=1, sources=[BrowserFallbackSource(f'{base_url}/empty')])
+            self.assertEqual(jobs, [])
+            self.assertEqual(pool.stats()['checkouts'], 1)
+            pool.close()
+        finally:
+            server.shutdown()
+
+    def test_scrape_cache(self):
+        """Test cached pages are single-flighted, served stale while refreshing and persisted"""
+        import threading
+        import time
+        scrapes = []
+        
+        def scrape():
+            time.sleep(0.1)
+            scrapes.append(1)
+            return [{'title': 'Engineer', 'url': f'https://jobs.example/{len(scrapes)}'}]
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{directory}/cache.db", connect_args={'check_same_thread': False})
+            Base.metadata.create_all(bind=engine)
+            session_factory = sessionmaker(bind=engine)
+            cache = ScrapeCache(session_factory, ttl_seconds=3600)
+            key = cache.key_for('indeed', '  Software  Engineer ', 'Remote', 0)
+            self.assertEqual(key, ('indeed', 'software engineer', 'remote', 0))
+            
+            # Concurrent identical requests share one scrape
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(cache.get_or_scrape(key, scrape)))
+                       for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len(scrapes), 1)
+            self.assertTrue(all(result == results[0] for result in results))
+            self.assertEqual(cache.get_or_scrape(key, scrape), results[0])
+            self.assertEqual(len(scrapes), 1)
+            
+            # A stale page is served immediately and refreshed in the background
+            stale_cache = ScrapeCache(session_factory, ttl_seconds=0, stale_seconds=3600)
+            self.assertEqual(stale_cache.get_or_scrape(key, scrape)[0]['url'], 'https://jobs.example/1')
+            for _ in range(50):
+                if stale_cache.stats()['in_flight'] == 0 and len(scrapes) == 2:
+                    break
+                time.sleep(0.05)
+            self.assertEqual(len(scrapes), 2)
+            self.assertEqual(cache.get_or_scrape(key, scrape)[0]['url'], 'https://jobs.example/2')
+            
+            self.assertEqual(cache.stats()['coalesced'], 4)
+            self.assertEqual(stale_cache.stats()['stale_hits'], 1)
+            engine.dispose()
+
+    def test_scrape_cache_copies_and_empty_pages(self):
+        """Test coalesced callers get their own copies and empty pages are cached briefly"""
+        import threading
+        import time
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{directory}/cache.db", connect_args={'check_same_thread': False})
+            Base.metadata.create_all(bind=engine)
+            session_factory = sessionmaker(bind=engine)
+            cache = ScrapeCache(session_factory, ttl_seconds=3600, empty_ttl_seconds=0)
+            
+            def scrape():
+                time.sleep(0.1)
+                return [{'title': 'Engineer', 'url': 'https://jobs.example/1'}]
+            
+            key = cache.key_for('indeed', 'engineer', None, 0)
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(cache.get_or_scrape(key, scrape)))
+                       for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(cache.stats()['coalesced'], 2)
+            results[0][0]['skills'] = ['python']
+            self.assertNotIn('skills', results[1][0])
+            self.assertNotIn('skills', results[2][0])
+            
+            # An empty scrape expires at once and is scraped again
+            scrapes = []
+            empty_key = cache.key_for('indeed', 'blocked', None, 0)
+            self.assertEqual(cache.get_or_scrape(empty_key, lambda: scrapes.append(1) or []), [])
+            self.assertEqual(cache.get_or_scrape(empty_key, lambda: scrapes.append(1) or []), [])
+            self.assertEqual(len(scrapes), 2)
+            
+            # An empty refresh does not replace a good page
+            stale_cache = ScrapeCache(session_factory, ttl_seconds=0, stale_seconds=3600)
+            
+            def wait_for_refresh():
+                for _ in range(50):
+                    if stale_cache.stats()['in_flight'] == 0:
+                        break
+                    time.sleep(0.05)
+            
+            self.assertEqual(len(stale_cache.get_or_scrape(key, lambda: [])), 1)
+            wait_for_refresh()
+            self.assertEqual(stale_cache.get_or_scrape(key, lambda: [])[0]['url'], 'https://jobs.example/1')
+            # Let the second background refresh finish before the database is removed
+            wait_for_refresh()
+            engine.dispose()
+
+    def test_incremental_job_ingestion(self):
+        """Test re-scraped postings are deduplicated by URL and only changed ones re-extracted"""
+        extracted = []
+        
+        def extract_skills(descriptions):
+            extracted.extend(descriptions)
+            return self.skill_processor.extract_skills_batch(descriptions)[0]
+        
+        def job(index, description='Python and Docker', url=True):
+            return {'title': 'Engineer', 'company': f'Company {index}', 'location': 'Remote',
+                    'description': description, 'url': f'https://example.com/jobs/{index}' if url else ''}
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{directory}/jobs.db")
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            try:
+                first = [job(0), job(1), job(1), job(2, url=False), job(3, url=False)]
+                ids = save_job_postings(db, first, extract_skills)
+                self.assertEqual(len(extracted), 4)
+                self.assertEqual(ids[1], ids[2])
+                self.assertEqual(set(first[2]['skills']), {'python', 'docker'})
+                self.assertEqual(db.query(JobPosting).count(), 4)
+                first_seen = db.query(JobPosting).filter_by(url='https://example.com/jobs/0').one().last_seen_at
+                
+                extracted.clear()
+                refresh = [job(0), job(1, 'Kubernetes on AWS'), job(4)]
+                refreshed_ids = save_job_postings(db, refresh, extract_skills)
+                self.assertEqual(sorted(extracted), ['Kubernetes on AWS', 'Python and Docker'])
+                self.assertEqual(refreshed_ids[:2], ids[:2])
+                self.assertEqual(set(refresh[0]['skills']), {'python', 'docker'})
+                self.assertEqual(db.query(JobPosting).count(), 5)
+                
+                changed = db.get(JobPosting, ids[1])
+                self.assertEqual({requirement.skill.name for requirement in changed.requirements},
+                                 {'kubernetes', 'aws'})
+                unchanged = db.get(JobPosting, ids[0])
+                self.assertGreater(unchanged.last_seen_at, first_seen)
+                self.assertEqual(len(unchanged.requirements), 2)
+            finally:
+                db.close()
+                engine.dispose()
+
+    def test_concurrent_job_ingestion(self):
+        """Test two saves racing to insert the same new posting both succeed with one row"""
+        import threading
+        from src.database import repository
+        
+        lookup = repository._known_postings
+        barrier = threading.Barrier(2)
+        waited = threading.local()
+        
+        def racing_lookup(db, urls):
+            # Both saves classify the posting as new before either inserts it
+            known = lookup(db, urls)
+            if not getattr(waited, 'done', False):
+                waited.done = True
+                barrier.wait(5)
+            return known
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{directory}/race.db", connect_args={'check_same_thread': False})
+            Base.metadata.create_all(bind=engine)
+            session_factory = sessionmaker(bind=engine)
+            results = []
+            
+            def save(description):
+                db = session_factory()
+                try:
+                    job = {'title': 'Engineer', 'company': 'Acme', 'location': 'Remote',
+                           'description': description, 'url': 'https://example.com/jobs/race'}
+                    results.append(save_job_postings(db, [job], lambda descriptions: [['python']] * len(descriptions)))
+                except Exception as e:
+                    results.append(e)
+                finally:
+                    db.close()
+            
+            with patch.object(repository, '_known_postings', racing_lookup):
+                threads = [threading.Thread(target=save, args=(description,)) for description in ('First', 'Second')]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            
+            self.assertEqual(len(results), 2)
+            self.assertTrue(all(isinstance(result, list) for result in results), results)
+            self.assertEqual(results[0], results[1])
+            db = session_factory()
+            try:
+                self.assertEqual(db.query(JobPosting).count(), 1)
+                self.assertEqual(db.query(JobRequirement).count(), 1)
+            finally:
+                db.close()
+            engine.dispose()
+
+    def test_skill_trend_rollups(self):
+        """Test skill trends are rolled up by title and day and refreshed incrementally"""
+        extract_skills = lambda descriptions: self.skill_processor.extract_skills_batch(descriptions)[0]
+        
+        def job(index, title='Python Developer', description='Python and Docker'):
+            return {'title': title, 'company': f'Company {index}', 'location': 'Remote',
+                    'description': description, 'url': f'https://example.com/jobs/{index}'}
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{directory}/trends.db")
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            try:
+                save_job_postings(db, [job(0), job(1, 'Senior python developer ', 'Python and AWS'),
+                                       job(2, 'Data Analyst', 'SQL')], extract_skills)
+                yesterday = datetime.utcnow() - timedelta(days=1)
+                db.query(JobPosting).filter_by(url='https://example.com/jobs/0').update({'posted_date': yesterday})
+                db.commit()
+                self.assertEqual(rebuild_skill_trends(db), 5)
+                
+                trends = query_skill_trends(db, 'python developer')
+                self.assertEqual(trends['total_jobs'], 2)
+                self.assertEqual(trends['skill_trends'][0], {'skill': 'python', 'frequency': 2, 'percentage': 100.0})
+                
+                today = query_skill_trends(db, 'Python Developer', start_date=datetime.utcnow().date(),
+                                           granularity='day')
+                self.assertEqual(today['total_jobs'], 1)
+                self.assertEqual({row['skill'] for row in today['series']}, {'python', 'aws'})
+                
+                ids = save_job_postings(db, [job(3, 'python developer', 'Python and Kubernetes')], extract_skills)
+                update_skill_trends(db, ids)
+                trends = query_skill_trends(db, 'python developer', granularity='week')
+                self.assertEqual(trends['total_jobs'], 3)
+                self.assertEqual(trends['skill_trends'][0], {'skill': 'python', 'frequency': 3, 'percentage': 100.0})
+                self.assertEqual(db.query(SkillTrend).filter_by(job_title='python developer').count(), 4)
+            finally:
+                db.close()
+                engine.dispose()
+
+    def test_analysis_queue(self):
+        """Test queued analyses report progress, retry, cancel and survive restarts"""
+        import threading
+        import time
+        
+        attempts = []
+        release = threading.Event()
+        
+        def flaky(params, context):
+            attempts.append(context.attempt)
+            if context.attempt < 2:
+                raise RuntimeError('site unavailable')
+            context.report({'pages': 1})
+            return {'total': params['n'] * 2}
+        
+        def slow(params, context):
+            context.report({'pages': 1})
+            while not release.wait(0.01):
+                context.check_cancelled()
+            return {}
+        
+        def wait_for(queue, job_id, status, reported=False):
+            for _ in range(500):
+                job = queue.get(job_id)
+                if job['status'] == status and (not reported or job['partial_result']):
+                    return job
+                time.sleep(0.01)
+            self.fail(f"{job_id} stuck in {job['status']}")
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{directory}/queue.db", connect_args={"check_same_thread": False})
+            Base.metadata.create_all(bind=engine)
+            session_factory = sessionmaker(bind=engine)
+            
+            queue = AnalysisQueue(session_factory, workers=1, retry_backoff=0.01, poll_interval=0.01)
+            queue.register('flaky', flaky)
+            queue.register('slow', slow)
+            queue.start()
+            try:
+                job_id = queue.submit('flaky', {'n': 21})
+                job = wait_for(queue, job_id, 'succeeded')
+                self.assertEqual(attempts, [1, 2])
+                self.assertEqual(job['result'], {'total': 42})
+                self.assertEqual(job['partial_result'], {'pages': 1})
+                
+                failing = queue.submit('flaky', {'n': 1}, max_attempts=1)
+                self.assertEqual(wait_for(queue, failing, 'failed')['error'], 'site unavailable')
+                
+                running = queue.submit('slow', {})
+                waiting = queue.submit('slow', {})
+                # Claimed analyses are running before their handler starts; wait for its progress
+                wait_for(queue, running, 'running', reported=True)
+                self.assertEqual(queue.cancel(waiting), 'cancelled')
+                # The handler may notice the request before cancel() reads the status back
+                self.assertIn(queue.cancel(running), ('running', 'cancelled'))
+                self.assertEqual(wait_for(queue, running, 'cancelled')['partial_result'], {'pages': 1})
+                
+                with self.assertRaises(ValueError):
+                    queue.submit('unknown', {})
+            finally:
+                queue.stop()
+            
+            # Analyses left running by a stopped process are picked up again on start
+            interrupted = queue.submit('slow', {})
+            queue._update(interrupted, status='running')
+            release.set()
+            restarted = AnalysisQueue(session_factory, workers=1, poll_interval=0.01)
+            restarted.register('slow', slow)
+            restarted.start()
+            try:
+                self.assertEqual(wait_for(restarted, interrupted, 'succeeded')['attempts'], 1)
+                self.assertEqual(restarted.stats()['by_status']['succeeded'], 2)
+            finally:
+                restarted.stop()
+                engine.dispose()
+
+    def test_skill_gap_scorer(self):
+        """Test vectorized scoring matches compare_skills and streams top roles"""
+        roles = {
+            'backend': ['python', 'django', 'sql', 'docker'],
+            'frontend': ['javascript', 'react'],
+            'devops': ['docker', 'kubernetes', 'aws'],
+            'empty': []
+        }
+        profiles = [['python', 'sql', 'git'], ['react', 'javascript', 'docker'], [], ['aws', 'aws']]
+        scorer = SkillGapScorer(roles)
+        scores = scorer.score(profiles)
+        
+        for row, user_skills in enumerate(profiles):
+            for column, role in enumerate(scorer.roles):
+                expected = self.skill_processor.compare_skills(user_skills, roles[role])
+                self.assertEqual(scores['match_percentage'][row, column], expected['match_percentage'])
+                self.assertEqual(scores['matching'][row, column], len(expected['matching_skills']))
+                self.assertEqual(scores['missing'][row, column], len(expected['missing_skills']))
+                self.assertEqual(scores['extra'][row, column], len(expected['unique_skills']))
+        
+        top = list(scorer.top_k(iter(profiles), k=2, block_size=3))
+        self.assertEqual(len(top), 4)
+        self.assertEqual([match['role'] for match in top[0]], ['backend', 'frontend'])
+        self.assertEqual(top[1][0], {'role': 'frontend', 'match_percentage': 100.0, 'matching': 2,
+                                     'missing': 0, 'extra': 1})
+        self.assertEqual(top[3][0]['role'], 'devops')
+        
+        weighted = SkillGapScorer(roles, weights={'devops': {'aws': 3.0}})
+        self.assertEqual(weighted.score([['aws']])['match_percentage'][0, 2], 60.0)
+
+    def test_skill_importance(self):
+        """Test requirements are scored by position and skills weighted per title"""
+        positions = self.skill_processor.extract_skill_positions('Python developer. Nice to have: docker')
+        self.assertEqual(positions['python'], 0.0)
+        self.assertGreater(positions['docker'], 0.8)
+        
+        locate = lambda descriptions: [self.skill_processor.extract_skill_positions(d) for d in descriptions]
+        descriptions = ['Python and SQL', 'Python, SQL and git', 'Python services; git required',
+                        'Python and Docker']
+        jobs = [{'title': 'Backend Engineer', 'company': f'Company {index}', 'location': 'Remote',
+                 'description': description, 'url': f'https://example.com/jobs/{index}'}
+                for index, description in enumerate(descriptions)]
+        jobs.append({'title': 'Data Analyst', 'company': 'Company 9', 'location': 'Remote',
+                     'description': 'SQL reporting, ' + 'dashboards ' * 20 + 'git', 'url': 'https://example.com/jobs/9'})
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{directory}/importance.db")
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            try:
+                ids = save_job_postings(db, jobs, locate)
+                self.assertEqual(jobs[0]['skills'], ['python', 'sql'])
+                analyst = {requirement.skill.name: requirement.importance_score
+                           for requirement in db.get(JobPosting, ids[4]).requirements}
+                self.assertEqual(analyst['sql'], 1.0)
+                self.assertLess(analyst['git'], 0.55)
+                
+                update_skill_trends(db, ids)
+                weights = skill_importance(db, 'backend engineer')
+                self.assertEqual(weights['python'], 1.0)
+                self.assertGreater(weights['sql'], weights['docker'])
+                self.assertEqual(skill_importance(db, 'unknown title'), {})
+                
+                comparison = self.skill_processor.compare_skills(['python', 'docker'], list(weights), weights)
+                self.assertEqual(comparison['match_percentage'], 50.0)
+                self.assertGreater(comparison['weighted_match_percentage'], 50.0)
+                self.assertNotIn('weighted_match_percentage',
+                                 self.skill_processor.compare_skills(['python'], ['python']))
+            finally:
+                db.close()
+                engine.dispose()
+
+    def test_skill_index(self):
+        """Test boolean skill search over profiles and postings stays in sync with writes"""
+        profiles = [{'name': f'Person {index}', 'skills': skills} for index, skills in enumerate([
+            ['python', 'aws', 'kubernetes'], ['python', 'aws'], ['python', 'java'], ['Kubernetes', 'go']
+        ])]
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{directory}/index.db")
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            try:
+                ids = save_profiles(db, profiles)
+                index = ensure_skill_index(db, 'profiles')
+                
+                found = index.search(all_of=['python', 'AWS'])
+                self.assertEqual([result['id'] for result in found['results']], ids[:2])
+                
+                found = index.search(any_of=['python', 'aws', 'kubernetes'], none_of=['java'])
+                self.assertEqual(found['total'], 3)
+                self.assertEqual([(result['id'], result['matches']) for result in found['results']],
+                                 [(ids[0], 3), (ids[1], 2), (ids[3], 1)])
+                self.assertEqual(index.search(all_of=['python'], any_of=['go'])['total'], 0)
+                with self.assertRaises(ValueError):
+                    index.search(none_of=['java'])
+                
+                new_ids = save_profiles(db, [{'name': 'Late', 'skills': ['python', 'aws']}])
+                found = search_skill_index(db, 'profiles', all_of=['python', 'aws'], limit=1)
+                self.assertEqual(found['total'], 3)
+                self.assertEqual(found['results'][0]['name'], 'Person 0')
+                self.assertIn(new_ids[0], index.postings('aws'))
+                
+                job = {'title': 'Engineer', 'company': 'Acme', 'location': 'Remote',
+                       'description': 'Python', 'url': 'https://example.com/jobs/1'}
+                extract = lambda descriptions: self.skill_processor.extract_skills_batch(descriptions)[0]
+                posting_id = save_job_postings(db, [dict(job)], extract)[0]
+                postings = ensure_skill_index(db, 'postings')
+                self.assertEqual(postings.search(all_of=['python'])['results'][0]['id'], posting_id)
+                save_job_postings(db, [dict(job, description='Docker')], extract)
+                self.assertEqual(postings.search(all_of=['python'])['total'], 0)
+                self.assertEqual(postings.search(all_of=['docker'])['total'], 1)
+            finally:
+                db.close()
+                engine.dispose()
+        
+        # Writes during a load are applied on top of what the load read
+        index = SkillIndex('profiles')
+        index.add({1: ['python']})
+        index.track()
+        index.add({2: ['python']})
+        index.remove({3: ['python']})
+        index.load({'python': [1, 3]})
+        self.assertEqual(list(index.postings('python')), [1, 2])
+
+    def test_schema_migrations(self):
+        """Test migrations upgrade a database from the original schema and hot queries use indexes"""
+        import re
+        extract = lambda descriptions: self.skill_processor.extract_skills_batch(descriptions)[0]
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{directory}/legacy.db", connect_args={'check_same_thread': False})
+            with engine.begin() as conn:
+                for statement in [
+                    'CREATE TABLE skills (id INTEGER PRIMARY KEY, name VARCHAR UNIQUE, category VARCHAR, created_at DATETIME)',
+                    'CREATE TABLE profiles (id INTEGER PRIMARY KEY, linkedin_id VARCHAR UNIQUE, name VARCHAR, headline VARCHAR, '
+                    'location VARCHAR, about VARCHAR, created_at DATETIME, updated_at DATETIME)',
+                    'CREATE TABLE profile_skills (profile_id INTEGER REFERENCES profiles (id), skill_id INTEGER REFERENCES skills (id))',
+                    'CREATE TABLE job_postings (id INTEGER PRIMARY KEY, title VARCHAR, company VARCHAR, location VARCHAR, '
+                    'description VARCHAR, url VARCHAR UNIQUE, posted_date DATETIME, created_at DATETIME)',
+                    'CREATE TABLE job_requirements (id INTEGER PRIMARY KEY, job_posting_id INTEGER, skill_id INTEGER, '
+                    'importance_score FLOAT, created_at DATETIME)',
+                    'CREATE TABLE skill_trends (id INTEGER PRIMARY KEY, skill_id INTEGER, job_title VARCHAR, frequency INTEGER, '
+                    'date DATETIME, created_at DATETIME)',
+                    "INSERT INTO skills (id, name) VALUES (1, 'python'), (2, 'sql')",
+                    "INSERT INTO profiles (id, name) VALUES (1, 'Legacy')",
+                    'INSERT INTO profile_skills VALUES (1, 1), (1, 1), (1, 2)',
+                    "INSERT INTO job_postings (id, title, url) VALUES (1, 'Analyst', 'https://example.com/jobs/legacy')",
+                    'INSERT INTO job_requirements (job_posting_id, skill_id) VALUES (1, 2), (1, 2)'
+                ]:
+                    conn.exec_driver_sql(statement)
+            
+            Base.metadata.create_all(bind=engine)
+            self.assertEqual(migrate(engine), [version for version, _ in MIGRATIONS])
+            self.assertEqual(migrate(engine), [])
+            inspector = inspect(engine)
+            self.assertEqual(set(inspector.get_pk_constraint('profile_skills')['constrained_columns']),
+                             {'profile_id', 'skill_id'})
+            self.assertTrue({'content_hash', 'last_seen_at'} <= {column['name'] for column in inspector.get_columns('job_postings')})
+            with engine.connect() as conn:
+                self.assertEqual(conn.exec_driver_sql('SELECT COUNT(*) FROM profile_skills').scalar(), 2)
+                self.assertEqual(conn.exec_driver_sql('SELECT COUNT(*) FROM job_requirements').scalar(), 1)
+            
+            session_factory = sessionmaker(bind=engine)
+            db = session_factory()
+            queue = AnalysisQueue(session_factory)
+            queue.register('noop', lambda params, context: None)
+            cache = ScrapeCache(session_factory)
+            ensure_skill_index(db, 'profiles')
+            
+            statements = []
+            
+            @event.listens_for(engine, 'before_cursor_execute')
+            def capture(conn, cursor, statement, parameters, context, executemany):
+                if not executemany and statement.split()[0].upper() in ('SELECT', 'UPDATE', 'DELETE'):
+                    statements.append((statement, parameters))
+            
+            try:
+                jobs = [{'title': 'Python Developer', 'company': f'Company {index}', 'location': 'Remote',
+                         'description': 'Python and SQL', 'url': f'https://example.com/jobs/{index}'} for index in range(3)]
+                update_skill_trends(db, save_job_postings(db, jobs, extract))
+                update_skill_trends(db, save_job_postings(db, [dict(jobs[0], description='Docker')], extract))
+                trends = query_skill_trends(db, 'python developer', start_date=datetime.utcnow().date())
+                self.assertEqual(trends['total_jobs'], 3)
+                save_profiles(db, [{'name': 'New', 'skills': ['python', 'docker']}])
+                self.assertEqual(search_skill_index(db, 'profiles', all_of=['python'])['total'], 2)
+                queue.submit('noop', {})
+                self.assertIsNotNone(queue._claim())
+                cache.get_or_scrape(cache.key_for('indeed', 'Python Developer', 'Remote', 0), lambda: [])
+            finally:
+                event.remove(engine, 'before_cursor_execute', capture)
+                db.close()
+            
+            # Every hot query must be answered from an index or the primary key
+            self.assertGreater(len(statements), 10)
+            with engine.connect() as conn:
+                for statement, parameters in statements:
+                    plan = [row[-1] for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)]
+                    scans = [step for step in plan if re.match(r'SCAN (?!(\d+ )?CONSTANT ROW)', step)]
+                    self.assertEqual(scans, [], f"Full scan in: {statement}")
+            engine.dispose()
+
+    def test_existing_database_upgrade(self):
+        """Test the repository's original database is upgraded and usable by the rollup pipeline"""
+        import shutil
+        extract = lambda descriptions: self.skill_processor.extract_skills_batch(descriptions)[0]
+        
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copy(Path(__file__).parent / 'linkedin_skills.db', f'{directory}/existing.db')
+            engine = create_engine(f"sqlite:///{directory}/existing.db")
+            # What init_db does
+            Base.metadata.create_all(bind=engine)
+            self.assertIn(2, migrate(engine))
+            
+            db = sessionmaker(bind=engine)()
+            try:
+                job = {'title': 'Python Developer', 'company': 'Acme', 'location': 'Remote',
+                       'description': 'Python and Docker', 'url': 'https://example.com/jobs/upgraded'}
+                ids = save_job_postings(db, [job], extract)
+                self.assertIsNotNone(db.get(JobPosting, ids[0]).content_hash)
+                self.assertGreater(rebuild_skill_trends(db), 0)
+                self.assertEqual(query_skill_trends(db, 'python developer')['total_jobs'], 1)
+                self.assertEqual(max(skill_importance(db, 'python developer').values()), 1.0)
+                
+                # Profiles are keyed by their source document after the upgrade
+                profile = {'name': 'Upgraded', 'skills': ['python'], 'source_hash': 'abc'}
+                self.assertEqual(save_profiles(db, [profile]), save_profiles(db, [profile]))
+            finally:
+                db.close()
+                engine.dispose()
+
+    def test_db_engine_factory(self):
+        """Test SQLite engines get their pragmas and pool checkout waits are measured"""
+        import threading
+        import time
+        from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+        
+        with tempfile.TemporaryDirectory() as directory:
+            metrics = PoolMetrics()
+            engine = create_db_engine(f"sqlite:///{directory}/pool.db", metrics,
+                                      pool_size=1, max_overflow=0, pool_timeout=0.2)
+            conn = engine.connect()
+            self.assertEqual(conn.exec_driver_sql('PRAGMA journal_mode').scalar(), 'wal')
+            self.assertEqual(conn.exec_driver_sql('PRAGMA synchronous').scalar(), 1)
+            self.assertEqual(conn.exec_driver_sql('PRAGMA busy_timeout').scalar(), 5000)
+            
+            # The only connection is taken: checkouts wait, then time out
+            with self.assertRaises(PoolTimeoutError):
+                engine.connect()
+            self.assertEqual(metrics.stats()['timeouts'], 1)
+            
+            def release():
+                time.sleep(0.1)
+                conn.close()
+            
+            releaser = threading.Thread(target=release)
+            releaser.start()
+            with engine.connect() as waited:
+                self.assertEqual(waited.exec_driver_sql('SELECT 1').scalar(), 1)
+            releaser.join()
+            
+            stats = metrics.stats()
+            self.assertGreaterEqual(stats['max_wait_seconds'], 0.05)
+            self.assertEqual((stats['checkouts'], stats['in_use'], stats['peak_in_use']), (2, 0, 1))
+            self.assertEqual((stats['size'], stats['idle']), (1, 1))
+            engine.dispose()
+        
+        # In-memory databases keep SQLite's default pool
+        memory = create_db_engine('sqlite://', PoolMetrics())
+        with memory.connect() as conn:
+            self.assertEqual(conn.exec_driver_sql('PRAGMA synchronous').scalar(), 1)
+        memory.dispose()
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,225 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Default seconds a wait may take per site, overridable with SCRAPER_WAIT_TIMEOUT_<SITE>
+DEFAULT_SITE_TIMEOUTS = {
+    'indeed': 10.0,
+    'glassdoor': 10.0,
+    'linkedin': 10.0,
+}
+
+# Seconds a result count must stay unchanged before a list counts as loaded
+DEFAULT_SETTLE_SECONDS = 0.3
+
+# Recent durations kept per wait for percentile estimates
+WAIT_SAMPLES = 500
+
+def site_timeout(site: str) -> float:
+    """
+    Get the wait timeout configured for a site
+
+    Args:
+        site (str): Site name, e.g. 'indeed'
+
+    Returns:
+        float: Timeout in seconds
+    """
+    default = DEFAULT_SITE_TIMEOUTS.get(site, 10.0)
+    return float(os.getenv(f'SCRAPER_WAIT_TIMEOUT_{site.upper()}', str(default)))
+
+class WaitRecorder:
+    """Records how long each (site, wait) took so timeouts can be tuned from real data"""
+
+    def __init__(self, samples: int = WAIT_SAMPLES):
+        self.samples = samples
+        self._waits: Dict[Tuple[str, str], Dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, site: str, name: str, seconds: float, timed_out: bool):
+        """
+        Record one wait
+
+        Args:
+            site (str): Site name
+            name (str): Wait name, e.g. 'results'
+            seconds (float): Time the wait took
+            timed_out (bool): True if the condition never held
+        """
+        with self._lock:
+            entry = self._waits.get((site, name))
+            if entry is None:
+                entry = {'count': 0, 'timeouts': 0, 'total': 0.0, 'max': 0.0,
+                         'recent': deque(maxlen=self.samples)}
+                self._waits[(site, name)] = entry
+            entry['count'] += 1
+            entry['timeouts'] += int(timed_out)
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            entry['recent'].append(seconds)
+
+    def stats(self) -> Dict:
+        """
+        Summarize recorded waits
+
+        Returns:
+            Dict mapping 'site.wait' to counts, timeouts and mean/p50/p95/max seconds
+        """
+        with self._lock:
+            summary = {}
+            for (site, name), entry in sorted(self._waits.items()):
+                recent = sorted(entry['recent'])
+                summary[f'{site}.{name}'] = {
+                    'count': entry['count'],
+                    'timeouts': entry['timeouts'],
+                    'mean_seconds': round(entry['total'] / entry['count'], 3),
+                    'p50_seconds': round(recent[len(recent) // 2], 3),
+                    'p95_seconds': round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 3),
+                    'max_seconds': round(entry['max'], 3),
+                }
+            return summary
+
+    def clear(self):
+        """Forget every recorded wait"""
+        with self._lock:
+            self._waits.clear()
+
+_recorder = WaitRecorder()
+
+def get_wait_recorder() -> WaitRecorder:
+    """Get the process-wide wait recorder"""
+    return _recorder
+
+def stable_count(selector: str, settle: float = DEFAULT_SETTLE_SECONDS) -> Callable:
+    """
+    Condition holding once at least one element matches and the count stops changing
+
+    Args:
+        selector (str): CSS selector of the result elements
+        settle (float): Seconds the count must stay unchanged
+
+    Returns:
+        Callable: WebDriverWait condition returning the count
+    """
+    state = {'count': -1, 'since': 0.0}
+
+    def condition(driver):
+        count = len(driver.find_elements(By.CSS_SELECTOR, selector))
+        now = time.monotonic()
+        if count != state['count']:
+            state['count'] = count
+            state['since'] = now
+            return False
+        return count if count and now - state['since'] >= settle else False
+
+    return condition
+
+def text_changed(selector: str, previous: str) -> Callable:
+    """
+    Condition holding once an element is present and its text differs from before
+
+    Used where a click swaps the content of an element that is already on the page.
+
+    Args:
+        selector (str): CSS selector of the element
+        previous (str): Text the element had before the click
+
+    Returns:
+        Callable: WebDriverWait condition returning the new text
+    """
+    def condition(driver):
+        elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        text = elements[0].text.strip() if elements else ''
+        return text if text and text != previous else False
+
+    return condition
+
+class AdaptiveWaiter:
+    """
+    Waits on concrete DOM conditions instead of fixed sleeps.
+
+    Every wait returns as soon as its condition holds, gives up after the site's timeout
+    and reports its duration to the wait recorder. A timed out wait returns None so
+    scrapers carry on with whatever the page shows, as they did after a fixed sleep.
+    """
+
+    def __init__(self, driver, site: str, timeout: Optional[float] = None,
+                 poll_frequency: float = 0.1, recorder: Optional[WaitRecorder] = None):
+        """
+        Initialize the waiter
+
+        Args:
+            driver: WebDriver to wait on
+            site (str): Site name, used for the timeout and in recorded stats
+            timeout (Optional[float]): Timeout in seconds; defaults to the site's timeout
+            poll_frequency (float): Seconds between condition checks
+            recorder (Optional[WaitRecorder]): Recorder to use instead of the shared one
+        """
+        self.driver = driver
+        self.site = site
+        self.timeout = site_timeout(site) if timeout is None else timeout
+        self.poll_frequency = poll_frequency
+        self.recorder = recorder or get_wait_recorder()
+
+    def until(self, condition: Callable, name: str, timeout: Optional[float] = None):
+        """
+        Wait until a condition returns a truthy value
+
+        Args:
+            condition (Callable): Takes the driver and returns a falsy value until ready
+            name (str): Wait name for the recorded stats
+            timeout (Optional[float]): Overrides the site timeout
+
+        Returns:
+            The condition's value, or None on timeout
+        """
+        started = time.monotonic()
+        try:
+            result = WebDriverWait(
+                self.driver, self.timeout if timeout is None else timeout,
+                poll_frequency=self.poll_frequency
+            ).until(condition)
+            self.recorder.record(self.site, name, time.monotonic() - started, False)
+            return result
+        except TimeoutException:
+            elapsed = time.monotonic() - started
+            self.recorder.record(self.site, name, elapsed, True)
+            logger.warning(f"Wait '{self.site}.{name}' timed out after {elapsed:.1f}s")
+            return None
+
+    def element_present(self, selector: str, name: str, timeout: Optional[float] = None):
+        """
+        Wait for an element matching a CSS selector
+
+        Returns:
+            The element, or None on timeout
+        """
+        return self.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)), name, timeout)
+
+    def results_loaded(self, selector: str, name: str = 'results',
+                       settle: float = DEFAULT_SETTLE_SECONDS) -> int:
+        """
+        Wait until a list of results has rendered and its count is stable
+
+        Returns:
+            int: Number of results, 0 on timeout
+        """
+        return self.until(stable_count(selector, settle), name) or 0
+
+    def replaced(self, element, name: str) -> bool:
+        """
+        Wait until an element is detached from the DOM, e.g. after pagination
+
+        Returns:
+            bool: True if the element went stale in time
+        """
+        return bool(self.until(EC.staleness_of(element), name))